@@ -30,6 +30,7 @@ __all__ = ['EpicsAttribute']
 
 import numpy
 from taurus.external.pint import Quantity
+from taurus.core.util.units import getUnit
 
 from taurus.core.taurusbasetypes import (TaurusEventType, TaurusAttrValue,
                                          TaurusTimeVal, AttrQuality, DataType,
@@ -159,7 +160,7 @@ class EpicsAttribute(TaurusAttribute):
             self.data_format = DataFormat(len(numpy.shape(v)))
         # units and limits support
         if self.type in (DataType.Integer, DataType.Float):
-            v = Quantity(v, pv.units)
+            v = Quantity(v, getUnit(pv.units))
             self._range = self.__decode_limit(pv.lower_ctrl_limit,
                                               pv.upper_ctrl_limit)
             self._alarm = self.__decode_limit(pv.lower_alarm_limit,
@@ -185,7 +186,7 @@ class EpicsAttribute(TaurusAttribute):
         return attr_value
 
     def __decode_limit(self, l, h):
-        units = self.__pv.units
+        units = getUnit(self.__pv.units)
         if l is None or numpy.isnan(l):
             l = None
         else:
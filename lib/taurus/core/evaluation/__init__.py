@@ -82,6 +82,11 @@ where:
       See :file:`<taurus>/core/evaluation/dev_example.py` for an example of a
       custom Evaluator
 
+      The :class:`~taurus.core.evaluation.evalprocess.ProcessEvaluator`
+      custom evaluator runs the evaluations in a pool of worker processes,
+      which is useful for heavy expressions (see
+      :mod:`taurus.core.evaluation.evalprocess`)
+
     - The optional `<subst>` segment is used to provide substitution symbols.
       `<subst>` is a semicolon-separated string of `<key>=<value>` strings.
 
@@ -118,6 +123,11 @@ Some examples of valid evaluation models are:
 
         `eval:@mymod.MyClass`
 
+    - An attribute that multiplies two tango image attributes (as matrices)
+      in a worker process:
+
+        `eval:@taurus.core.evaluation.evalprocess.ProcessEvaluator/dot({a/b/c/d},{e/f/g/h})`
+
 
 .. note:: Previous to SEP3, a RFC3986 non-compliant syntax was used for the
           evaluation scheme (e.g., allowing names such as
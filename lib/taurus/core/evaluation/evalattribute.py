@@ -166,6 +166,9 @@ class EvaluationAttribute(TaurusAttribute):
     # factory
     _factory = None
     _scheme = 'eval'
+    # incremented whenever the references of an attribute are rebuilt, so
+    # that the depths cached by getEvalDepth are recalculated
+    _refsGeneration = 0
 
     def __init__(self, name, parent, **kwargs):
         self.call__init__(TaurusAttribute, name, parent, **kwargs)
@@ -177,6 +180,7 @@ class EvaluationAttribute(TaurusAttribute):
         self._references = []
         self._validator = self.getNameValidator()
         self._transformation = None
+        self._eval_depth = None
         self.__subscription_state = SubscriptionState.Unsubscribed
 
         # This should never be None because the init already ran the validator
@@ -219,6 +223,7 @@ class EvaluationAttribute(TaurusAttribute):
         for ref in self._references:
             ref.removeListener(self)
         self._references = []
+        self._eval_depth = None  # (depth, generation)
 
         # get symbols
         evaluator = self.getParentObj()
@@ -230,6 +235,8 @@ class EvaluationAttribute(TaurusAttribute):
         for r in refs:
             symbol = self.__ref2Id(r)
             trstring = v.replaceUnquotedRef(trstring, '{%s}' % r, symbol)
+        # the depths of this attribute and of those referencing it may change
+        EvaluationAttribute._refsGeneration += 1
 
         # validate the expression (look for missing symbols)
         safesymbols = evaluator.getSafe().keys()
@@ -294,11 +301,42 @@ class EvaluationAttribute(TaurusAttribute):
         # update the corresponding value
         evaluator = self.getParentObj()
         evaluator.addSafe({self.getId(evt_src): v})
-        # re-evaluate
+        # re-evaluate (possibly batched with other events)
+        self.factory().getScheduler().markDirty(self, evt_type)
+
+    def _evaluate(self, evt_types):
+        """re-evaluates the transformation and notifies the listeners with
+        an event of each of the given types.
+        Called by the :class:`EvaluationScheduler`"""
+        if self.getParentObj().OffloadToProcess:
+            # evaluated asynchronously, notified when done
+            self.factory().getProcessPool().submit(self, evt_types)
+            return
         self.applyTransformation()
         # notify listeners that the value changed
         if self.isUsingEvents():
-            self.fireEvent(evt_type, self._value)
+            for evt_type in sorted(evt_types):
+                self.fireEvent(evt_type, self._value)
+
+    def getEvalDepth(self):
+        """Returns the depth of this attribute in the graph of references
+        between evaluation attributes: 0 if it does not reference other
+        evaluation attributes, or 1 + the maximum depth of the referenced
+        evaluation attributes otherwise. It is cached until the references
+        of any evaluation attribute are rebuilt
+
+        :return: (int) the depth
+        """
+        generation = EvaluationAttribute._refsGeneration
+        cached = self._eval_depth
+        if cached is not None and cached[1] == generation:
+            return cached[0]
+        depth = 0
+        for ref in self._references:
+            if isinstance(ref, EvaluationAttribute):
+                depth = max(depth, ref.getEvalDepth() + 1)
+        self._eval_depth = depth, generation
+        return depth
 
     def applyTransformation(self):
         if self._transformation is None:
@@ -306,27 +344,37 @@ class EvaluationAttribute(TaurusAttribute):
         try:
             evaluator = self.getParentObj()
             rvalue = evaluator.eval(self._transformation)
-            value_dimension = len(numpy.shape(rvalue))
-            value_dformat = DataFormat(value_dimension)
-            self.data_format = value_dformat
-            self.type = self._encodeType(rvalue, value_dformat)
-            if self.type is None:
-                raise TypeError("Unsupported returned type, %r" % rvalue)
-            if self.type in [DataType.Integer, DataType.Float] and\
-                    not isinstance(rvalue, Quantity):
-                self.debug("Transformation converted to Quantity")
-                rvalue = Quantity(rvalue)
-            elif self.type == DataType.Boolean and value_dimension > 1:
-                self.debug("Transformation converted to numpy.array")
-                rvalue = numpy.array(rvalue)
-            self._value.rvalue = rvalue
-            self._value.time = TaurusTimeVal.now()
-            self._value.quality = AttrQuality.ATTR_VALID
+            self._setTransformationResult(rvalue)
         except Exception, e:
-            self._value.quality = AttrQuality.ATTR_INVALID
-            msg = " the function '%s' could not be evaluated. Reason: %s" \
-                % (self._transformation, repr(e))
-            self.warning(msg)
+            self._setTransformationError(e)
+
+    def _setTransformationResult(self, rvalue):
+        """updates the value of the attribute with the result of the
+        transformation. Raises an exception if the value is not supported"""
+        value_dimension = len(numpy.shape(rvalue))
+        value_dformat = DataFormat(value_dimension)
+        self.data_format = value_dformat
+        self.type = self._encodeType(rvalue, value_dformat)
+        if self.type is None:
+            raise TypeError("Unsupported returned type, %r" % rvalue)
+        if self.type in [DataType.Integer, DataType.Float] and\
+                not isinstance(rvalue, Quantity):
+            self.debug("Transformation converted to Quantity")
+            rvalue = Quantity(rvalue)
+        elif self.type == DataType.Boolean and value_dimension > 1:
+            self.debug("Transformation converted to numpy.array")
+            rvalue = numpy.array(rvalue)
+        self._value.rvalue = rvalue
+        self._value.time = TaurusTimeVal.now()
+        self._value.quality = AttrQuality.ATTR_VALID
+
+    def _setTransformationError(self, error):
+        """invalidates the value of the attribute after a failed evaluation
+        of the transformation"""
+        self._value.quality = AttrQuality.ATTR_INVALID
+        msg = " the function '%s' could not be evaluated. Reason: %s" \
+            % (self._transformation, repr(error))
+        self.warning(msg)
 
     def _encodeType(self, value, dformat):
         ''' Encode the value type into Taurus data type. In case of non-zero
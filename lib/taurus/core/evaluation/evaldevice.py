@@ -46,6 +46,9 @@ class EvaluationDevice(TaurusDevice, SafeEvaluator):
     # factory
     _factory = None
     _scheme = 'eval'
+    # If True, the evaluations triggered by events are done in a worker
+    # process (see :mod:`taurus.core.evaluation.evalprocess`)
+    OffloadToProcess = False
 
     def __init__(self, name, **kw):
         """Object initialization."""
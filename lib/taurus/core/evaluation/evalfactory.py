@@ -34,6 +34,7 @@ from taurus.core.taurusbasetypes import TaurusElementType
 from evalattribute import EvaluationAttribute
 from evalauthority import EvaluationAuthority
 from evaldevice import EvaluationDevice
+from evalscheduler import EvaluationScheduler
 from taurus.core.taurusexception import TaurusException
 from taurus.core.util.log import Logger
 from taurus.core.util.singleton import Singleton
@@ -66,6 +67,28 @@ class EvaluationFactory(Singleton, TaurusFactory, Logger):
         self.eval_devs = weakref.WeakValueDictionary()
         self.eval_configs = weakref.WeakValueDictionary()
         self.scheme = 'eval'
+        self._scheduler = EvaluationScheduler(parent=self)
+        self._process_pool = None
+
+    def getScheduler(self):
+        """Returns the scheduler used for re-evaluating the attributes when
+        their references change
+
+        :return: (EvaluationScheduler)
+        """
+        return self._scheduler
+
+    def getProcessPool(self):
+        """Returns the pool of worker processes used by the evaluators that
+        offload their evaluations (see :class:`ProcessEvaluator`)
+
+        :return: (EvaluationProcessPool)
+        """
+        if self._process_pool is None:
+            from taurus.core.evaluation.evalprocess import \
+                EvaluationProcessPool
+            self._process_pool = EvaluationProcessPool(parent=self)
+        return self._process_pool
 
     def findObjectClass(self, absolute_name):
         """Operation models are always OperationAttributes
@@ -164,11 +187,15 @@ class EvaluationFactory(Singleton, TaurusFactory, Logger):
             attr_name, None)  # first try with the given name
         if a is None:  # if not, try with the full name
             validator = self.getAttributeNameValidator()
-            names = validator.getNames(attr_name)
-            if names is None or names[0] is None:
-                raise TaurusException(
-                    "Invalid evaluation attribute name %s" % attr_name)
-            fullname = names[0]
+            name_key = TaurusElementType.Attribute, attr_name
+            fullname = self._name_cache.get(name_key)
+            if fullname is None:
+                names = validator.getNames(attr_name)
+                if names is None or names[0] is None:
+                    raise TaurusException(
+                        "Invalid evaluation attribute name %s" % attr_name)
+                fullname = names[0]
+                self._name_cache[name_key] = fullname
             a = self.eval_attrs.get(fullname, None)
             if a is None:  # if the full name is not there, create one
                 dev = self.getDevice(validator.getDeviceName(attr_name))
@@ -232,3 +259,10 @@ class EvaluationFactory(Singleton, TaurusFactory, Logger):
         """Return EvaluationAttributeNameValidator"""
         import evalvalidator
         return evalvalidator.EvaluationAttributeNameValidator()
+
+    def clearNameCache(self):
+        """Reimplemented from :class:`TaurusFactory` to also empty the parse
+        cache of the attribute name validator"""
+        TaurusFactory.clearNameCache(self)
+        import evalvalidator
+        evalvalidator.EvaluationAttributeNameValidator.clearParseCache()
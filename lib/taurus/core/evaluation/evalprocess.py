@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+'''
+This module provides the :class:`ProcessEvaluator`, an evaluator that runs
+the evaluation of its attributes in a pool of worker processes, so that
+heavy expressions (e.g. operations on large images) do not block the
+client.
+
+Usage example::
+
+    eval:@taurus.core.evaluation.evalprocess.ProcessEvaluator/dot({a/b/c/d},{e/f/g/h})
+
+Only the evaluations triggered by events from the referenced attributes are
+offloaded (the first evaluation and the ones done with `read(cache=False)`
+are done in the client process). Large numpy arrays (both the referenced
+values and the results) are passed to and from the workers through files in
+shared memory (`/dev/shm` if available) instead of being pickled. There is
+at most one evaluation in progress for each attribute: if new events arrive
+while it is running, a single re-evaluation (with the latest values) is done
+when it finishes, and the intermediate ones are dropped.
+
+.. note:: the expressions are evaluated in the workers by a default
+          :class:`SafeEvaluator`, so they can only use the default symbols
+          and the (picklable) values of the referenced attributes and
+          substitutions.
+
+.. warning:: the worker processes are forked from the client process. By
+             default this is done on the first offloaded evaluation, when
+             the client is usually running other threads (e.g. those of Qt
+             or omniORB), and forking a multithreaded process may deadlock
+             the workers. Applications using :class:`ProcessEvaluator`
+             should therefore start the pool early, before those threads
+             exist::
+
+                 taurus.Factory('eval').getProcessPool().start()
+'''
+__all__ = ['ProcessEvaluator', 'EvaluationProcessPool']
+
+import os
+import time
+import atexit
+import tempfile
+import threading
+import multiprocessing
+import cPickle as pickle
+
+import numpy
+
+from taurus import tauruscustomsettings
+from taurus.external.pint import Quantity
+from taurus.core.util.log import Logger
+from taurus.core.util.safeeval import SafeEvaluator
+from taurus.core.evaluation.evaldevice import EvaluationDevice
+
+
+class ProcessEvaluator(EvaluationDevice):
+    """An evaluator that offloads the evaluation of its attributes to the
+    :class:`EvaluationProcessPool` of the evaluation factory
+    """
+    OffloadToProcess = True
+
+
+def _getShmDir():
+    """returns the directory used for passing the arrays to/from the workers
+    (`/dev/shm` if it exists, or the temporary directory otherwise)"""
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return tempfile.gettempdir()
+
+
+def _pack(value, threshold, shm_dir, files):
+    """prepares a value for being sent to/from a worker process. numpy arrays
+    larger than `threshold` bytes are written to a memory mapped file (whose
+    name is appended to `files`)"""
+    if isinstance(value, Quantity):
+        return ('Q', _pack(value.magnitude, threshold, shm_dir, files),
+                str(value.units))
+    if (isinstance(value, numpy.ndarray) and value.nbytes >= threshold and
+            not value.dtype.hasobject):
+        fd, fname = tempfile.mkstemp(prefix='taurus_eval_', suffix='.npy',
+                                     dir=shm_dir)
+        os.close(fd)
+        files.append(fname)
+        mm = numpy.lib.format.open_memmap(fname, mode='w+', dtype=value.dtype,
+                                          shape=value.shape)
+        mm[...] = value
+        mm.flush()
+        del mm
+        return ('M', fname)
+    return ('V', value)
+
+
+def _unpack(packed, copy=False):
+    """inverse of :func:`_pack`. Memory mapped arrays are opened read-only
+    (or copied into memory, if `copy` is True)"""
+    kind = packed[0]
+    if kind == 'Q':
+        return Quantity(_unpack(packed[1], copy=copy), packed[2])
+    if kind == 'M':
+        mm = numpy.load(packed[1], mmap_mode='r')
+        if copy:
+            return numpy.array(mm)
+        return mm
+    return packed[1]
+
+
+_workerEvaluator = None
+
+
+def _evaluateInWorker(expr, data, threshold, shm_dir):
+    """evaluates `expr` in a worker process with the symbols pickled in
+    `data`. Returns a tuple of (ok, packed_result, files) or
+    (False, error_message, [])"""
+    global _workerEvaluator
+    if _workerEvaluator is None:
+        _workerEvaluator = SafeEvaluator()
+    files = []
+    try:
+        evaluator = _workerEvaluator
+        symbols = dict([(k, _unpack(v))
+                        for k, v in pickle.loads(data).iteritems()])
+        evaluator.resetSafe()
+        evaluator.addSafe(symbols)
+        result = evaluator.eval(expr)
+        evaluator.resetSafe()
+        return True, _pack(result, threshold, shm_dir, files), files
+    except Exception, e:
+        for fname in files:
+            _unlink(fname)
+        return False, '%s: %s' % (e.__class__.__name__, e), []
+
+
+def _codeNames(code):
+    """returns the names used by a code object (including nested ones)"""
+    names = set(code.co_names)
+    for c in code.co_consts:
+        if hasattr(c, 'co_names'):
+            names.update(_codeNames(c))
+    return names
+
+
+def _unlink(fname):
+    try:
+        os.remove(fname)
+    except OSError:
+        pass
+
+
+class EvaluationProcessPool(Logger):
+    """Pool of worker processes that evaluate the attributes of the
+    :class:`ProcessEvaluator` devices.
+
+    There is at most one job in progress per attribute. Requests received
+    while the job of an attribute is in progress are merged into a single
+    pending request (which is submitted, with the latest values, when the
+    job finishes), i.e. the superseded requests are dropped. The results are
+    applied to the attributes and notified with normal events.
+
+    The jobs in progress are checked every :attr:`CheckPeriod` seconds by a
+    watchdog thread: a job that failed without a result (e.g. because the
+    result could not be pickled) or that did not finish within
+    :attr:`JobTimeout` seconds (e.g. because its worker died) is abandoned,
+    i.e. its files are removed and its attribute gets an error (and is
+    evaluated again on the next request).
+    """
+
+    #: minimum size (in bytes) of the arrays passed through shared memory
+    SharedThreshold = 65536
+    #: time (in seconds) after which a job in progress is abandoned
+    JobTimeout = 60.
+    #: period (in seconds) of the checks of the jobs in progress
+    CheckPeriod = 1.
+
+    def __init__(self, size=None, parent=None):
+        """
+        :param size: (int) number of worker processes. If None, the value of
+                     `EVAL_PROCESS_POOL_SIZE` in tauruscustomsettings is
+                     used (the number of CPUs if it is not set either)
+        """
+        name = self.__class__.__name__
+        self.call__init__(Logger, name, parent)
+        if size is None:
+            size = getattr(tauruscustomsettings, 'EVAL_PROCESS_POOL_SIZE',
+                           None)
+        self._size = size
+        self._pool = None
+        self._lock = threading.Lock()
+        self._running = set()
+        self._pending = {}
+        self._jobs = {}  # attr -> (AsyncResult, files, start time, evt_types)
+        self._watchdog = None
+        self._stop = threading.Event()
+        self._shm_dir = _getShmDir()
+        self.submitted = 0
+        self.dropped = 0
+
+    def start(self):
+        """Creates the worker processes (if not done yet). Otherwise they are
+        created when the first evaluation is submitted (see the warning in
+        :mod:`taurus.core.evaluation.evalprocess` about when to call it)"""
+        self._getPool()
+
+    def _getPool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(self._size)
+                self._watchdog = threading.Thread(
+                    name='EvaluationProcessPoolWatchdog', target=self._watch)
+                self._watchdog.daemon = True
+                self._watchdog.start()
+                atexit.register(self._terminate)
+            return self._pool
+
+    def _terminate(self):
+        """terminates the worker processes (called at exit)"""
+        self._stop.set()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+
+    def _watch(self):
+        """body of the watchdog thread"""
+        while not self._stop.wait(self.CheckPeriod):
+            self.checkJobs()
+
+    def checkJobs(self):
+        """Abandons the jobs in progress that failed without a result or that
+        exceeded :attr:`JobTimeout` (it is periodically called by the
+        watchdog thread)"""
+        now = time.time()
+        failed = []
+        with self._lock:
+            for attr, job in self._jobs.items():
+                result, files, t0, evt_types = job
+                if result.ready():
+                    if result.successful() and now - t0 <= self.JobTimeout:
+                        continue  # the callback is (or will be) running
+                    reason = 'failed'
+                    try:
+                        result.get(0)
+                    except Exception, e:
+                        reason = '%s: %s' % (e.__class__.__name__, e)
+                elif now - t0 > self.JobTimeout:
+                    reason = 'no result after %g s' % self.JobTimeout
+                else:
+                    continue
+                del self._jobs[attr]
+                failed.append((attr, files, evt_types, reason))
+        for attr, files, evt_types, reason in failed:
+            self.warning('Evaluation of %s failed in the worker (%s)',
+                         attr.getFullName(), reason)
+            for fname in files:
+                _unlink(fname)
+            attr._setTransformationError(RuntimeError(reason))
+            self._finish(attr, evt_types)
+
+    def submit(self, attr, evt_types):
+        """Requests the evaluation of an attribute in a worker process. When
+        it finishes, the value of the attribute is updated and an event of
+        each of the types in `evt_types` is fired
+
+        :param attr: (EvaluationAttribute) the attribute
+        :param evt_types: (seq<TaurusEventType>) types of the events to be
+                          fired
+        """
+        with self._lock:
+            if attr in self._running:
+                if attr in self._pending:
+                    self.dropped += 1
+                self._pending.setdefault(attr, set()).update(evt_types)
+                return
+            self._running.add(attr)
+        self._start(attr, evt_types)
+
+    def _start(self, attr, evt_types):
+        files = []
+        try:
+            expr = attr._transformation
+            evaluator = attr.getParentObj()
+            default = evaluator._originalSafeDict
+            symbols = {}
+            for k in _codeNames(evaluator.compile(expr)):
+                if k in evaluator.safe_dict and k not in default:
+                    symbols[k] = _pack(evaluator.safe_dict[k],
+                                       self.SharedThreshold, self._shm_dir,
+                                       files)
+            data = pickle.dumps(symbols, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # the inputs cannot be passed to a worker: evaluate it here
+            self.debug('Evaluating %s locally', attr.getFullName(),
+                       exc_info=1)
+            for fname in files:
+                _unlink(fname)
+            attr.applyTransformation()
+            self._finish(attr, evt_types)
+            return
+        self.submitted += 1
+
+        job = []  # (filled below, maybe after the callback is called)
+
+        def callback(result):
+            self._jobDone(attr, job, result)
+
+        try:
+            pool = self._getPool()
+            with self._lock:
+                # (under the lock, so that the callback finds the job)
+                result = pool.apply_async(
+                    _evaluateInWorker,
+                    (expr, data, self.SharedThreshold, self._shm_dir),
+                    callback=callback)
+                job.append((result, files, time.time(), evt_types))
+                self._jobs[attr] = job[0]
+        except Exception:
+            # e.g. the pool is not running anymore (exiting)
+            self.debug('Cannot submit %s', attr.getFullName(), exc_info=1)
+            for fname in files:
+                _unlink(fname)
+            with self._lock:
+                self._running.discard(attr)
+                self._pending.pop(attr, None)
+
+    def _jobDone(self, attr, job, result):
+        # called from the result handler thread of the pool
+        ok, packed, files = result
+        with self._lock:
+            job = job[0]
+            current = self._jobs.get(attr) is job
+            if current:
+                del self._jobs[attr]
+        evt_types = job[3]
+        for fname in job[1]:
+            _unlink(fname)
+        if not current:  # abandoned by checkJobs
+            for fname in files:
+                _unlink(fname)
+            return
+        try:
+            if ok:
+                try:
+                    attr._setTransformationResult(_unpack(packed, copy=True))
+                except Exception, e:
+                    attr._setTransformationError(e)
+            else:
+                attr._setTransformationError(RuntimeError(packed))
+        finally:
+            for fname in files:
+                _unlink(fname)
+        self._finish(attr, evt_types)
+
+    def _finish(self, attr, evt_types):
+        try:
+            if attr.isUsingEvents():
+                for evt_type in sorted(evt_types):
+                    attr.fireEvent(evt_type, attr._value)
+        except Exception:
+            self.warning('Error notifying %s', attr.getFullName())
+            self.debug('Details:', exc_info=1)
+        with self._lock:
+            if attr not in self._pending:
+                self._running.discard(attr)
+                return
+            evt_types = self._pending.pop(attr)
+        self._start(attr, evt_types)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+
+'''
+This module provides the scheduler used for re-evaluating the evaluation
+attributes when the attributes that they reference change.
+'''
+__all__ = ['EvaluationScheduler']
+
+import time
+import heapq
+import atexit
+import threading
+
+from taurus import tauruscustomsettings
+from taurus.core.taurusbasetypes import TaurusSerializationMode
+from taurus.core.util.log import Logger
+
+
+class EvaluationScheduler(Logger):
+    """Re-evaluates the evaluation attributes in batches (ticks).
+
+    When an evaluation attribute receives an event from one of its
+    references, it is marked as dirty instead of being re-evaluated
+    immediately. Once per tick (i.e., `period` ms after the first dirty mark)
+    all the dirty attributes are re-evaluated, in topological order (the
+    attributes referencing other evaluation attributes are evaluated after
+    them, see :meth:`EvaluationAttribute.getEvalDepth`), and each of them
+    fires a single event of each of the types received. Attributes that
+    become dirty during the tick as a result of the evaluation of others
+    (chained expressions) are also evaluated in the same tick.
+
+    With a period of 0 (the default), or for the attributes in
+    :obj:`TaurusSerializationMode.Serial` mode, the attributes are
+    re-evaluated immediately on each event (i.e., no batching).
+    """
+
+    def __init__(self, period=None, parent=None):
+        """
+        :param period: (int) tick period in ms. If None, the value of
+                       `EVAL_TICK_PERIOD` in tauruscustomsettings is used
+        """
+        name = self.__class__.__name__
+        self.call__init__(Logger, name, parent)
+        if period is None:
+            period = getattr(tauruscustomsettings, 'EVAL_TICK_PERIOD', 0)
+        self._period = period
+        self._cond = threading.Condition(threading.RLock())
+        self._pending = {}  # attr -> set of evt_types for the next tick
+        self._tick = None  # attr -> set of evt_types for the tick in progress
+        self._heap = []
+        self._done = set()
+        self._seq = 0
+        self._thread = None
+        self._stopped = False
+        self.ticks = 0
+        self.evaluations = 0
+        atexit.register(self._stop)
+
+    def setPeriod(self, period):
+        """Sets the tick period
+
+        :param period: (int) period in ms (0 disables the batching)
+        """
+        self._period = period
+
+    def getPeriod(self):
+        """Returns the tick period
+
+        :return: (int) period in ms
+        """
+        return self._period
+
+    def markDirty(self, attr, evt_type):
+        """Marks the given attribute to be re-evaluated in the next tick
+
+        :param attr: (EvaluationAttribute) the attribute
+        :param evt_type: (TaurusEventType) type of the event to be fired
+                         after the evaluation
+        """
+        if (self._period <= 0 or attr.getSerializationMode() ==
+                TaurusSerializationMode.Serial):
+            self._evaluate(attr, (evt_type,))
+            return
+        with self._cond:
+            tick = self._tick
+            if (tick is not None and attr not in self._done and
+                    threading.currentThread() is self._thread):
+                # chained evaluation: do it in the tick in progress
+                if attr not in tick:
+                    self._seq += 1
+                    heapq.heappush(self._heap,
+                                   (attr.getEvalDepth(), self._seq, attr))
+                    tick[attr] = set()
+                tick[attr].add(evt_type)
+                return
+            self._pending.setdefault(attr, set()).add(evt_type)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name=self.getLogName())
+                self._thread.setDaemon(True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _evaluate(self, attr, evt_types):
+        self.evaluations += 1
+        try:
+            attr._evaluate(evt_types)
+        except Exception:
+            self.warning("Error evaluating %s", attr.getFullName())
+            self.debug("Details:", exc_info=1)
+
+    def _stop(self):
+        """makes the scheduler thread finish (called at exit)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.currentThread():
+            thread.join(1)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+            # let the events of this tick accumulate
+            time.sleep(self._period / 1000.)
+            with self._cond:
+                tick, self._pending = self._pending, {}
+                self._heap = []
+                for attr in tick:
+                    self._seq += 1
+                    self._heap.append((attr.getEvalDepth(), self._seq, attr))
+                heapq.heapify(self._heap)
+                self._done = set()
+                self._tick = tick
+            while True:
+                with self._cond:
+                    if not self._heap or self._stopped:
+                        self._tick = None
+                        self._done = set()
+                        break
+                    _, _, attr = heapq.heappop(self._heap)
+                    evt_types = tick.pop(attr)
+                    self._done.add(attr)
+                self._evaluate(attr, evt_types)
+            self.ticks += 1
@@ -29,8 +29,9 @@ import re
 import hashlib
 
 import taurus
-from taurus import isValidName, debug
+from taurus import isValidName, debug, tauruscustomsettings
 from taurus.core import TaurusElementType
+from taurus.core.util.containers import LRUCache
 
 from taurus.core.taurusvalidator import (TaurusAttributeNameValidator,
                                          TaurusDeviceNameValidator,
@@ -46,6 +47,9 @@ K_EQUALS_V_RE = re.compile(K_EQUALS_V)
 QUOTED_TEXT = '(".*?"|\'.*?\')'
 QUOTED_TEXT_RE = re.compile(QUOTED_TEXT)
 
+# cache of the results of _findAllTokensBetweenChars
+_tokensCache = LRUCache(4096)
+
 
 def _findAllTokensBetweenChars(string, start, end, n=None):
     '''Finds the text between (possibly nested) delimiters in a string.
@@ -69,6 +73,15 @@ def _findAllTokensBetweenChars(string, start, end, n=None):
              (tokens d not include the delimiting chars not including the
              brackets)
     '''
+    key = (string, start, end, n)
+    tokens = _tokensCache.get(key)
+    if tokens is None:
+        tokens = _tokensCache[key] = tuple(_findTokens(string, start, end, n))
+    return list(tokens)
+
+
+def _findTokens(string, start, end, n):
+    '''uncached implementation of :func:`_findAllTokensBetweenChars`'''
     if start == end:
         raise ValueError('star_char must be different from end_char')
     if string.count(start) != string.count(end):
@@ -112,6 +125,19 @@ def _replacepos(string, old, new, idx):
     return string[:idx] + new + string[idx + len(old):]
 
 
+class _EvalNameParse(object):
+    '''Interned results of parsing an eval attribute name (see
+    :meth:`EvaluationAttributeNameValidator._getParse`)'''
+    __slots__ = ('name', 'groups', 'valid', 'names', 'expandedExpr')
+
+    def __init__(self, name):
+        self.name = name
+        self.groups = {}  # {strict: uri groups (or None if invalid)}
+        self.valid = {}  # {strict: validity (including the refs)}
+        self.names = {}  # {factory: (complete, normal, short, fragment)}
+        self.expandedExpr = None
+
+
 class EvaluationAuthorityNameValidator(TaurusAuthorityNameValidator):
     '''Validator for Evaluation authority names. For now, the only supported
     authority (in strict mode) is "//localhost":
@@ -228,6 +254,27 @@ class EvaluationAttributeNameValidator(TaurusAttributeNameValidator):
     query = '(?!)'
     fragment = '(?P<cfgkey>[^# ]*)'
 
+    #: maximum number of names whose parsing results are kept in the cache
+    ParseCacheSize = 1024
+    # the validator is a singleton, but __init__ is called on each
+    # instantiation, so the cache is kept at class level
+    _parseCache = LRUCache(ParseCacheSize)
+
+    @classmethod
+    def clearParseCache(cls):
+        '''Empties the cache of parsing results. It is called when the name
+        caches of the factories are cleared (see
+        :meth:`TaurusManager.clearNameCaches`), since the cached full names
+        embed the full names of the refs'''
+        cls._parseCache.clear()
+
+    def _getParse(self, name):
+        '''returns the (interned) :class:`_EvalNameParse` for the given name'''
+        parse = self._parseCache.get(name)
+        if parse is None:
+            parse = self._parseCache[name] = _EvalNameParse(name)
+        return parse
+
     @staticmethod
     def expandExpr(expr, substmap):
         '''expands expr by substituting all keys in map by their value.
@@ -315,18 +362,29 @@ class EvaluationAttributeNameValidator(TaurusAttributeNameValidator):
 
     def isValid(self, name, matchLevel=None, strict=None):
         '''reimplemented from :class:`TaurusAttributeNameValidator` to do extra
-        check on references validity (recursive)
+        check on references validity (recursive). The results are cached
         '''
-        # Standard implementation
         if matchLevel is not None:
-            groups = self._isValidAtLevel(name, matchLevel=matchLevel)
-        else:
-            groups = self.getUriGroups(name, strict=strict)
+            return self._isValidAtLevel(name, matchLevel=matchLevel)
+        if strict is None:
+            strict = getattr(tauruscustomsettings, 'STRICT_MODEL_NAMES', False)
+        parse = self._getParse(name)
+        try:
+            return parse.valid[strict]
+        except KeyError:
+            valid = parse.valid[strict] = self._isValid(name, strict)
+            return valid
+
+    def _isValid(self, name, strict):
+        '''uncached implementation of :meth:`isValid`'''
+        groups = self.getUriGroups(name, strict=strict)
         if groups is None:
             return False
+        return self._checkRefs(name, groups['_evalrefs'], strict)
 
-        # now check the references
-        for ref in groups['_evalrefs']:
+    def _checkRefs(self, name, refs, strict):
+        '''checks that all the given refs are valid attribute names'''
+        for ref in refs:
             if not isValidName(ref, etypes=(TaurusElementType.Attribute,),
                                strict=strict):
                 debug('"%s" is invalid because ref "%s" is not a ' +
@@ -336,8 +394,23 @@ class EvaluationAttributeNameValidator(TaurusAttributeNameValidator):
 
     def getUriGroups(self, name, strict=None):
         '''reimplemented from :class:`TaurusAttributeNameValidator` to provide
-        backwards compatibility with old syntax'''
+        backwards compatibility with old syntax. The results are cached'''
+        if strict is None:
+            strict = getattr(tauruscustomsettings, 'STRICT_MODEL_NAMES', False)
+        parse = self._getParse(name)
+        try:
+            groups = parse.groups[strict]
+        except KeyError:
+            groups = parse.groups[strict] = self._getUriGroups(name, strict)
+        if groups is None:
+            return None
+        # return a copy, since callers may modify it
+        groups = dict(groups)
+        groups['_evalrefs'] = list(groups['_evalrefs'])
+        return groups
 
+    def _getUriGroups(self, name, strict):
+        '''uncached implementation of :meth:`getUriGroups`'''
         # mangle refs before matching the pattern to sanitize them
         refs = self.getRefs(name, ign_quoted=False)
         refs_dict = {}
@@ -415,7 +488,24 @@ class EvaluationAttributeNameValidator(TaurusAttributeNameValidator):
         return name
 
     def getNames(self, fullname, factory=None, fragment=False):
-        '''reimplemented from :class:`TaurusDeviceNameValidator`'''
+        '''reimplemented from :class:`TaurusDeviceNameValidator`. The results
+        are cached'''
+        parse = self._getParse(fullname)
+        names = parse.names.get(factory)
+        if names is None:
+            names = self._getNames(fullname, factory)
+            if names is None:
+                return None
+            if names[0] is not None:
+                # (do not cache the names if the refs could not be expanded)
+                parse.names[factory] = names
+        if fragment:
+            return names
+        return names[:3]
+
+    def _getNames(self, fullname, factory):
+        '''uncached implementation of :meth:`getNames`. It always returns
+        the fragment'''
         from evalfactory import EvaluationFactory
         groups = self.getUriGroups(fullname)
         if groups is None:
@@ -440,12 +530,8 @@ class EvaluationAttributeNameValidator(TaurusAttributeNameValidator):
         if authority != f_or_fklass.DEFAULT_AUTHORITY:
             normal = '%s/%s' % (authority, normal)
         short = self._getSimpleNameFromExpression(groups['_expr'])
-
-        # return fragment if requested
-        if fragment:
-            key = groups.get('fragment', None)
-            return complete, normal, short, key
-        return complete, normal, short
+        key = groups.get('fragment', None)
+        return complete, normal, short, key
 
     @property
     def nonStrictNamePattern(self):
@@ -470,12 +556,15 @@ class EvaluationAttributeNameValidator(TaurusAttributeNameValidator):
         :return: (str) the expression (from the name )expanded with any
                  substitution k,v pairs also defined in the name
         '''
-        groups = self.getUriGroups(name)
-        if groups is None:
-            return None
-        _expr = groups['_expr']
-        _subst = groups['_subst']
-        return self.expandExpr(_expr, _subst or {})
+        parse = self._getParse(name)
+        if parse.expandedExpr is None:
+            groups = self.getUriGroups(name)
+            if groups is None:
+                return None
+            _expr = groups['_expr']
+            _subst = groups['_subst']
+            parse.expandedExpr = self.expandExpr(_expr, _subst or {})
+        return parse.expandedExpr
 
     def getAttrName(self, s):
         #@TODO: Maybe this belongs to the factory, not the validator
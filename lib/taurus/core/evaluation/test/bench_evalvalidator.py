@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of the parsing of eval attribute names.
+
+It compares the cost of validating and getting the names of some typical
+eval attribute names with and without the parse cache of
+:class:`EvaluationAttributeNameValidator`.
+
+Usage: python -m taurus.core.evaluation.test.bench_evalvalidator
+"""
+
+__docformat__ = 'restructuredtext'
+
+from taurus.core.evaluation import evalvalidator
+from taurus.core.evaluation.evalvalidator import \
+    EvaluationAttributeNameValidator
+from taurus.test import benchmark, printBenchmarks
+
+
+_CORPUS = [
+    'eval:1',
+    'eval:rand(256)',
+    'eval:@foo/1+2',
+    'eval:x=2;y=3;x*y',
+    'eval:k=2;a={eval:1};k*a',
+    'eval:{eval:1}+{eval:2}',
+    'eval://localhost/@foo/a=1;b=2;{eval:@bar/a*b}*sqrt({eval:rand(16)})',
+    'eval:"{eval:1}" + "a;b"',
+    'eval:@taurus.core.evaluation.dev_example.FreeSpaceDevice/getFreeSpace("/")',
+    'eval:2*{eval:{eval:1}+{eval:2}}',
+]
+
+
+def _clearCaches():
+    EvaluationAttributeNameValidator._parseCache.clear()
+    evalvalidator._tokensCache.clear()
+
+
+def main():
+    v = EvaluationAttributeNameValidator()
+    results = []
+    for name in _CORPUS:
+        assert v.isValid(name), name
+
+        def resolve():
+            v.isValid(name)
+            v.getUriGroups(name)
+            v.getNames(name)
+            v.getExpandedExpr(name)
+
+        def resolve_uncached():
+            _clearCaches()
+            resolve()
+
+        results.append((name, benchmark(resolve_uncached),
+                        benchmark(resolve)))
+    printBenchmarks(results, title='Eval name resolution (uncached vs cached)')
+
+
+if __name__ == '__main__':
+    main()
@@ -27,12 +27,14 @@
 
 # __all__ = []
 
+import time
+import threading
 import numpy
 from taurus.external import unittest
 from taurus.external.pint import Quantity
 import taurus
 from taurus.test import insertTest
-from taurus.core.taurusbasetypes import DataType
+from taurus.core.taurusbasetypes import DataType, TaurusEventType
 from taurus.core.evaluation.evalattribute import EvaluationAttrValue
 
 
@@ -277,6 +279,181 @@ class EvalAttributeTestCase(unittest.TestCase):
                    (attr_fullname, expectedshape, shape))
             self.assertEqual(shape, expectedshape, msg)
 
+    def test_eventStats(self):
+        """check the listener and delivery counters of the model"""
+        a = taurus.Attribute('eval:"test_eventStats"')
+        received = []
+
+        def listener(*args):
+            received.append(args)
+        a.addListener(listener)
+        a.addListener(listener)  # not added twice
+        stats = a.getEventStats()
+        a.fireEvent(TaurusEventType.Change, None)
+        new_stats = a.getEventStats()
+        self.assertEqual(new_stats['listeners'], 1)
+        self.assertEqual(new_stats['events'] - stats['events'], 1)
+        self.assertEqual(new_stats['deliveries'] - stats['deliveries'], 1)
+        self.assertEqual(received[-1], (a, TaurusEventType.Change, None))
+        a.removeListener(listener)
+
+    def test_evalDepthReset(self):
+        """check that the depths are recalculated when the references of a
+        referenced attribute are rebuilt"""
+        x = taurus.Attribute('eval:depth1=1;depth1')
+        a = taurus.Attribute('eval:2*{eval:depth1=1;depth1}')
+        self.assertEqual((x.getEvalDepth(), a.getEvalDepth()), (0, 1))
+        x.preProcessTransformation('{eval:depth2=2;depth2}+1')
+        self.assertEqual((x.getEvalDepth(), a.getEvalDepth()), (1, 2))
+
+    def test_tickTypes(self):
+        """check that the events of different types received in a tick are
+        all fired after the (single) evaluation"""
+        scheduler = taurus.Factory('eval').getScheduler()
+        period = scheduler.getPeriod()
+        scheduler.setPeriod(50)
+        try:
+            i1 = taurus.Attribute('eval:types1=1;types1')
+            a = taurus.Attribute('eval:3*{eval:types1=1;types1}')
+            self.__stopPolling(i1)
+            received = []
+
+            def listener(src, evt_type, evt_value):
+                if evt_type in (TaurusEventType.Change,
+                                TaurusEventType.Periodic):
+                    received.append((evt_type, evt_value.rvalue.magnitude))
+            a.addListener(listener)
+            evaluations = self.__countEvaluations(a)
+            for evt_type in (TaurusEventType.Periodic,
+                             TaurusEventType.Change):
+                value = EvaluationAttrValue()
+                value.rvalue = Quantity(2)
+                i1.fireEvent(evt_type, value)
+            t0 = time.time()
+            while len(received) < 2 and time.time() - t0 < 2:
+                time.sleep(.01)
+            self.assertEqual(received, [(TaurusEventType.Change, 6),
+                                        (TaurusEventType.Periodic, 6)])
+            self.assertEqual(evaluations, [a])
+            a.removeListener(listener)
+        finally:
+            del a._evaluate
+            scheduler.setPeriod(period)
+
+    def test_noBatching(self):
+        """check that, with the default period (0), the attributes are
+        re-evaluated on every event, in the thread that fired it"""
+        scheduler = taurus.Factory('eval').getScheduler()
+        self.assertEqual(scheduler.getPeriod(), 0)
+        i1 = taurus.Attribute('eval:nobatch1=1;nobatch1')
+        a = taurus.Attribute('eval:3*{eval:nobatch1=1;nobatch1}')
+        self.__stopPolling(i1)
+        received = []
+
+        def listener(src, evt_type, evt_value):
+            if evt_type == TaurusEventType.Change:
+                received.append((threading.currentThread(),
+                                 evt_value.rvalue.magnitude))
+        a.addListener(listener)
+        for i in range(3):
+            value = EvaluationAttrValue()
+            value.rvalue = Quantity(i)
+            i1.fireEvent(TaurusEventType.Change, value)
+        a.removeListener(listener)
+        current = threading.currentThread()
+        self.assertEqual(received, [(current, 0), (current, 3), (current, 6)])
+
+    def test_tickBatching(self):
+        """check that the events from the references of an expression are
+        batched in a single evaluation per tick, also for chained ones"""
+        scheduler = taurus.Factory('eval').getScheduler()
+        period = scheduler.getPeriod()
+        scheduler.setPeriod(50)
+        try:
+            i1 = taurus.Attribute('eval:batch1=1;batch1')
+            i2 = taurus.Attribute('eval:batch2=2;batch2')
+            a = taurus.Attribute('eval:{eval:batch1=1;batch1}+' +
+                                 '{eval:batch2=2;batch2}')
+            b = taurus.Attribute('eval:2*{eval:{eval:batch1=1;batch1}+' +
+                                 '{eval:batch2=2;batch2}}')
+            self.assertEqual((a.getEvalDepth(), b.getEvalDepth()), (1, 2))
+            self.__stopPolling(i1, i2)
+            received = []
+
+            def listener(src, evt_type, evt_value):
+                if evt_type == TaurusEventType.Change:
+                    received.append((src, evt_value.rvalue.magnitude))
+            a.addListener(listener)
+            b.addListener(listener)
+            evaluations = self.__countEvaluations(a, b)
+            for i in range(10):
+                for attr in (i1, i2):
+                    value = EvaluationAttrValue()
+                    value.rvalue = Quantity(i)
+                    attr.fireEvent(TaurusEventType.Change, value)
+            t0 = time.time()
+            while len(received) < 2 and time.time() - t0 < 2:
+                time.sleep(.01)
+            time.sleep(.1)  # make sure that no more events arrive
+            self.assertEqual(received, [(a, 18), (b, 36)])
+            self.assertEqual(evaluations, [a, b])
+            a.removeListener(listener)
+            b.removeListener(listener)
+        finally:
+            del a._evaluate, b._evaluate
+            scheduler.setPeriod(period)
+
+    def test_processEvaluator(self):
+        """check that the evaluations of a ProcessEvaluator are done in a
+        worker process and notified with Change events"""
+        dev = 'eval:@taurus.core.evaluation.evalprocess.ProcessEvaluator'
+        src = taurus.Attribute('eval:proc1=1;proc1')
+        a = taurus.Attribute(dev + '/2*{eval:proc1=1;proc1}')
+        self.assertTrue(a.getParentObj().OffloadToProcess)
+        pool = taurus.Factory('eval').getProcessPool()
+        received = []
+
+        def listener(s, evt_type, evt_value):
+            if evt_type == TaurusEventType.Change:
+                received.append(evt_value.rvalue)
+        a.addListener(listener)
+        submitted = pool.submitted
+        # large enough to be passed through shared memory
+        value = EvaluationAttrValue()
+        value.rvalue = numpy.arange(20000.)
+        src.fireEvent(TaurusEventType.Change, value)
+        t0 = time.time()
+        while not received and time.time() - t0 < 10:
+            time.sleep(.01)
+        a.removeListener(listener)
+        self.assertTrue(pool.submitted > submitted)
+        self.assertEqual(len(received), 1)
+        self.assertTrue(numpy.allclose(received[0].magnitude,
+                                       2 * numpy.arange(20000.)))
+
+    def __stopPolling(self, *attrs):
+        # stops the polling of the given attributes (whose events would
+        # re-evaluate the ones referencing them) and lets the scheduler
+        # finish the evaluations already triggered by it
+        for attr in attrs:
+            attr.disablePolling()
+        time.sleep(.2)
+
+    def __countEvaluations(self, *attrs):
+        # returns a list to which the given attributes are appended whenever
+        # they are evaluated by the scheduler (the scheduler's own counter
+        # includes the evaluations triggered by the polling of other ones)
+        evaluations = []
+
+        def wrap(attr, evaluate):
+            def _evaluate(evt_types):
+                evaluations.append(attr)
+                evaluate(evt_types)
+            return _evaluate
+        for attr in attrs:
+            attr._evaluate = wrap(attr, attr._evaluate)
+        return evaluations
+
     def __assertValidValue(self, exp, got, msg):
         # if we are dealing with quantities, use the magnitude for comparing
         if isinstance(got, Quantity):
@@ -80,3 +80,18 @@ class EvaluationFactoryTestCase(unittest.TestCase):
                             msg + "normalname")
             self.assertTrue(attr.getSimpleName() == attr2.getSimpleName(),
                             msg + "simplename")
+
+    def test_nameCache(self):
+        '''check that the full names of the requested names are cached'''
+        from taurus.core.taurusbasetypes import TaurusElementType
+        model = 'x=3;x*2'
+        attr = self.f.getAttribute(model)
+        cache = self.f.getNameCache()
+        self.assertEqual(cache.get((TaurusElementType.Attribute, model)),
+                         attr.getFullName())
+        hits = cache.hits
+        self.assertIs(self.f.getAttribute(model), attr)
+        self.assertEqual(cache.hits, hits + 1)
+        self.f.clearNameCache()
+        self.assertEqual(len(cache), 0)
+        self.assertIs(self.f.getAttribute(model), attr)
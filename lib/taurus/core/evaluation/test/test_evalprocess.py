@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.evaluation.evalprocess"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import time
+import threading
+
+from taurus.external import unittest
+from taurus.core.util.safeeval import SafeEvaluator
+from taurus.core.evaluation.evalprocess import EvaluationProcessPool
+
+
+class _Attr(object):
+    '''Stand-in for an EvaluationAttribute (only the members used by the
+    pool)'''
+
+    def __init__(self, expr, **symbols):
+        self._transformation = expr
+        self._evaluator = SafeEvaluator()
+        self._evaluator.addSafe(symbols)
+        self._value = None
+        self.error = None
+        self.events = []
+        self.done = threading.Event()
+
+    def getParentObj(self):
+        return self._evaluator
+
+    def getFullName(self):
+        return self._transformation
+
+    def applyTransformation(self):
+        self._setTransformationResult(self._evaluator.eval(
+            self._transformation))
+
+    def _setTransformationResult(self, rvalue):
+        self._value, self.error = rvalue, None
+
+    def _setTransformationError(self, error):
+        self._value, self.error = None, error
+
+    def isUsingEvents(self):
+        return True
+
+    def fireEvent(self, evt_type, value):
+        self.events.append((evt_type, value))
+        self.done.set()
+
+
+class _LostPool(object):
+    '''Stand-in for a multiprocessing.Pool whose jobs never finish'''
+
+    class _Result(object):
+
+        def ready(self):
+            return False
+
+    def apply_async(self, func, args, callback=None):
+        return self._Result()
+
+
+class EvaluationProcessPoolTestCase(unittest.TestCase):
+    '''Test case for EvaluationProcessPool'''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = EvaluationProcessPool(size=1)
+        cls.pool.CheckPeriod = .05
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool._terminate()
+
+    def test_evaluation(self):
+        '''check that a job is evaluated in a worker'''
+        attr = _Attr('2 * v', v=21)
+        self.pool.submit(attr, ('change',))
+        self.assertTrue(attr.done.wait(10))
+        self.assertEqual(attr.events, [('change', 42)])
+        self.assertEqual(self.pool._running, set())
+
+    def test_unpicklable_result(self):
+        '''check that a job whose result cannot be returned is abandoned
+        (the attribute gets an error and can be evaluated again)'''
+        attr = _Attr('(x for x in v)', v=[1, 2])
+        self.pool.submit(attr, ('change',))
+        self.assertTrue(attr.done.wait(10))
+        self.assertTrue(attr.error is not None)
+        self.assertEqual(self.pool._running, set())
+        self.assertEqual(self.pool._jobs, {})
+        attr.done.clear()
+        attr._transformation = 'len(v)'
+        self.pool.submit(attr, ('change',))
+        self.assertTrue(attr.done.wait(10))
+        self.assertEqual(attr.events[-1], ('change', 2))
+
+    def test_timeout(self):
+        '''check that a job without result after JobTimeout (e.g. because
+        its worker died) is abandoned and that its files are removed'''
+        import numpy
+        pool = EvaluationProcessPool(size=1)
+        pool._pool = _LostPool()  # (the watchdog is not started)
+        pool.JobTimeout = .1
+        attr = _Attr('v.sum()', v=numpy.ones(pool.SharedThreshold))
+        pool.submit(attr, ('change',))
+        files = pool._jobs[attr][1]
+        self.assertEqual(len(files), 1)
+        pool.checkJobs()
+        self.assertEqual(attr.events, [])
+        time.sleep(.2)
+        pool.checkJobs()
+        self.assertEqual(len(attr.events), 1)
+        self.assertTrue(attr.error is not None)
+        self.assertEqual(pool._running, set())
+        self.assertEqual(pool._jobs, {})
+        self.assertFalse(os.path.exists(files[0]))
+
+if __name__ == '__main__':
+    pass
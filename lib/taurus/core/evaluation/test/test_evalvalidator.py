@@ -358,5 +358,40 @@ class EvaluationAttrValidatorTestCase(AbstractNameValidatorTestCase,
     validator = EvaluationAttributeNameValidator
 
 
+class EvaluationAttrValidatorCacheTestCase(unittest.TestCase):
+    '''Tests for the parse cache of EvaluationAttributeNameValidator'''
+
+    def test_cachedResults(self):
+        '''check that the cached results are equal to the uncached ones and
+        that modifying them does not affect the cache'''
+        v = EvaluationAttributeNameValidator()
+        name = 'eval:@foo/k=2;{eval:1}*k'
+        v._parseCache.pop(name)
+        groups = v.getUriGroups(name)
+        names = v.getNames(name, fragment=True)
+        expr = v.getExpandedExpr(name)
+        self.assertTrue(v.isValid(name))
+        hits = v._parseCache.hits
+        groups['devname'] = None
+        groups['_evalrefs'].append('bar')
+        self.assertEqual(v.getUriGroups(name)['devname'], '@foo')
+        self.assertEqual(v.getUriGroups(name)['_evalrefs'], ['eval:1'])
+        self.assertEqual(v.getNames(name, fragment=True), names)
+        self.assertEqual(v.getNames(name), names[:3])
+        self.assertEqual(v.getExpandedExpr(name), expr)
+        self.assertTrue(v.isValid(name))
+        self.assertTrue(v._parseCache.hits > hits)
+
+    def test_clearNameCache(self):
+        '''check that clearing the name cache of the factory also clears the
+        parse cache'''
+        v = EvaluationAttributeNameValidator()
+        name = 'eval:{eval:1}*3'
+        v.getNames(name)
+        self.assertIsNotNone(v._parseCache.get(name))
+        taurus.Factory('eval').clearNameCache()
+        self.assertIsNone(v._parseCache.get(name))
+
+
 if __name__ == '__main__':
     pass
@@ -64,9 +64,24 @@ from .util.tango_taurus import (description_from_tango,
 
 class TangoAttrValue(TaurusAttrValue):
     """A TaurusAttrValue specialization to decode PyTango.DeviceAttribute
-    objects
+    objects.
+
+    The read and write values are decoded lazily (i.e., the conversion of
+    the raw values from the DeviceAttribute into Quantities, DevState, etc.
+    is done only when :attr:`rvalue` or :attr:`wvalue` are first accessed).
+    The quality, time and error members are decoded immediately.
     """
 
+    # members of the lazy decoding (class attributes so that they are
+    # defined even before __init__ sets them)
+    _rvalue = None
+    _wvalue = None
+    _decode_args = None
+    # the same value is shared by the listeners (which may be in different
+    # threads), so the decoding is serialized (with a class lock, since it is
+    # cheap and would not be worth a lock per value)
+    _decode_lock = threading.Lock()
+
     def __init__(self, attr=None, pytango_dev_attr=None, config=None):
         # config parameter is kept for backwards compatibility only
         TaurusAttrValue.__init__(self)
@@ -88,29 +103,49 @@ class TangoAttrValue(TaurusAttrValue):
         if self._attrRef is None:
             return
 
-        numerical = PyTango.is_numerical_type(self._attrRef._tango_data_type,
-                                              inc_array=True)
         if p.has_failed:
             self.error = PyTango.DevFailed(*p.get_err_stack())
-        else:
-            if p.is_empty:  # spectra and images can be empty without failing
-                dtype = FROM_TANGO_TO_NUMPY_TYPE.get(
-                    self._attrRef._tango_data_type)
-                if self._attrRef.data_format == DataFormat._1D:
-                    shape = (0,)
-                elif self._attrRef.data_format == DataFormat._2D:
-                    shape = (0, 0)
-                p.value = numpy.empty(shape, dtype=dtype)
-                if not (numerical or self._attrRef.type == DataType.Boolean):
-                    # generate a nested empty list of given shape
-                    p.value = []
-                    for _ in xrange(len(shape) - 1):
-                        p.value = [p.value]
+
+        # store what is needed for decoding the values (the attribute
+        # config may change or the attribute may be gone by then)
+        self._decode_args = (self._attrRef._tango_data_type,
+                             self._attrRef._units,
+                             self._attrRef.data_format,
+                             self._attrRef.type)
+        self.time = p.time  # TODO: decode this into a TaurusTimeVal
+        self.quality = quality_from_tango(p.quality)
+
+    def _decode(self):
+        """decodes the read and write values from the DeviceAttribute (unless
+        already done by another thread). It is called the first time that
+        rvalue or wvalue are accessed"""
+        with self._decode_lock:
+            if self._decode_args is not None:
+                self._doDecode()
+
+    def _doDecode(self):
+        """decodes the read and write values. Must be called with the decode
+        lock acquired"""
+        tango_type, units, data_format, dtype = self._decode_args
+        p = self._pytango_dev_attr
+        numerical = PyTango.is_numerical_type(tango_type, inc_array=True)
+        if not p.has_failed and p.is_empty:
+            # spectra and images can be empty without failing
+            np_type = FROM_TANGO_TO_NUMPY_TYPE.get(tango_type)
+            if data_format == DataFormat._1D:
+                shape = (0,)
+            elif data_format == DataFormat._2D:
+                shape = (0, 0)
+            p.value = numpy.empty(shape, dtype=np_type)
+            if not (numerical or dtype == DataType.Boolean):
+                # generate a nested empty list of given shape
+                p.value = []
+                for _ in xrange(len(shape) - 1):
+                    p.value = [p.value]
 
         rvalue = p.value
         wvalue = p.w_value
         if numerical:
-            units = self._attrRef._units
             if rvalue is not None:
                 rvalue = Quantity(rvalue, units=units)
             if wvalue is not None:
@@ -118,17 +153,54 @@ class TangoAttrValue(TaurusAttrValue):
         elif isinstance(rvalue, PyTango._PyTango.DevState):
             rvalue = DevState[str(rvalue)]
         elif p.type == PyTango.CmdArgType.DevUChar:
-            if self._attrRef.data_format == DataFormat._0D:
+            if data_format == DataFormat._0D:
                 rvalue = chr(rvalue)
                 wvalue = chr(wvalue)
             else:
                 rvalue = rvalue.view('S1')
                 wvalue = wvalue.view('S1')
 
-        self.rvalue = rvalue
-        self.wvalue = wvalue
-        self.time = p.time  # TODO: decode this into a TaurusTimeVal
-        self.quality = quality_from_tango(p.quality)
+        self._rvalue = rvalue
+        self._wvalue = wvalue
+        # only now, so that the other threads do not use the values before
+        self._decode_args = None
+
+    def isDecoded(self):
+        """Tells whether the read and write values have already been decoded
+        from the DeviceAttribute
+
+        :return: (bool)
+        """
+        return self._decode_args is None
+
+    def _get_rvalue(self):
+        if self._decode_args is not None:
+            self._decode()
+        return self._rvalue
+
+    def _set_rvalue(self, value):
+        if self._decode_args is not None:
+            self._decode()
+        self._rvalue = value
+
+    rvalue = property(_get_rvalue, _set_rvalue)
+
+    def _get_wvalue(self):
+        if self._decode_args is not None:
+            self._decode()
+        return self._wvalue
+
+    def _set_wvalue(self, value):
+        if self._decode_args is not None:
+            self._decode()
+        self._wvalue = value
+
+    wvalue = property(_get_wvalue, _set_wvalue)
+
+    def __repr__(self):
+        if self._decode_args is not None:
+            self._decode()
+        return TaurusAttrValue.__repr__(self)
 
     def __getattr__(self, name):
         try:
@@ -247,6 +319,9 @@ class TangoAttribute(TaurusAttribute):
     _description = 'A Tango Attribute'
 
     def __init__(self, name, parent, **kwargs):
+        # pre-fetched configuration (see TangoFactory.getAttributes)
+        attr_info = kwargs.pop('attr_info', None)
+        subscribe_conf = kwargs.pop('subscribe_conf', True)
 
         # the last attribute value
         self.__attr_value = None
@@ -268,8 +343,7 @@ class TangoAttribute(TaurusAttribute):
 
         self._events_working = False
 
-        attr_info = None
-        if parent:
+        if attr_info is None and parent:
             attr_name = self.getSimpleName()
             try:
                 attr_info = parent.attribute_query(attr_name)
@@ -288,8 +362,10 @@ class TangoAttribute(TaurusAttribute):
         self._decodeAttrInfoEx(attr_info)
 
         # subscribe to configuration events (unsubscription done at cleanup)
+        # unless the caller takes care of it (e.g. for bulk subscription)
         self.__cfg_evt_id = None
-        self._subscribeConfEvents()
+        if subscribe_conf:
+            self._subscribeConfEvents()
 
     def cleanUp(self):
         self.trace("[TangoAttribute] cleanUp")
@@ -552,6 +628,9 @@ class TangoAttribute(TaurusAttribute):
             sm = self.getSerializationMode()
             if sm == TaurusSerializationMode.Concurrent:
                 Manager().addJob(self.__fireRegisterEvent, None, (listener,))
+            elif sm == TaurusSerializationMode.Ordered:
+                Manager().addOrderedJob(self, self.__fireRegisterEvent, None,
+                                        (listener,))
             else:
                 self.__fireRegisterEvent((listener,))
         return ret
@@ -691,7 +770,14 @@ class TangoAttribute(TaurusAttribute):
 
     def push_event(self, event):
         """Method invoked by the PyTango layer when a change event occurs.
-           Default implementation propagates the event to all listeners."""
+           Default implementation propagates the event to all listeners.
+
+           In Concurrent serialization mode the events are delivered in
+           order, but a pending Change event is replaced by a newer one:
+           they are coalesced with the (attribute, TaurusEventType.Change)
+           key (see :meth:`TaurusManager.addCoalescedJob`). The Config and
+           Error events are never replaced (see
+           :meth:`TaurusManager.addSequencedJob`)."""
 
         curr_time = time.time()
         manager = Manager()
@@ -717,8 +803,21 @@ class TangoAttribute(TaurusAttribute):
             # notify the listeners
             listeners = tuple(self._listeners)
             if sm == TaurusSerializationMode.Concurrent:
-                manager.addJob(self.fireEvent, None, event_type,
-                               self.__attr_value, listeners=listeners)
+                # the events of the attribute are delivered in order, but
+                # only the latest of consecutive pending values is delivered
+                # (the Change events are coalesced per (attribute, type))
+                if event_type == TaurusEventType.Config:
+                    manager.addSequencedJob(self, self.fireEvent, event_type,
+                                            self.__attr_value,
+                                            listeners=listeners)
+                else:
+                    manager.addCoalescedJob((self, event_type),
+                                            self.fireEvent, event_type,
+                                            self.__attr_value,
+                                            listeners=listeners)
+            elif sm == TaurusSerializationMode.Ordered:
+                manager.addOrderedJob(self, self.fireEvent, None, event_type,
+                                      self.__attr_value, listeners=listeners)
             else:
                 self.fireEvent(event_type, self.__attr_value,
                                listeners=listeners)
@@ -736,8 +835,13 @@ class TangoAttribute(TaurusAttribute):
             self._deactivatePolling()
             listeners = tuple(self._listeners)
             if sm == TaurusSerializationMode.Concurrent:
-                manager.addJob(self.fireEvent, None, TaurusEventType.Error,
-                               self.__attr_err, listeners=listeners)
+                manager.addSequencedJob(self, self.fireEvent,
+                                        TaurusEventType.Error,
+                                        self.__attr_err, listeners=listeners)
+            elif sm == TaurusSerializationMode.Ordered:
+                manager.addOrderedJob(self, self.fireEvent, None,
+                                      TaurusEventType.Error,
+                                      self.__attr_err, listeners=listeners)
             else:
                 self.fireEvent(TaurusEventType.Error, self.__attr_err,
                                listeners=listeners)
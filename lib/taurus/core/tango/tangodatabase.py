@@ -26,14 +26,16 @@
 """This module contains all taurus tango authority"""
 
 __all__ = ["TangoInfo", "TangoAttrInfo", "TangoDevInfo", "TangoServInfo",
-           "TangoDevClassInfo", "TangoDatabaseCache", "TangoDatabase",
-           "TangoAuthority"]
+           "TangoDevClassInfo", "TangoDatabaseCache", "TangoAliasResolver",
+           "TangoDatabase", "TangoAuthority"]
 
 __docformat__ = "restructuredtext"
 
 import os
+import time
 import operator
 import weakref
+import threading
 
 from PyTango import (Database, DeviceProxy, DevFailed, ApiUtil)
 from taurus import Device
@@ -579,6 +581,118 @@ class TangoServerTree(dict):
         return self.get(serverName, {}).values()
 
 
+class TangoAliasResolver(object):
+    """Cache of the device alias <--> device name correspondence of a
+    :class:`TangoAuthority`.
+
+    The first time that a name is resolved, the cache is filled in bulk with
+    all the aliases defined in the database (unless `bulk` is False), which
+    takes a single query if the database supports it (see
+    :meth:`TangoAuthority._getAliasTable`). From then on, names not found in
+    it are known to have no alias (or to be no alias) and are answered
+    without querying the database. If the bulk fill is disabled or fails,
+    each name is queried individually and the answer (even if negative) is
+    cached. The whole cache is discarded after `ttl` seconds or when
+    :meth:`refresh` is called.
+
+    The :attr:`hits` and :attr:`misses` counters tell how many resolutions
+    were served by the cache and how many required querying the database.
+    """
+
+    DefaultTTL = 300  # seconds
+
+    def __init__(self, db, ttl=None, bulk=True):
+        self._db = weakref.ref(db)
+        if ttl is None:
+            ttl = self.DefaultTTL
+        self.ttl = ttl
+        self.bulk = bulk
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.clear()
+
+    @property
+    def db(self):
+        return self._db()
+
+    def clear(self):
+        """Discards all the cached names"""
+        with self._lock:
+            self._dev_names = CaselessDict()
+            self._aliases = CaselessDict()
+            self._filled = False
+            self._complete = False
+            self._timestamp = time.time()
+
+    def refresh(self):
+        """Discards all the cached names and fills the cache in bulk with the
+        aliases defined in the database"""
+        with self._lock:
+            self.clear()
+            self._filled = True  # do not try again until next refresh
+            for alias, dev_name in self.db._getAliasTable():
+                self._dev_names[alias] = dev_name
+                self._aliases[dev_name] = alias
+            self._complete = True
+
+    def _lookup(self, tableName, key):
+        """returns the cached value for the key in the given table (filling
+        the cache if needed). Must be called with the lock acquired"""
+        if time.time() - self._timestamp > self.ttl:
+            self.clear()
+        if self.bulk and not self._filled:
+            self.misses += 1
+            try:
+                self.refresh()
+            except Exception:
+                pass
+            if self._complete:
+                return True, getattr(self, tableName).get(key)
+            return False, None
+        table = getattr(self, tableName)
+        if key in table:
+            self.hits += 1
+            return True, table[key]
+        if self._complete:  # not in the bulk fill: no alias
+            self.hits += 1
+            return True, None
+        self.misses += 1
+        return False, None
+
+    def getDeviceName(self, alias):
+        """Returns the device name corresponding to the given alias
+
+        :param alias: (str) the device alias
+
+        :return: (str) the device name or None if the alias is not defined
+        """
+        with self._lock:
+            found, dev_name = self._lookup('_dev_names', alias)
+            if not found:
+                dev_name = self.db._getElementFullName(alias)
+                self._dev_names[alias] = dev_name
+                if dev_name is not None:
+                    self._aliases[dev_name] = alias
+            return dev_name
+
+    def getAlias(self, dev_name):
+        """Returns the alias of the given device
+
+        :param dev_name: (str) the device name
+
+        :return: (str) the alias or None if the device has no alias
+        """
+        with self._lock:
+            found, alias = self._lookup('_aliases', dev_name)
+            if not found:
+                alias = self.db._getElementAlias(dev_name)
+                self._aliases[dev_name] = alias
+                if alias is not None:
+                    self._dev_names[alias] = dev_name
+            return alias
+
+
 def get_home():
     """
     Find user's home directory if possible. Otherwise raise error.
@@ -673,6 +787,7 @@ class TangoAuthority(TaurusAuthority):
         self.dbObj = Database(*pars)
         self._dbProxy = None
         self._dbCache = None
+        self._aliasResolver = None
 
         complete_name = "tango://%s:%s" % (host, port)
         self.call__init__(TaurusAuthority, complete_name, parent)
@@ -743,6 +858,24 @@ class TangoAuthority(TaurusAuthority):
 
     def refreshCache(self):
         self.cache().refresh()
+        if self._aliasResolver is not None:
+            self._aliasResolver.clear()
+
+    def getAliasResolver(self):
+        """Returns the cache used for resolving device aliases and names
+
+        :return: (TangoAliasResolver) the alias resolver"""
+        if self._aliasResolver is None:
+            self._aliasResolver = TangoAliasResolver(self)
+        return self._aliasResolver
+
+    def refreshAliasCache(self):
+        """Reloads the alias <--> device name correspondence from the
+        database. Call it after defining or changing device aliases."""
+        self.getAliasResolver().refresh()
+        # the names of other schemes (e.g. eval) may embed tango names
+        from taurus.core.taurusmanager import TaurusManager
+        TaurusManager().clearNameCaches()
 
     def getDevice(self, name):
         """
@@ -805,7 +938,18 @@ class TangoAuthority(TaurusAuthority):
         return self.cache().deviceTree()
 
     def getElementAlias(self, full_name):
-        '''return the alias of an element from its full name'''
+        '''return the alias of an element from its full name (using the
+        alias resolver cache)'''
+        return self.getAliasResolver().getAlias(full_name)
+
+    def getElementFullName(self, alias):
+        '''return the full name of an element from its alias (using the
+        alias resolver cache)'''
+        return self.getAliasResolver().getDeviceName(alias)
+
+    def _getElementAlias(self, full_name):
+        '''return the alias of an element from its full name (querying the
+        database)'''
         try:
             alias = self.getTangoDB().get_alias(full_name)
             if alias and alias.lower() == InvalidAlias:
@@ -814,8 +958,26 @@ class TangoAuthority(TaurusAuthority):
             alias = None
         return alias
 
-    def getElementFullName(self, alias):
-        '''return the full name of an element from its alias'''
+    def _getAliasTable(self):
+        '''return the (alias, device name) pairs of all the aliases defined
+        in the database (querying the database)'''
+        db = self.getTangoDB()
+        try:
+            # optimization in case the db exposes a MySQL select API
+            query = ("SELECT alias, name FROM device " +
+                     "WHERE alias IS NOT NULL AND alias != ''")
+            r = db.command_inout("DbMySqlSelect", query)
+            data = r[1]
+            return zip(data[0::2], data[1::2])
+        except DevFailed:
+            # fallback using tango commands (one query for the alias list and
+            # one per alias, since devices with alias are usually few)
+            return [(a, db.get_device_alias(a))
+                    for a in db.get_device_alias_list('*')]
+
+    def _getElementFullName(self, alias):
+        '''return the full name of an element from its alias (querying the
+        database)'''
         try:  # PyTango v>=8.1.0
             return self.getTangoDB().get_device_from_alias(alias)
         except AttributeError:
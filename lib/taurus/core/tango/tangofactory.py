@@ -46,6 +46,8 @@ from taurus.core.taurusexception import TaurusException, DoubleRegistration
 from taurus.core.util.log import Logger, taurus4_deprecation
 from taurus.core.util.singleton import Singleton
 from taurus.core.util.containers import CaselessWeakValueDict, CaselessDict
+from taurus.core.util.threadpool import ThreadPool
+from functools import partial
 
 from .tangodatabase import TangoAuthority
 from .tangoattribute import TangoAttribute
@@ -92,6 +94,10 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
                        TaurusElementType.Attribute: TangoAttribute
                        }
 
+    #: maximum number of threads used by :meth:`getAttributes` and
+    #: :meth:`addListeners` for subscribing to events
+    BulkSubscriptionFanOut = 8
+
     def __init__(self):
         """ Initialization. Nothing to be done here for now."""
         pass
@@ -117,6 +123,7 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
         self.tango_dev_queries = CaselessWeakValueDict()
         self.tango_alias_devs = CaselessWeakValueDict()
         self.polling_timers = {}
+        self.clearNameCache()
 
         # Plugin device classes
         self.tango_dev_klasses = {}
@@ -168,6 +175,9 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
         """
         self._default_tango_host = tango_host
         self.dft_db = None
+        # the names of other schemes (e.g. eval) may embed tango names
+        from taurus.core.taurusmanager import TaurusManager
+        TaurusManager().clearNameCaches()
 
     def registerAttributeClass(self, attr_name, attr_klass):
         """Registers a new attribute class for the attribute name.
@@ -285,6 +295,14 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
         if d is not None:
             return d
 
+        # try with the cached full name
+        name_key = TaurusElementType.Device, dev_name
+        full_dev_name = self._name_cache.get(name_key)
+        if full_dev_name is not None:
+            d = self.tango_devs.get(full_dev_name)
+            if d is not None:
+                return d
+
         validator = _Device.getNameValidator()
         groups = validator.getUriGroups(dev_name)
         if groups is None:
@@ -294,6 +312,7 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
 
         if full_dev_name is None:
             raise TaurusException("Cannot find full name of '%s'" % dev_name)
+        self._name_cache[name_key] = full_dev_name
 
         d = self.tango_devs.get(full_dev_name)
 
@@ -334,6 +353,14 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
         if attr is not None:
             return attr
 
+        # try with the cached full name
+        name_key = TaurusElementType.Attribute, attr_name
+        full_attr_name = self._name_cache.get(name_key)
+        if full_attr_name is not None:
+            attr = self.tango_attrs.get(full_attr_name)
+            if attr is not None:
+                return attr
+
         # Simple approach did not work. Lets build a proper device name
         validator = _Attribute.getNameValidator()
         groups = validator.getUriGroups(attr_name)
@@ -345,6 +372,7 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
 
         if full_attr_name is None:
             raise TaurusException("Cannot find full name of '%s'" % attr_name)
+        self._name_cache[name_key] = full_attr_name
 
         attr = self.tango_attrs.get(full_attr_name)
 
@@ -376,6 +404,149 @@ class TangoFactory(Singleton, TaurusFactory, Logger):
                 raise
         return attr
 
+    def getAttributes(self, names):
+        """Obtain the attribute objects corresponding to the given names
+        (reimplemented from :class:`TaurusFactory`).
+
+        The attributes that do not exist yet are grouped by device, so that
+        each device (and its DeviceProxy) is created only once and the
+        configuration of all its attributes is obtained with a single
+        `attribute_list_query_ex` call. Finally, the subscriptions to
+        configuration events are issued concurrently by at most
+        `BulkSubscriptionFanOut` threads.
+
+        :param names: (seq<str>) valid attribute name URIs
+
+        :return: (list<TangoAttribute>) the attributes, in the same order as
+                 names
+        :raise: (taurus.core.taurusexception.TaurusException) if any of the
+                given names is invalid.
+        """
+        result = [None] * len(names)
+        missing = {}  # full dev name -> {full attr name: [indexes]}
+        validator = _Attribute.getNameValidator()
+        for i, attr_name in enumerate(names):
+            attr = self.tango_attrs.get(attr_name)
+            if attr is not None:
+                result[i] = attr
+                continue
+            name_key = TaurusElementType.Attribute, attr_name
+            full_attr_name = self._name_cache.get(name_key)
+            if full_attr_name is None:
+                if validator.getUriGroups(attr_name) is None:
+                    raise TaurusException(("Invalid Tango attribute name " +
+                                           "'%s'") % attr_name)
+                full_attr_name, _, _ = validator.getNames(attr_name)
+                if full_attr_name is None:
+                    raise TaurusException("Cannot find full name of '%s'" %
+                                          attr_name)
+                self._name_cache[name_key] = full_attr_name
+            attr = self.tango_attrs.get(full_attr_name)
+            if attr is not None:
+                result[i] = attr
+                continue
+            dev_name = full_attr_name.rsplit('/', 1)[0]
+            attrs = missing.setdefault(dev_name, {})
+            attrs.setdefault(full_attr_name, []).append(i)
+
+        created = []
+        for dev_name, attrs in missing.items():
+            dev_attrs, new_attrs = self._createDeviceAttributes(dev_name,
+                                                                attrs.keys())
+            created.extend(new_attrs)
+            for full_attr_name, indexes in attrs.items():
+                for i in indexes:
+                    result[i] = dev_attrs[full_attr_name]
+
+        self._subscribeConfEvents(created)
+        return result
+
+    def _createDeviceAttributes(self, dev_name, full_attr_names):
+        """Creates the attributes of a given device using a single query for
+        their configurations. The newly created attributes are not subscribed
+        to configuration events (see :meth:`_subscribeConfEvents`).
+
+        :param dev_name: (str) full device name
+        :param full_attr_names: (seq<str>) full names of attributes of the
+                                device
+
+        :return: (tuple<dict,list>) a dictionary of full attribute name to
+                 attribute object and a list of the newly created attributes
+        """
+        dev = self.getDevice(dev_name)
+        dev_attrs = {}
+        pending = []
+        for full_attr_name in full_attr_names:
+            # the device may have created some attributes (e.g. 'state')
+            attr = self.tango_attrs.get(full_attr_name)
+            if attr is None:
+                pending.append(full_attr_name)
+            else:
+                dev_attrs[full_attr_name] = attr
+        if not pending:
+            return dev_attrs, []
+
+        infos = CaselessDict()
+        simple_names = [n.rsplit('/', 1)[1] for n in pending]
+        hw = dev.getDeviceProxy()
+        try:
+            for info in hw.attribute_list_query_ex(simple_names):
+                infos[info.name] = info
+        except Exception:
+            # (e.g. device not running or some attribute not existing)
+            # fall back to individual queries (done by each attribute)
+            self.debug("Cannot query configuration of %d attributes of %s",
+                       len(simple_names), dev_name, exc_info=1)
+
+        new_attrs = []
+        for full_attr_name, simple_name in zip(pending, simple_names):
+            attr_klass = self._getAttributeClass(attr_name=simple_name)
+            kwargs = dict(storeCallback=self._storeAttribute,
+                          pollingPeriod=self.getDefaultPollingPeriod(),
+                          attr_info=infos.get(simple_name),
+                          subscribe_conf=False)
+            try:
+                attr = attr_klass(full_attr_name, dev, **kwargs)
+                new_attrs.append(attr)
+            except DoubleRegistration:
+                attr = self.tango_attrs.get(full_attr_name)
+            dev_attrs[full_attr_name] = attr
+        return dev_attrs, new_attrs
+
+    def _subscribeConfEvents(self, attrs):
+        """Subscribes the given attributes to configuration events using at
+        most `BulkSubscriptionFanOut` concurrent threads
+
+        :param attrs: (seq<TangoAttribute>) attributes created with
+                      `subscribe_conf=False`
+        """
+        self._fanOut([attr._subscribeConfEvents for attr in attrs])
+
+    def addListeners(self, models, listener):
+        """Reimplemented from :class:`TaurusFactory` to add the listener
+        (and therefore to subscribe to the change events of the attributes)
+        using at most `BulkSubscriptionFanOut` concurrent threads
+
+        :param models: (seq<TaurusModel>) models of this factory
+        :param listener: (object) the listener
+        """
+        self._fanOut([partial(model.addListener, listener)
+                      for model in models])
+
+    def _fanOut(self, jobs):
+        """runs the given jobs (callables without arguments) using at most
+        `BulkSubscriptionFanOut` concurrent threads and waits for them"""
+        fan_out = min(self.BulkSubscriptionFanOut, len(jobs))
+        if fan_out < 2:
+            for job in jobs:
+                job()
+            return
+        pool = ThreadPool(name="BulkSubscriptionTP", parent=self,
+                          Psize=fan_out, Qsize=0, origin_sampling=0)
+        for job in jobs:
+            pool.add(job)
+        pool.join()
+
     def getAttributeInfo(self, full_attr_name):
         """Deprecated: Use :meth:`taurus.core.tango.TangoFactory.getConfiguration` instead.
 
@@ -30,6 +30,7 @@ __all__ = ["TangoAuthorityNameValidator", "TangoDeviceNameValidator",
 
 __docformat__ = "restructuredtext"
 
+import time
 
 from taurus.core.taurusvalidator import (TaurusAttributeNameValidator,
                                          TaurusDeviceNameValidator,
@@ -80,6 +81,31 @@ class TangoDeviceNameValidator(TaurusDeviceNameValidator):
     query = '(?!)'
     fragment = '(?!)'
 
+    DefaultAuthorityTTL = 10  # seconds
+
+    _default_authority = None
+    _default_authority_time = 0
+
+    @classmethod
+    def getDefaultAuthority(cls):
+        '''Returns the authority corresponding to the TANGO_HOST environment
+        variable (e.g. "//foo:10000"). The value is cached for
+        `DefaultAuthorityTTL` seconds. If it changes, the name caches of the
+        factories are cleared (see :meth:`TaurusManager.clearNameCaches`)
+        '''
+        now = time.time()
+        if (cls._default_authority is None or
+                now - cls._default_authority_time > cls.DefaultAuthorityTTL):
+            import PyTango
+            tango_host = PyTango.ApiUtil.get_env_var('TANGO_HOST')
+            old, cls._default_authority = (cls._default_authority,
+                                           '//' + tango_host)
+            cls._default_authority_time = now
+            if old is not None and old != cls._default_authority:
+                from taurus.core.taurusmanager import TaurusManager
+                TaurusManager().clearNameCaches()
+        return cls._default_authority
+
     def getNames(self, fullname, factory=None, queryAuth=True):
         '''reimplemented from :class:`TaurusDeviceNameValidator`. It accepts an
         extra keyword arg `queryAuth` which, if set to False, will prevent the
@@ -90,8 +116,7 @@ class TangoDeviceNameValidator(TaurusDeviceNameValidator):
         if groups is None:
             return None
 
-        import PyTango
-        default_authority = '//' + PyTango.ApiUtil.get_env_var('TANGO_HOST')
+        default_authority = self.getDefaultAuthority()
 
         authority = groups.get('authority')
         if authority is None:
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of the decoding of TangoAttrValue objects.
+
+It compares the cost of creating a TangoAttrValue (what is paid for every
+event, even if no listener reads its value) with the cost of creating it and
+accessing its rvalue and wvalue (what was paid for every event when the
+decoding was done in the constructor).
+
+Usage: python -m taurus.core.tango.test.bench_tangoattrvalue
+"""
+
+__docformat__ = 'restructuredtext'
+
+import time
+import numpy
+import PyTango
+
+from taurus.core import DataType, DataFormat
+from taurus.core.tango.tangoattribute import TangoAttrValue
+from taurus.core.tango.util.tango_taurus import unit_from_tango
+from taurus.test import benchmark, printBenchmarks
+
+
+class _Attr(object):
+    """Stand-in for a TangoAttribute (only the members used for decoding)"""
+
+    def __init__(self, tango_type, data_format, dtype, unit='mm'):
+        self._tango_data_type = tango_type
+        self._units = unit_from_tango(unit)
+        self.data_format = data_format
+        self.type = dtype
+
+
+class _DeviceAttribute(object):
+    """Stand-in for a PyTango.DeviceAttribute as received in an event"""
+
+    def __init__(self, tango_type, value):
+        self.type = tango_type
+        self.value = value
+        self.w_value = value
+        self.has_failed = False
+        self.is_empty = False
+        self.quality = PyTango.AttrQuality.ATTR_VALID
+        self.time = PyTango.TimeVal(time.time())
+
+
+_CASES = [
+    ('double scalar', PyTango.CmdArgType.DevDouble, DataFormat._0D,
+     DataType.Float, 1.5),
+    ('double spectrum (1k)', PyTango.CmdArgType.DevDouble, DataFormat._1D,
+     DataType.Float, numpy.arange(1024.)),
+    ('double image (512x512)', PyTango.CmdArgType.DevDouble, DataFormat._2D,
+     DataType.Float, numpy.zeros((512, 512))),
+    ('state scalar', PyTango.CmdArgType.DevState, DataFormat._0D,
+     DataType.DevState, PyTango.DevState.ON),
+    ('uchar spectrum (1k)', PyTango.CmdArgType.DevUChar, DataFormat._1D,
+     DataType.Bytes, numpy.zeros(1024, dtype='uint8')),
+]
+
+
+def main():
+    results = []
+    for name, tango_type, data_format, dtype, value in _CASES:
+        attr = _Attr(tango_type, data_format, dtype)
+        dev_attr = _DeviceAttribute(tango_type, value)
+
+        def create():
+            TangoAttrValue(attr=attr, pytango_dev_attr=dev_attr)
+
+        def create_and_decode():
+            v = TangoAttrValue(attr=attr, pytango_dev_attr=dev_attr)
+            v.rvalue, v.wvalue
+
+        results.append((name, benchmark(create_and_decode), benchmark(create)))
+    printBenchmarks(results, title='TangoAttrValue per-event cost ' +
+                    '(decoded vs lazy)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.tango.tangodatabase.TangoAliasResolver"""
+
+__docformat__ = 'restructuredtext'
+
+
+from taurus.external import unittest
+from taurus.core.tango.tangodatabase import TangoAliasResolver
+
+
+class _FakeAuthority(object):
+    '''Implements the database queries used by TangoAliasResolver, counting
+    the calls'''
+
+    def __init__(self, aliases, bulkFails=False):
+        self.aliases = dict(aliases)  # alias --> device name
+        self.bulkFails = bulkFails
+        self.queries = 0
+
+    def _getAliasTable(self):
+        self.queries += 1
+        if self.bulkFails:
+            raise Exception('bulk query not available')
+        return self.aliases.items()
+
+    def _getElementFullName(self, alias):
+        self.queries += 1
+        return self.aliases.get(alias)
+
+    def _getElementAlias(self, full_name):
+        self.queries += 1
+        for alias, dev_name in self.aliases.items():
+            if dev_name == full_name:
+                return alias
+        return None
+
+
+class TangoAliasResolverTestCase(unittest.TestCase):
+    '''Test case for TangoAliasResolver (with a fake database)'''
+
+    def setUp(self):
+        self.db = _FakeAuthority({'motor1': 'a/b/c', 'motor2': 'a/b/d'})
+        self.resolver = TangoAliasResolver(self.db)
+
+    def test_hit(self):
+        '''check that the aliases are filled in bulk with a single query'''
+        r = self.resolver
+        self.assertEqual(r.getDeviceName('motor1'), 'a/b/c')
+        self.assertEqual(r.getAlias('a/b/d'), 'motor2')
+        self.assertEqual(r.getAlias('A/B/C'), 'motor1')  # caseless
+        self.assertEqual(self.db.queries, 1)
+        self.assertEqual((r.hits, r.misses), (2, 1))
+
+    def test_miss(self):
+        '''check that names not in the bulk fill are not queried'''
+        r = self.resolver
+        self.assertEqual(r.getAlias('x/y/z'), None)
+        self.assertEqual(r.getDeviceName('motor3'), None)
+        self.assertEqual(r.getAlias('x/y/w'), None)
+        self.assertEqual(self.db.queries, 1)
+
+    def test_negative_cache(self):
+        '''check that the answers (even negative) are cached when there is
+        no bulk fill'''
+        for bulkFails, bulk, queries in ((True, True, 4), (False, False, 3)):
+            db = _FakeAuthority(self.db.aliases, bulkFails=bulkFails)
+            r = TangoAliasResolver(db, bulk=bulk)
+            for i in range(3):
+                self.assertEqual(r.getAlias('x/y/z'), None)
+                self.assertEqual(r.getDeviceName('motor3'), None)
+                self.assertEqual(r.getAlias('a/b/c'), 'motor1')
+            self.assertEqual(db.queries, queries)
+            self.assertEqual(r.hits, 6)
+
+    def test_ttl(self):
+        '''check that the cache is refilled once the ttl expires'''
+        r = self.resolver
+        self.assertEqual(r.getDeviceName('motor3'), None)
+        self.db.aliases['motor3'] = 'a/b/e'
+        self.assertEqual(r.getDeviceName('motor3'), None)  # still cached
+        r._timestamp -= r.ttl + 1
+        self.assertEqual(r.getDeviceName('motor3'), 'a/b/e')
+        self.assertEqual(r.getAlias('a/b/e'), 'motor3')
+        self.assertEqual(self.db.queries, 2)
+
+    def test_refresh(self):
+        '''check that refresh reloads the aliases'''
+        r = self.resolver
+        self.assertEqual(r.getAlias('a/b/c'), 'motor1')
+        self.db.aliases = {'motor4': 'a/b/c'}
+        r.refresh()
+        self.assertEqual(r.getAlias('a/b/c'), 'motor4')
+        self.assertEqual(r.getDeviceName('motor1'), None)
+        self.assertEqual(self.db.queries, 2)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.tango.tangoattribute.TangoAttrValue"""
+
+__docformat__ = 'restructuredtext'
+
+import threading
+import numpy
+import PyTango
+
+from taurus.external import unittest
+from taurus.core import DataType, DataFormat
+from taurus.core.tango.tangoattribute import TangoAttrValue
+from taurus.core.tango.test.bench_tangoattrvalue import (_Attr,
+                                                         _DeviceAttribute)
+
+
+class TangoAttrValueTestCase(unittest.TestCase):
+    '''Test case for the lazy decoding of TangoAttrValue'''
+
+    def _createValue(self, value):
+        attr = _Attr(PyTango.CmdArgType.DevDouble, DataFormat._1D,
+                     DataType.Float)
+        dev_attr = _DeviceAttribute(PyTango.CmdArgType.DevDouble, value)
+        return TangoAttrValue(attr=attr, pytango_dev_attr=dev_attr)
+
+    def test_lazy(self):
+        '''check that the values are decoded on first access'''
+        v = self._createValue(numpy.arange(3.))
+        self.assertFalse(v.isDecoded())
+        self.assertEqual(v.rvalue.magnitude.tolist(), [0., 1., 2.])
+        self.assertTrue(v.isDecoded())
+        self.assertEqual(str(v.wvalue.units), 'millimeter')
+
+    def test_threaded(self):
+        '''check that a value shared by several threads is decoded once and
+        that all of them get the decoded values'''
+        values = [self._createValue(numpy.arange(float(i)))
+                  for i in range(200)]
+        start = threading.Event()
+        errors = []
+
+        def read():
+            start.wait()
+            for i, v in enumerate(values):
+                try:
+                    r, w = v.rvalue, v.wvalue
+                    if len(r.magnitude) != i or len(w.magnitude) != i:
+                        errors.append('wrong value for %d' % i)
+                except Exception, e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for t in threads:
+            t.start()
+        start.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    pass
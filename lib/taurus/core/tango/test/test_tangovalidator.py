@@ -29,8 +29,11 @@
 
 __docformat__ = 'restructuredtext'
 
+import os
 
+import taurus
 from taurus.external import unittest
+from taurus.core.taurusbasetypes import TaurusElementType
 from taurus.core.test import (valid, invalid, names,
                               AbstractNameValidatorTestCase)
 from taurus.core.tango.tangovalidator import (TangoAuthorityNameValidator,
@@ -158,5 +161,62 @@ class TangoAttrValidatorTestCase(AbstractNameValidatorTestCase,
     validator = TangoAttributeNameValidator
 
 
+
+class DefaultAuthorityChangeTestCase(unittest.TestCase):
+    '''Test that the names that depend on the tango default authority are
+    resolved again when it changes'''
+
+    def setUp(self):
+        self._tango_host = os.environ.get('TANGO_HOST')
+
+    def tearDown(self):
+        if self._tango_host is None:
+            os.environ.pop('TANGO_HOST', None)
+        else:
+            os.environ['TANGO_HOST'] = self._tango_host
+        self._expire()
+        TangoDeviceNameValidator.getDefaultAuthority()
+
+    def _expire(self):
+        '''makes the next getDefaultAuthority call read TANGO_HOST'''
+        TangoDeviceNameValidator._default_authority_time = 0
+
+    def _setTangoHost(self, tango_host):
+        os.environ['TANGO_HOST'] = tango_host
+        self._expire()
+        TangoDeviceNameValidator.getDefaultAuthority()
+
+    def test_evalNames(self):
+        '''check that the eval names are resolved with the new host'''
+        model = 'eval:{tango:a/b/c/d}*2'
+        v = taurus.Factory('eval').getAttributeNameValidator()
+        for tango_host in ('foo:10000', 'bar:10000'):
+            self._setTangoHost(tango_host)
+            fullname = v.getNames(model)[0]
+            self.assertIn('{tango://%s/a/b/c/d}' % tango_host, fullname)
+
+    def test_tangoHostChange(self):
+        '''check that a TANGO_HOST change clears the eval name cache'''
+        f = taurus.Factory('eval')
+        key = TaurusElementType.Attribute, 'eval:{tango:a/b/c/d}'
+        self._setTangoHost('foo:10000')
+        f.getNameCache()[key] = 'eval://localhost/@DefaultEvaluator/{foo}'
+        self._setTangoHost('bar:10000')
+        self.assertIsNone(f.getNameCache().get(key))
+
+    def test_setDefaultTangoHost(self):
+        '''check that set_default_tango_host clears the eval name cache'''
+        f = taurus.Factory('eval')
+        key = TaurusElementType.Attribute, 'eval:{tango:a/b/c/d}'
+        f.getNameCache()[key] = 'eval://localhost/@DefaultEvaluator/{foo}'
+        tf = taurus.Factory('tango')
+        old = tf._default_tango_host
+        try:
+            tf.set_default_tango_host('foo:10000')
+            self.assertIsNone(f.getNameCache().get(key))
+        finally:
+            tf.set_default_tango_host(old)
+
+
 if __name__ == '__main__':
     pass
@@ -27,7 +27,8 @@
 
 import PyTango
 
-from taurus.external.pint import Quantity, UndefinedUnitError, UR
+from taurus.external.pint import Quantity, UndefinedUnitError
+from taurus.core.util.units import getUnit
 from taurus.core.taurusbasetypes import (AttrQuality, DisplayLevel,
                                          TaurusAttrValue, DataType, DataFormat)
 
@@ -117,12 +118,12 @@ def unit_from_tango(unit):
     if unit == PyTango.constants.UnitNotSpec:
         unit = None
     try:
-        return UR.parse_units(unit)
+        return getUnit(unit)
     except UndefinedUnitError:
         # TODO: Maybe we could dynamically register the unit in the UR
         from taurus import warning
         warning('Unknown unit "%s (will be treated as dimensionless)"', unit)
-        return UR.parse_units(None)
+        return getUnit(None)
 
 
 def ndim_from_tango(data_format):
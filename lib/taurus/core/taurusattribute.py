@@ -179,6 +179,13 @@ class TaurusAttribute(TaurusModel):
     # API for listeners
     #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
 
+    def addListener(self, listener):
+        ret = TaurusModel.addListener(self, listener)
+        # a new listener wants fresh data
+        if ret and self.isPollingActive():
+            self.factory().refreshAttributePolling(self)
+        return ret
+
     def hasEvents(self):
         self.deprecated("Don't use this anymore. Use isUsingEvents instead")
         return self.isUsingEvents()
@@ -259,6 +266,13 @@ class TaurusAttribute(TaurusModel):
             self._deactivatePolling()
             self._activatePolling()
 
+    def refreshPolling(self):
+        """Requests fresh data: if the polling period of the attribute has
+        been increased by the adaptive polling policy, the nominal period is
+        restored."""
+        if self.isPollingActive():
+            self.factory().refreshAttributePolling(self)
+
     def isPolled(self):
         self.deprecated("use isPollingActive()")
         return self.isPollingActive()
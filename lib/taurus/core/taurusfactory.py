@@ -68,7 +68,10 @@ from taurusdevice import TaurusDevice
 from taurusattribute import TaurusAttribute
 from taurusconfiguration import TaurusConfiguration, TaurusConfigurationProxy
 from taurusexception import TaurusException
-from taurus.core.tauruspollingtimer import TaurusPollingTimer
+from taurus.core.util.containers import LRUCache
+from taurus.core.tauruspollingtimer import (TaurusPollingTimer,
+                                            AdaptivePollingPolicy)
+from taurus import tauruscustomsettings
 
 
 class TaurusFactory(object):
@@ -84,11 +87,18 @@ class TaurusFactory(object):
 
     DefaultPollingPeriod = 3000
 
+    NameCacheSize = 4096  # max number of names kept in the name cache
+
     def __init__(self):
         atexit.register(self.cleanUp)
         self._polling_period = self.DefaultPollingPeriod
         self.polling_timers = {}
         self._polling_enabled = True
+        if getattr(tauruscustomsettings, 'ADAPTIVE_POLLING', False):
+            self._polling_policy = AdaptivePollingPolicy()
+        else:
+            self._polling_policy = None
+        self._name_cache = LRUCache(self.NameCacheSize)
         self._attrs = WeakValueDictionary()
         self._devs = WeakValueDictionary()
         self._auths = WeakValueDictionary()
@@ -166,17 +176,19 @@ class TaurusFactory(object):
         :return: a taurus.core.taurusdevice.TaurusDevice object
         :raises: :TaurusException: if the given name is invalid.
         """
-        v = self.getDeviceNameValidator()
-        if not v.isValid(name):
+        fullname = self._getFullName(name, self.getDeviceNameValidator,
+                                     TaurusElementType.Device)
+        if fullname is None:
             msg = "Invalid {scheme} device name '{name}'".format(
                     scheme=self.schemes[0], name=name)
             raise TaurusException(msg)
 
-        fullname, _, _ = v.getNames(name)
         dev = self._devs.get(fullname)
         if dev is not None:
             return dev
 
+        v = self.getDeviceNameValidator()
+
         try:
             # this works if the authority name is present in the dev full name
             # (which in principle should always be the case)
@@ -201,17 +213,19 @@ class TaurusFactory(object):
         :return: a taurus.core.taurusattribute.TaurusAttribute object
         :raises: :TaurusException: if the given name is invalid.
         """
-        v = self.getAttributeNameValidator()
-        if not v.isValid(name):
+        fullname = self._getFullName(name, self.getAttributeNameValidator,
+                                     TaurusElementType.Attribute)
+        if fullname is None:
             msg = "Invalid {scheme} attribute name '{name}'".format(
                     scheme=self.schemes[0], name=name)
             raise TaurusException(msg)
 
-        fullname, _, _ = v.getNames(name)
         attr = self._attrs.get(fullname)
         if attr is not None:
             return attr
 
+        v = self.getAttributeNameValidator()
+
         try:
             # this works only if the devname is present in the attr full name
             # (not all schemes are constructed in this way)
@@ -226,6 +240,97 @@ class TaurusFactory(object):
         self._attrs[fullname] = attr
         return attr
 
+    def getDevices(self, names):
+        """ Obtain the model objects corresponding to the given device names.
+        The default implementation just calls :meth:`getDevice` for each name
+        but schemes may reimplement it to create many devices more
+        efficiently.
+
+        :param names: (seq<str>) device names
+
+        :return: (list<TaurusDevice>) the devices, in the same order as names
+        :raises: :TaurusException: if any of the given names is invalid.
+        """
+        return [self.getDevice(name) for name in names]
+
+    def getAttributes(self, names):
+        """ Obtain the model objects corresponding to the given attribute
+        names. The default implementation just calls :meth:`getAttribute` for
+        each name but schemes may reimplement it to create many attributes
+        more efficiently (e.g. by grouping them by device).
+
+        :param names: (seq<str>) attribute names
+
+        :return: (list<TaurusAttribute>) the attributes, in the same order
+                 as names
+        :raises: :TaurusException: if any of the given names is invalid.
+        """
+        return [self.getAttribute(name) for name in names]
+
+    def addListeners(self, models, listener):
+        """Adds the given listener to each of the given models of this
+        factory, which subscribes them to the events of their sources. The
+        default implementation adds it to one model after another but schemes
+        may reimplement it to issue the subscriptions concurrently.
+
+        :param models: (seq<TaurusModel>) models of this factory
+        :param listener: (object) the listener (see
+                         :meth:`TaurusModel.addListener`)
+        """
+        for model in models:
+            model.addListener(listener)
+
+    def removeListeners(self, models, listener):
+        """Removes the given listener from each of the given models of this
+        factory (see :meth:`addListeners`)
+
+        :param models: (seq<TaurusModel>) models of this factory
+        :param listener: (object) the listener
+        """
+        for model in models:
+            model.removeListener(listener)
+
+    #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
+    # API for the name cache
+    #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
+
+    def _getFullName(self, name, getValidator, elementType):
+        """Returns the full name corresponding to the given name of the given
+        element type. The result is cached, so that the validator (obtained
+        by calling `getValidator`) is only used the first time a given name
+        is requested.
+
+        :param name: (str) the model name
+        :param getValidator: (callable) returns the name validator for the
+                             element type
+        :param elementType: (TaurusElementType) the element type
+
+        :return: (str) the full name or None if the name is not valid
+        """
+        key = elementType, name
+        fullname = self._name_cache.get(key)
+        if fullname is None:
+            v = getValidator()
+            if not v.isValid(name):
+                return None
+            fullname, _, _ = v.getNames(name)
+            if fullname is not None:
+                self._name_cache[key] = fullname
+        return fullname
+
+    def clearNameCache(self):
+        """Empties the cache of full names. Call it whenever the full name
+        corresponding to a given name may have changed (e.g. because the
+        default authority has changed)."""
+        self._name_cache.clear()
+
+    def getNameCache(self):
+        """Returns the cache of full names (see :meth:`_getFullName`)
+
+        :return: (taurus.core.util.containers.LRUCache) the name cache
+        """
+        return self._name_cache
+
     #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
     # Methods that must be implemented by the specific Factory
     #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
@@ -342,8 +447,10 @@ class TaurusFactory(object):
            :param period: (float) polling period (in seconds)
            :param unsubscribe_evts: (bool) whether or not to unsubscribe from events
         """
-        tmr = self.polling_timers.get(period, TaurusPollingTimer(period))
-        self.polling_timers[period] = tmr
+        tmr = self.polling_timers.get(period)
+        if tmr is None:
+            tmr = TaurusPollingTimer(period, policy=self._polling_policy)
+            self.polling_timers[period] = tmr
         tmr.addAttribute(attribute, self.isPollingEnabled())
 
     def removeAttributeFromPolling(self, attribute):
@@ -362,6 +469,49 @@ class TaurusFactory(object):
         if p:
             del self.polling_timers[period]
 
+    def refreshAttributePolling(self, attribute):
+        """Restores the nominal polling period of the given attribute if the
+           adaptive polling policy changed it (see
+           :meth:`setAdaptivePollingPolicy`). If the attribute is not polled,
+           nothing happens.
+
+           :param attribute: (taurus.core.taurusattribute.TaurusAttribute) the attribute
+        """
+        for timer in self.polling_timers.values():
+            if timer.containsAttribute(attribute):
+                timer.refreshAttribute(attribute)
+                break
+
+    def setAdaptivePollingPolicy(self, policy):
+        """Sets the policy for adapting the polling period of each attribute
+           to whether it is being displayed and to how often its value changes.
+
+           :param policy: (taurus.core.tauruspollingtimer.AdaptivePollingPolicy)
+                          the policy or None for always polling the attributes
+                          with their nominal period
+        """
+        self._polling_policy = policy
+        for timer in self.polling_timers.values():
+            timer.setPolicy(policy)
+
+    def getAdaptivePollingPolicy(self):
+        """Returns the policy for adapting the polling period of each
+           attribute.
+
+           :return: (taurus.core.tauruspollingtimer.AdaptivePollingPolicy) the
+                    policy or None
+        """
+        return self._polling_policy
+
+    def getPollingOverrunCounts(self):
+        """Returns the number of polls skipped because polling took longer
+           than the polling period, for each of the active polling periods.
+
+           :return: (dict<int,int>) map of period (ms) to overrun count
+        """
+        return dict([(period, timer.getOverrunCount())
+                     for period, timer in self.polling_timers.iteritems()])
+
     def __str__(self):
         return '{0}()'.format(self.__class__.__name__)
 
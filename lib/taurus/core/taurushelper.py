@@ -27,7 +27,8 @@
 
 __all__ = ['check_dependencies', 'log_dependencies', 'getSchemeFromName',
            'getValidTypesForName', 'isValidName', 'makeSchemeExplicit',
-           'Manager', 'Factory', 'Device', 'Attribute', 'Configuration',
+           'Manager', 'Factory', 'Device', 'Attribute', 'Devices',
+           'Attributes', 'Configuration',
            'Database', 'Authority', 'Object', 'Logger',
            'Critical', 'Error', 'Warning', 'Info', 'Debug', 'Trace',
            'setLogLevel', 'setLogFormat', 'getLogLevel', 'getLogFormat',
@@ -545,6 +546,94 @@ def Attribute(dev_or_attr_name, attr_name=None):
         return dev.getAttribute(attr_name)
 
 
+def __getObjects(names, getter):
+    """groups the names by scheme and calls the given factory method once
+    for each scheme. Returns the objects in the same order as names"""
+    by_scheme = {}
+    for i, name in enumerate(names):
+        scheme = getSchemeFromName(name)
+        by_scheme.setdefault(scheme, []).append(i)
+    ret = [None] * len(names)
+    for scheme, indexes in by_scheme.items():
+        factory = Factory(scheme=scheme)
+        objs = getattr(factory, getter)([names[i] for i in indexes])
+        for i, obj in zip(indexes, objs):
+            ret[i] = obj
+    return ret
+
+
+def Devices(device_names):
+    """Returns the taurus devices for the given device names. It is
+    equivalent to (but may be faster than)::
+
+        [taurus.Device(name) for name in device_names]
+
+    :param device_names: the device names (they may belong to different
+                         schemes)
+    :type device_names: seq<str>
+    :return: the taurus devices, in the same order as the given names
+    :rtype: list<:class:`taurus.core.taurusdevice.TaurusDevice`>
+    """
+    return __getObjects(device_names, 'getDevices')
+
+
+def Attributes(attr_names):
+    """Returns the taurus attributes for the given full attribute names. It is
+    equivalent to (but may be much faster than)::
+
+        [taurus.Attribute(name) for name in attr_names]
+
+    since the factories may group the creation of the attributes (e.g. the
+    Tango factory does a single configuration query per device).
+
+    :param attr_names: the full attribute names (they may belong to different
+                       schemes)
+    :type attr_names: seq<str>
+    :return: the taurus attributes, in the same order as the given names
+    :rtype: list<:class:`taurus.core.taurusattribute.TaurusAttribute`>
+    """
+    return __getObjects(attr_names, 'getAttributes')
+
+
+def __byFactory(models):
+    """groups the models by factory"""
+    by_factory = {}
+    for model in models:
+        factory = model.factory()
+        by_factory.setdefault(id(factory), (factory, []))[1].append(model)
+    return by_factory.values()
+
+
+def addListeners(models, listener):
+    """Adds the given listener to each of the given models. It is equivalent
+    to (but may be much faster than)::
+
+        for model in models:
+            model.addListener(listener)
+
+    since the factories may issue the event subscriptions concurrently (see
+    :meth:`TaurusFactory.addListeners`).
+
+    :param models: the models (they may belong to different schemes)
+    :type models: seq<:class:`taurus.core.taurusmodel.TaurusModel`>
+    :param listener: the listener
+    """
+    for factory, objs in __byFactory(models):
+        factory.addListeners(objs, listener)
+
+
+def removeListeners(models, listener):
+    """Removes the given listener from each of the given models (see
+    :func:`addListeners`)
+
+    :param models: the models (they may belong to different schemes)
+    :type models: seq<:class:`taurus.core.taurusmodel.TaurusModel`>
+    :param listener: the listener
+    """
+    for factory, objs in __byFactory(models):
+        factory.removeListeners(objs, listener)
+
+
 @taurus4_deprecation(alt='Attribute')
 def Configuration(attr_or_conf_name, conf_name=None):
     """Returns the taurus configuration for either the pair
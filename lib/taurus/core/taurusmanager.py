@@ -30,7 +30,11 @@ __all__ = ["TaurusManager"]
 __docformat__ = "restructuredtext"
 
 import os
+import time
 import atexit
+import collections
+import pkgutil
+import threading
 
 from .util.singleton import Singleton
 from .util.log import Logger, taurus4_deprecation
@@ -59,6 +63,8 @@ class TaurusManager(Singleton, Logger):
     PLUGIN_KEY = "__taurus_plugin__"
 
     DefaultSerializationMode = TaurusSerializationMode.Concurrent
+    OrderedLaneCount = 8
+    CoalescedJobsPerRun = 16
     default_scheme = getattr(tauruscustomsettings, 'DEFAULT_SCHEME', "tango")
 
     def __init__(self):
@@ -82,14 +88,15 @@ class TaurusManager(Singleton, Logger):
         this_path = os.path.abspath(__file__)
         self._this_path = os.path.dirname(this_path)
         self._serialization_mode = self.DefaultSerializationMode
-        if self._serialization_mode == TaurusSerializationMode.Concurrent:
-            self._thread_pool = ThreadPool(name="TaurusTP",
-                                           parent=self,
-                                           Psize=5,
-                                           Qsize=1000)
-        else:
-            self._thread_pool = None
+        self._thread_pool = None
+        self._lanes = None
+        self._initThreadPools()
+        self._coalesced_lock = threading.Lock()
+        self._coalesced_jobs = {}
         self._plugins = None
+        self._factories = {}
+        self._scheme_registry = None
+        self._import_report = []
 
         self._initial_default_scheme = self.default_scheme
 
@@ -101,16 +108,44 @@ class TaurusManager(Singleton, Logger):
             return
         self.trace("cleanUp()")
 
-        if self._plugins is None:
+        if self._plugins is None and not self._factories:
             return
         self.trace("[TaurusManager] cleanUp")
         self._plugins = None
+        self._factories = {}
 
-        self._thread_pool.join()
-        self._thread_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.join()
+            self._thread_pool = None
+        if self._lanes is not None:
+            for lane in self._lanes:
+                lane.join()
+            self._lanes = None
 
         self._state = ManagerState.CLEANED
 
+    def _initThreadPools(self):
+        """creates the thread pools needed by the current serialization mode
+        (if they do not exist yet)"""
+        mode = self._serialization_mode
+        if mode == TaurusSerializationMode.Serial:
+            return
+        sampling = getattr(tauruscustomsettings,
+                           'THREADPOOL_ORIGIN_SAMPLING', 0)
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPool(name="TaurusTP",
+                                           parent=self,
+                                           Psize=5,
+                                           Qsize=1000,
+                                           origin_sampling=sampling)
+        if mode == TaurusSerializationMode.Ordered and self._lanes is None:
+            self._lanes = [ThreadPool(name="TaurusLane%d" % i,
+                                      parent=self,
+                                      Psize=1,
+                                      Qsize=1000,
+                                      origin_sampling=sampling)
+                           for i in range(self.OrderedLaneCount)]
+
     def addJob(self, job, callback=None, *args, **kw):
         """Add a new job (callable) to the queue. The new job will be processed
         by a separate thread
@@ -120,7 +155,7 @@ class TaurusManager(Singleton, Logger):
         :param args: (list) list of arguments passed to the job
         :param kw: (dict) keyword arguments passed to the job
         """
-        if self._serialization_mode == TaurusSerializationMode.Concurrent:
+        if self._serialization_mode != TaurusSerializationMode.Serial:
             if not hasattr(self, "_thread_pool") or self._thread_pool is None:
                 self.info("Job cannot be processed.")
                 self.debug(
@@ -130,11 +165,148 @@ class TaurusManager(Singleton, Logger):
         else:
             job(*args, **kw)
 
+    def addPriorityJob(self, job, callback=None, *args, **kw):
+        """Same as :meth:`addJob` but, if a thread pool is used, the job is
+        processed before any pending job added with :meth:`addJob`.
+        Use it for infrequent but important jobs (e.g. configuration or error
+        events) which should not wait behind bursts of regular jobs.
+
+        :param job: (callable) a callable object
+        :param callback: (callable) called after the job has been processed
+        :param args: (list) list of arguments passed to the job
+        :param kw: (dict) keyword arguments passed to the job
+        """
+        if self._serialization_mode != TaurusSerializationMode.Serial:
+            if not hasattr(self, "_thread_pool") or self._thread_pool is None:
+                self.info("Job cannot be processed.")
+                self.debug(
+                    "The requested job cannot be processed. Make sure this manager is initialized")
+                return
+            self._thread_pool.addPriority(job, callback, *args, **kw)
+        else:
+            job(*args, **kw)
+
+    def addCoalescedJob(self, key, job, *args, **kw):
+        """Adds a job which replaces the last pending job of its sequence if
+        that one was also added with this method and with the same key.
+        The sequence of the job is the first item of the key if the key is a
+        tuple (e.g. the attribute of an (attribute, event type) key) and the
+        key itself otherwise. Jobs of the same sequence are never processed
+        concurrently so, from those that are not replaced, they are processed
+        in the order in which they were added (see also
+        :meth:`addSequencedJob`).
+
+        This is meant for jobs in which only the latest one matters, e.g.
+        delivering the latest value of an attribute: it bounds the number of
+        pending jobs and avoids processing obsolete ones.
+
+        :param key: (object) hashable identifying the jobs which replace each
+                    other (e.g. (attribute, TaurusEventType.Change))
+        :param job: (callable) a callable object
+        :param args: (list) list of arguments passed to the job
+        :param kw: (dict) keyword arguments passed to the job
+        """
+        sequence = key[0] if isinstance(key, tuple) else key
+        self._addKeyedJob(sequence, key, job, args, kw)
+
+    def addSequencedJob(self, key, job, *args, **kw):
+        """Adds a job which is processed after all the pending jobs of the
+        sequence identified by the given key, added with this method or with
+        :meth:`addCoalescedJob` (and which is never replaced by later ones).
+        If there are no such pending jobs, it is processed before any pending
+        job added with :meth:`addJob`, as with :meth:`addPriorityJob`.
+
+        This is meant for infrequent but important jobs which must keep their
+        order with respect to the coalesced ones, e.g. delivering the
+        configuration and error events of an attribute.
+
+        :param key: (object) hashable identifying the sequence of jobs
+                    (e.g. the attribute)
+        :param job: (callable) a callable object
+        :param args: (list) list of arguments passed to the job
+        :param kw: (dict) keyword arguments passed to the job
+        """
+        self._addKeyedJob(key, None, job, args, kw)
+
+    def _addKeyedJob(self, key, coalesceKey, job, args, kw):
+        """queues a job in the sequence of the given key, replacing the last
+        pending one if both have the same coalescing key (see
+        :meth:`addCoalescedJob` and :meth:`addSequencedJob`)"""
+        if (self._serialization_mode != TaurusSerializationMode.Concurrent
+                or getattr(self, "_thread_pool", None) is None):
+            self.addJob(job, None, *args, **kw)
+            return
+        with self._coalesced_lock:
+            pending = self._coalesced_jobs.get(key)
+            scheduled = pending is not None
+            if not scheduled:
+                pending = self._coalesced_jobs[key] = collections.deque()
+            coalesce = coalesceKey is not None
+            if coalesce and pending and pending[-1][0] == coalesceKey:
+                pending[-1] = coalesceKey, job, args, kw
+            else:
+                pending.append((coalesceKey, job, args, kw))
+        if not scheduled:
+            if coalesce:
+                self.addJob(self._processCoalescedJobs, None, key)
+            else:
+                self.addPriorityJob(self._processCoalescedJobs, None, key)
+
+    def _processCoalescedJobs(self, key):
+        """processes the pending jobs for the given key until there are no
+        more. After :attr:`CoalescedJobsPerRun` jobs, the rest are left to a
+        new job (so that a busy key does not keep a worker forever)"""
+        for _ in xrange(self.CoalescedJobsPerRun):
+            with self._coalesced_lock:
+                pending = self._coalesced_jobs[key]
+                if not pending:
+                    del self._coalesced_jobs[key]
+                    return
+                _, job, args, kw = pending.popleft()
+            try:
+                job(*args, **kw)
+            except:
+                self.error("Uncaught exception running coalesced job '%s'",
+                           getattr(job, '__name__', repr(job)), exc_info=1)
+        self.addJob(self._processCoalescedJobs, None, key)
+
+    def addOrderedJob(self, key, job, callback=None, *args, **kw):
+        """Same as :meth:`addJob` but, in Ordered serialization mode, the job
+        is processed by one of a fixed set of serial lanes, chosen by hashing
+        the given key. All the jobs with the same key (e.g. all the events of
+        a given model) are therefore processed in the order in which they
+        were added, while jobs with different keys can run in parallel.
+
+        :param key: (object) hashable used for choosing the lane
+                    (e.g. the model)
+        :param job: (callable) a callable object
+        :param callback: (callable) called after the job has been processed
+        :param args: (list) list of arguments passed to the job
+        :param kw: (dict) keyword arguments passed to the job
+        """
+        lanes = getattr(self, "_lanes", None)
+        if (self._serialization_mode != TaurusSerializationMode.Ordered
+                or lanes is None):
+            self.addJob(job, callback, *args, **kw)
+            return
+        lanes[hash(key) % len(lanes)].add(job, callback, *args, **kw)
+
+    def getJobMetrics(self):
+        """Returns the activity metrics of the thread pool used for
+        processing jobs (see :meth:`ThreadPool.getMetrics`)
+
+        :return: (dict or None) the metrics or None if no thread pool is used
+        """
+        if getattr(self, "_thread_pool", None) is None:
+            return None
+        return self._thread_pool.getMetrics()
+
     def setSerializationMode(self, mode):
         """Sets the serialization mode for the system.
 
         :param mode: (TaurusSerializationMode) the new serialization mode"""
         self._serialization_mode = mode
+        self._initThreadPools()
 
     def getSerializationMode(self):
         """Gives the serialization operation mode.
@@ -168,10 +340,13 @@ class TaurusManager(Singleton, Logger):
 
         :return: (taurus.core.taurusfactory.TaurusFactory) the default taurus factory
         """
-        return self.getPlugins().get(self.default_scheme, None)
+        return self.getFactory(self.default_scheme)
 
     def getPlugins(self):
-        """Gives the information about the existing plugins
+        """Gives the information about the existing plugins.
+
+        .. note:: this imports all the plugins. Use :meth:`getFactory` or
+                  :meth:`getSchemeRegistry` for importing only the needed ones
 
         :return: (dict<str, class taurus.core.taurusfactory.TaurusFactory>)the list of plugins
         """
@@ -187,8 +362,127 @@ class TaurusManager(Singleton, Logger):
                  given scheme or None if a proper factory is not found
         """
         if scheme is None:
-            return self.getDefaultFactory()
-        return self.getPlugins().get(scheme)
+            scheme = self.default_scheme
+        try:
+            return self._factories[scheme]
+        except KeyError:
+            pass
+        if self._plugins is not None:
+            return self._plugins.get(scheme)
+        factory_name = self.getSchemeRegistry().get(scheme)
+        if factory_name is None:
+            # undeclared scheme: look for it in all the plugins
+            return self.getPlugins().get(scheme)
+        factory = self._importFactory(factory_name)
+        if factory is None:
+            self._factories[scheme] = None  # do not retry
+            return None
+        for s in factory.schemes:
+            self._factories.setdefault(s, factory)
+        return self._factories.get(scheme)
+
+    def clearNameCaches(self):
+        """Empties the name caches of all the factories loaded so far (see
+        :meth:`TaurusFactory.clearNameCache`). Call it whenever the full names
+        of a scheme may have changed (e.g. because its default authority has
+        changed), since the names of other schemes may embed them (e.g. the
+        eval names embed the full names of their references).
+        """
+        factories = set(self._factories.values())
+        if self._plugins is not None:
+            factories.update(self._plugins.values())
+        for factory in factories:
+            if factory is not None:
+                factory().clearNameCache()
+
+    def getSchemeRegistry(self):
+        """Returns the schemes declared by the plugins (without importing
+        them). The declarations are read from the :attr:`PLUGIN_KEY` marker
+        files of the plugin packages (the taurus.core subpackages and the
+        packages in `EXTRA_SCHEME_MODULES`), which contain lines like::
+
+            schemes = eval, evaluation
+            factory = taurus.core.evaluation.evalfactory.EvaluationFactory
+
+        :return: (dict<str,str>) full name of the factory class for each
+                 declared scheme
+        """
+        if self._scheme_registry is None:
+            registry = {}
+            for plugin_dir in self._get_plugin_dirs():
+                self._readPluginDeclaration(plugin_dir, registry)
+            for module_name in getattr(tauruscustomsettings,
+                                       'EXTRA_SCHEME_MODULES', []):
+                try:
+                    loader = pkgutil.get_loader(module_name)
+                    plugin_dir = loader.filename
+                except Exception:
+                    continue
+                if os.path.isdir(plugin_dir):
+                    self._readPluginDeclaration(plugin_dir, registry)
+            self._scheme_registry = registry
+        return self._scheme_registry
+
+    def _readPluginDeclaration(self, plugin_dir, registry):
+        """adds the schemes declared in the marker file of the given plugin
+        package to the registry (plugins with empty marker files are not
+        declared: they are found by importing them)"""
+        decl = {}
+        try:
+            with open(os.path.join(plugin_dir, self.PLUGIN_KEY)) as f:
+                for line in f:
+                    line = line.split('#', 1)[0]
+                    if '=' in line:
+                        key, value = line.split('=', 1)
+                        decl[key.strip()] = value.strip()
+        except IOError:
+            return
+        factory_name = decl.get('factory')
+        if not factory_name:
+            return
+        for scheme in decl.get('schemes', '').split(','):
+            scheme = scheme.strip()
+            if not scheme:
+                continue
+            if scheme in registry:
+                self.warning("Conflicting plugins: %s and %s both implement "
+                             "scheme %s. Will keep using %s", registry[scheme],
+                             factory_name, scheme, registry[scheme])
+            else:
+                registry[scheme] = factory_name
+
+    def _importFactory(self, factory_name):
+        """imports the factory class with the given full name (and records
+        it in the import report). Returns None if it cannot be imported"""
+        module_name, class_name = factory_name.rsplit('.', 1)
+        t0 = time.time()
+        try:
+            m = __import__(module_name, fromlist=[class_name], level=0)
+            factory = getattr(m, class_name)
+        except Exception:
+            self.debug('Failed to import %s' % factory_name)
+            self.debug('Details:', exc_info=1)
+            factory = None
+        self._reportImport(module_name, factory and factory.schemes or (),
+                           time.time() - t0, factory is not None)
+        return factory
+
+    def _reportImport(self, module_name, schemes, duration, ok):
+        self._import_report.append((module_name, tuple(schemes), duration,
+                                    ok))
+        self.debug('Imported %s (schemes: %s) in %.3f s (%s)', module_name,
+                   ', '.join(schemes), duration, ok and 'OK' or 'FAILED')
+
+    def getImportReport(self):
+        """Returns the plugins imported so far, in order of import, and how
+        long it took to import each of them
+
+        :return: (list<tuple>) a list of (module_name, schemes, duration, ok)
+                 tuples, where `schemes` is a tuple of the scheme names,
+                 `duration` is the import time in seconds and `ok` is False
+                 if the import failed
+        """
+        return list(self._import_report)
 
     def getObject(self, cls, name):
         """Gives the object for the given class with the given name
@@ -269,7 +563,7 @@ class TaurusManager(Singleton, Logger):
         if scheme is None:
             return
         try:
-            return self.getPlugins()[scheme]()
+            return self.getFactory(scheme)()
         except:
             raise TaurusException('Invalid scheme "%s"' % scheme)
 
@@ -307,9 +601,7 @@ class TaurusManager(Singleton, Logger):
         '''
         return self._build_plugins()
 
-    def _get_plugin_classes(self):
-        upgrade_classes = []
-
+    def _get_plugin_dirs(self):
         elems = os.listdir(self._this_path)
         dirs = []
         for elem in elems:
@@ -324,7 +616,10 @@ class TaurusManager(Singleton, Logger):
             if not os.path.exists(os.path.join(elem, '__init__.py')):
                 continue
             dirs.append(elem)
+        return dirs
 
+    def _get_plugin_classes(self):
+        dirs = self._get_plugin_dirs()
         plugins = []
 
         full_module_names = ['taurus.core.%s' %
@@ -334,6 +629,7 @@ class TaurusManager(Singleton, Logger):
             getattr(tauruscustomsettings, 'EXTRA_SCHEME_MODULES', []))
 
         for full_module_name in full_module_names:
+            t0 = time.time()
             try:
                 m = __import__(full_module_name, fromlist=['*'], level=0)
             except Exception, imp1:
@@ -344,7 +640,11 @@ class TaurusManager(Singleton, Logger):
                 except:
                     self.debug('Failed to inspect %s' % (full_module_name))
                     self.debug('Details:', exc_info=1)
+                    self._reportImport(full_module_name, (),
+                                       time.time() - t0, False)
                     continue
+            duration = time.time() - t0
+            module_schemes = []
             for s in m.__dict__.values():
                 plugin = None
                 try:
@@ -364,6 +664,9 @@ class TaurusManager(Singleton, Logger):
                 if not plugin is None:
                     self.debug('Found plugin %s' % plugin.__name__)
                     plugins.append(plugin)
+                    module_schemes.extend(plugin.schemes)
+            self._reportImport(full_module_name, module_schemes, duration,
+                               True)
         return plugins
 
     def _find_scheme(self, factory_class):
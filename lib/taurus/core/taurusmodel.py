@@ -34,7 +34,7 @@ import operator
 import threading
 
 from .util.log import Logger
-from .util.event import CallableRef, BoundMethodWeakref
+from .util.event import BoundMethodWeakref, ListenerRef, WeakListenerRegistry
 from .taurusbasetypes import TaurusEventType, MatchLevel
 from .taurushelper import Factory
 
@@ -64,7 +64,9 @@ class TaurusModel(Logger):
         self._serialization_mode = serializationMode
 
         self._parentObj = parent
-        self._listeners = []
+        self._listeners = WeakListenerRegistry()
+        self._fired_events = 0
+        self._deliveries = 0
 
     def __str__name__(self, name):
         return '{0}({1})'.format(self.__class__.__name__, name)
@@ -205,41 +207,15 @@ class TaurusModel(Logger):
     # API for listeners
     #-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-~-
 
-    def _listenerDied(self, weak_listener):
-        if self._listeners is None:
-            return
-        try:
-            self._listeners.remove(weak_listener)
-        except Exception, e:
-            pass
-
-    def _getCallableRef(self, listener, cb=None):
-        # return weakref.ref(listener, self._listenerDied)
-        meth = getattr(listener, 'eventReceived', None)
-        if meth is not None and operator.isCallable(meth):
-            return weakref.ref(listener, cb)
-        else:
-            return CallableRef(listener, cb)
-
     def addListener(self, listener):
         if self._listeners is None or listener is None:
             return False
-
-        weak_listener = self._getCallableRef(listener, self._listenerDied)
-        if weak_listener in self._listeners:
-            return False
-        self._listeners.append(weak_listener)
-        return True
+        return self._listeners.add(listener)
 
     def removeListener(self, listener):
         if self._listeners is None:
             return
-        weak_listener = self._getCallableRef(listener)
-        try:
-            self._listeners.remove(weak_listener)
-        except Exception, e:
-            return False
-        return True
+        return self._listeners.remove(listener)
 
     def forceListening(self):
         class __DummyListener:
@@ -274,10 +250,25 @@ class TaurusModel(Logger):
         if listeners is None:
             return
 
-        if not operator.isSequenceType(listeners):
+        if isinstance(listeners, WeakListenerRegistry):
+            listeners = listeners.refs()
+        elif not operator.isSequenceType(listeners):
             listeners = listeners,
 
+        delivered = 0
         for listener in listeners:
+            if isinstance(listener, ListenerRef):
+                # dispatch already resolved at registration
+                l = listener()
+                if l is None:
+                    continue
+                func = listener.func
+                if func is None:
+                    l(self, event_type, event_value)
+                else:
+                    func(l, self, event_type, event_value)
+                delivered += 1
+                continue
             if isinstance(listener, weakref.ref) or isinstance(listener, BoundMethodWeakref):
                 l = listener()
             else:
@@ -289,6 +280,23 @@ class TaurusModel(Logger):
                 l.eventReceived(self, event_type, event_value)
             elif operator.isCallable(l):
                 l(self, event_type, event_value)
+            else:
+                continue
+            delivered += 1
+        self._fired_events += 1
+        self._deliveries += delivered
+
+    def getEventStats(self):
+        """Returns some counters of the events fired by this model
+
+        :return: (dict) with the following keys: "listeners" (number of
+                 registered listeners), "events" (number of calls to
+                 :meth:`fireEvent`) and "deliveries" (number of times that
+                 a listener was notified)
+        """
+        return dict(listeners=len(self._listeners or ()),
+                    events=self._fired_events,
+                    deliveries=self._deliveries)
 
     def isWritable(self):
         return False
@@ -23,44 +23,468 @@
 ##
 #############################################################################
 
-"""This module contains the polling class"""
+"""This module contains the polling classes"""
 
-__all__ = ["TaurusPollingTimer"]
+__all__ = ["TaurusPollingTimer", "TaurusPollingScheduler",
+           "AdaptivePollingPolicy"]
 
 __docformat__ = "restructuredtext"
 
 import time
+import heapq
+import atexit
+import weakref
 import threading
 
+import numpy
+
 from .util.log import Logger, DebugIt
 from .util.containers import CaselessDict
-from .util.timer import Timer
+from .util.event import BoundMethodWeakref
+from .util.singleton import Singleton
+
+
+class TaurusPollingScheduler(Singleton, Logger):
+    """A :class:`taurus.core.util.singleton.Singleton` which serves all the
+    :class:`TaurusPollingTimer` objects from a single thread.
+
+    Each (timer, device) pair is an entry in a heap ordered by its next
+    deadline. When an entry is due, the scheduler polls the attributes of
+    that device registered in the timer and pushes the entry back with its
+    next deadline. If polling took so long that one or more deadlines were
+    missed, the missed polls are skipped and counted as overruns of the
+    timer (see :meth:`TaurusPollingTimer.getOverrunCount`).
+    """
+
+    def __init__(self):
+        """ Initialization. Nothing to be done here for now."""
+        pass
+
+    def init(self, *args, **kwargs):
+        """Singleton instance initialization.
+           For internal usage only. Do **NOT** call this method directly"""
+        self.call__init__(Logger, self.__class__.__name__)
+        self._cond = threading.Condition(threading.Lock())
+        self._heap = []
+        self._entries = {}
+        self._seq = 0
+        self._thread = None
+        self._stopped = False
+        # stop the (daemon) thread before the interpreter tears down
+        atexit.register(self._stop)
+
+    def _stop(self):
+        """makes the scheduler thread finish (called at exit)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.currentThread():
+            thread.join(1)
+
+    def schedule(self, timer, dev, deadline):
+        """Schedules the polling of `dev` (by `timer`) at the given deadline.
+        If the pair is already scheduled, its deadline is updated
+
+        :param timer: (TaurusPollingTimer) the polling timer
+        :param dev: (taurus.core.taurusdevice.TaurusDevice) the device
+        :param deadline: (float) time (as returned by :meth:`time.time`) at
+                         which the device should be polled
+        """
+        with self._cond:
+            self._push(timer, dev, deadline)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name="TaurusPollingScheduler")
+                self._thread.setDaemon(True)
+                self._thread.start()
+            self._cond.notify()
+
+    def unschedule(self, timer, dev=None):
+        """Removes the pending polls of `timer`. If `dev` is given, only the
+        entry for that device is removed
+
+        :param timer: (TaurusPollingTimer) the polling timer
+        :param dev: (taurus.core.taurusdevice.TaurusDevice) the device
+                    (default is None, meaning all devices of the timer)
+        """
+        with self._cond:
+            if dev is None:
+                keys = [k for k in self._entries if k[0] is timer]
+            else:
+                keys = [(timer, dev)]
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    entry[-1] = False  # lazy removal from the heap
+
+    def isScheduled(self, timer, dev):
+        """Tells if the given pair has a pending poll
+
+        :return: (bool) True if `dev` is scheduled to be polled by `timer`
+        """
+        with self._cond:
+            return (timer, dev) in self._entries
+
+    def getOverrunCounts(self):
+        """Returns the number of missed polls of all the currently scheduled
+        timers, grouped by polling period
+
+        :return: (dict<int,int>) map of period (ms) to overrun count
+        """
+        with self._cond:
+            timers = set([k[0] for k in self._entries])
+        ret = {}
+        for timer in timers:
+            period = timer.getPeriod()
+            ret[period] = ret.get(period, 0) + timer.getOverrunCount()
+        return ret
+
+    def _push(self, timer, dev, deadline):
+        """pushes a new heap entry. Must be called with the lock acquired"""
+        old = self._entries.get((timer, dev))
+        if old is not None:
+            old[-1] = False
+        self._seq += 1
+        entry = [deadline, self._seq, timer, dev, True]
+        self._entries[(timer, dev)] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _popDue(self):
+        """blocks until at least one entry is due and returns all the due
+        entries (or None if the scheduler has been stopped). Must be called
+        with the lock acquired"""
+        heap = self._heap
+        while not self._stopped:
+            while heap and not heap[0][-1]:
+                heapq.heappop(heap)
+            if not heap:
+                self._cond.wait()
+                continue
+            nap = heap[0][0] - time.time()
+            if nap > 0:
+                self._cond.wait(nap)
+                continue
+            now = time.time()
+            due = []
+            while heap and heap[0][0] <= now:
+                entry = heapq.heappop(heap)
+                if entry[-1]:
+                    due.append(entry)
+            if due:
+                return due
+        return None
+
+    def _run(self):
+        """ Private Thread Function """
+        self.debug("Polling scheduler thread starting")
+        while True:
+            with self._cond:
+                due = self._popDue()
+            if due is None:
+                self.debug("Polling scheduler thread finished")
+                return
+            # group the due devices by timer so that each timer can do its
+            # asynchronous requests before waiting for the replies
+            polls = {}
+            for entry in due:
+                polls.setdefault(entry[2], []).append(entry[3])
+            for timer, devs in polls.iteritems():
+                try:
+                    timer._pollDevices(devs)
+                except Exception:
+                    self.error("Error polling with %s", timer.getLogName())
+                    self.debug("Details:", exc_info=1)
+            now = time.time()
+            with self._cond:
+                for entry in due:
+                    deadline, _, timer, dev, valid = entry
+                    # skip entries unscheduled or rescheduled while polling
+                    if not valid or self._entries.get((timer, dev)) is not entry:
+                        continue
+                    period = timer.getPeriod() / 1000.0
+                    deadline += period
+                    if deadline <= now:
+                        missed = int((now - deadline) // period) + 1
+                        deadline += missed * period
+                        timer._addOverruns(missed)
+                    self._push(timer, dev, deadline)
+
+
+class AdaptivePollingPolicy(object):
+    """Policy for adapting the polling period of each attribute registered in
+    a :class:`TaurusPollingTimer`.
+
+    The timer keeps ticking at its (base) period, but an attribute is only
+    polled once every `factor` ticks, where the factor is decided by this
+    policy:
+
+    - if all the listeners of the attribute are idle (paused or not shown,
+      see :meth:`isIdleListener`), the attribute is polled every
+      `idle_period`
+    - each time the last `identical_reads` reads of an attribute gave the
+      same value, its factor is multiplied by `step` (up to `max_period`)
+    - the factor goes back to 1 as soon as the value changes, a listener
+      stops being idle or fresh data is requested (see
+      :meth:`TaurusPollingTimer.refreshAttribute`)
+
+    :param idle_period: (int) polling period (ms) used for attributes whose
+                        listeners are all idle
+    :param max_period: (int) maximum polling period (ms) reached by slowing
+                       down attributes whose value does not change
+    :param identical_reads: (int) number of identical reads after which the
+                            polling of an attribute is slowed down
+    :param step: (int) factor by which the period is multiplied in each
+                 slow down
+    """
+
+    def __init__(self, idle_period=30000, max_period=30000,
+                 identical_reads=5, step=2):
+        self.idle_period = idle_period
+        self.max_period = max_period
+        self.identical_reads = identical_reads
+        self.step = step
+
+    def getIdleFactor(self, period):
+        """Returns the factor to apply to the given base period for idle
+        attributes
+
+        :param period: (int) base polling period (ms)
+        :return: (int) the factor
+        """
+        return max(1, int(self.idle_period // period))
+
+    def getMaxFactor(self, period):
+        """Returns the maximum factor to apply to the given base period for
+        attributes whose value does not change
+
+        :param period: (int) base polling period (ms)
+        :return: (int) the factor
+        """
+        return max(1, int(self.max_period // period))
+
+    def isIdleListener(self, listener):
+        """Tells if the given listener is currently not interested in new
+        values. Listeners implementing `isPaused` and returning True or
+        implementing `isShown` and returning False are considered idle.
+
+        Note that this is called from the polling thread, so these methods
+        must be thread-safe (e.g. Qt's `isVisible` cannot be used: the
+        Taurus widgets implement `isShown` with a flag updated in the GUI
+        thread, see :meth:`TaurusBaseWidget.isShown`)
+
+        :param listener: (object) the listener
+        :return: (bool) True if the listener is idle
+        """
+        listener = getattr(listener, 'im_self', listener)
+        try:
+            is_paused = getattr(listener, 'isPaused', None)
+            if is_paused is not None and is_paused():
+                return True
+            is_shown = getattr(listener, 'isShown', None)
+            if is_shown is not None and is_shown() is False:
+                return True
+        except Exception:
+            pass
+        return False
+
+    def isIdle(self, attribute):
+        """Tells if all the listeners of the given attribute are idle
+
+        :param attribute: (taurus.core.taurusattribute.TaurusAttribute) the
+                          attribute
+        :return: (bool) True if the attribute has listeners and all of them
+                 are idle
+        """
+        listeners = attribute._listeners
+        if not listeners:
+            return False
+        for ref in tuple(listeners):
+            if isinstance(ref, (weakref.ref, BoundMethodWeakref)):
+                listener = ref()
+            else:
+                listener = ref
+            if listener is not None and not self.isIdleListener(listener):
+                return False
+        return True
+
+    def isSameValue(self, v1, v2):
+        """Tells if the two given value objects can be considered the same
+        for the purpose of slowing down the polling
+
+        :param v1: (TaurusAttrValue) a value object (or None)
+        :param v2: (TaurusAttrValue) a value object (or None)
+        :return: (bool) True if both values have the same rvalue and quality
+        """
+        if v1 is None or v2 is None:
+            return v1 is v2
+        try:
+            if v1.quality != v2.quality:
+                return False
+            return bool(numpy.all(v1.rvalue == v2.rvalue))
+        except Exception:
+            return False
+
+
+class _AdaptiveState(object):
+    """polling state of an attribute handled by an AdaptivePollingPolicy"""
+
+    __slots__ = ('factor', 'countdown', 'same', 'value', 'idle')
+
+    def __init__(self):
+        self.factor = 1
+        self.countdown = 0
+        self.same = 0
+        self.value = None
+        self.idle = False
+
+    def reset(self):
+        self.factor = 1
+        self.countdown = 0
+        self.same = 0
 
 
 class TaurusPollingTimer(Logger):
     """ Polling timer manages a list of attributes that have to be polled in
-    the same period """
+    the same period.
+
+    The timer does not own a thread: the polls are done by the
+    :class:`TaurusPollingScheduler`. The devices of a timer are polled with
+    different phase offsets within the period, so that the polls of a given
+    period are spread in time instead of being all done at the same instant
+    """
+
+    # fractional part of the golden ratio. Multiples of it (modulo 1) give
+    # well spread phases no matter how many devices are registered
+    _PHASE_STEP = 0.6180339887498949
 
-    def __init__(self, period, parent=None):
+    def __init__(self, period, parent=None, policy=None):
         """Constructor
 
            :param period: (int) polling period (miliseconds)
            :param parent: (Logger) parent object (default is None)
+           :param policy: (AdaptivePollingPolicy) policy for adapting the
+                          polling period of each attribute (default is None,
+                          meaning that all attributes are polled every period)
         """
         name = "TaurusPollingTimer[%d]" % period
         self.call__init__(Logger, name, parent)
         self.dev_dict = {}
         self.attr_nb = 0
-        self.timer = Timer(period / 1000.0, self._pollAttributes, self)
+        self.period = period
+        self.scheduler = TaurusPollingScheduler()
         self.lock = threading.RLock()
+        self._active = False
+        self._phases = {}
+        self._phase_nb = 0
+        self._overruns = 0
+        self._policy = policy
+        self._adaptive = {}
 
     def start(self):
         """ Starts the polling timer """
-        self.timer.start()
+        self.lock.acquire()
+        try:
+            if self._active:
+                return
+            self._active = True
+            for dev in self.dev_dict:
+                self._scheduleDevice(dev)
+        finally:
+            self.lock.release()
 
     def stop(self):
         """ Stop the polling timer"""
-        self.timer.stop()
+        self.lock.acquire()
+        try:
+            self._active = False
+            self.scheduler.unschedule(self)
+        finally:
+            self.lock.release()
+
+    def isActive(self):
+        """Tells if the polling timer is started
+
+           :return: (bool) True if the timer is started or False otherwise
+        """
+        return self._active
+
+    def getPeriod(self):
+        """Returns the polling period
+
+           :return: (int) the polling period (miliseconds)
+        """
+        return self.period
+
+    def getOverrunCount(self):
+        """Returns the number of polls that have been skipped because the
+        previous poll took longer than the polling period
+
+           :return: (int) the number of missed polls
+        """
+        return self._overruns
+
+    def setPolicy(self, policy):
+        """Sets the policy for adapting the polling period of each attribute
+
+           :param policy: (AdaptivePollingPolicy) the policy or None for
+                          polling all attributes every period
+        """
+        self.lock.acquire()
+        try:
+            self._policy = policy
+            self._adaptive = {}
+        finally:
+            self.lock.release()
+
+    def getPolicy(self):
+        """Returns the policy for adapting the polling period of each attribute
+
+           :return: (AdaptivePollingPolicy) the policy or None
+        """
+        return self._policy
+
+    def getAttributePeriod(self, attribute):
+        """Returns the period with which the attribute is currently polled,
+           which may differ from the period of the timer if an adaptive
+           policy is set
+
+           :param attribute: (taurus.core.taurusattribute.TaurusAttribute) the attribute
+
+           :return: (int) the current polling period (miliseconds)
+        """
+        state = self._adaptive.get(attribute)
+        if state is None:
+            return self.period
+        return self.period * state.factor
+
+    def refreshAttribute(self, attribute):
+        """Restores the period of the timer for the given attribute (if it was
+           changed by the adaptive policy) and polls it in the next period
+
+           :param attribute: (taurus.core.taurusattribute.TaurusAttribute) the attribute
+        """
+        state = self._adaptive.get(attribute)
+        if state is not None:
+            state.reset()
+
+    def _addOverruns(self, n):
+        self._overruns += n
+        self.debug("polling took more than polling period (%dms). " +
+                   "%d polls skipped (%d in total)", self.period, n,
+                   self._overruns)
+
+    def _scheduleDevice(self, dev):
+        """schedules the first poll of the given device at its phase offset"""
+        period = self.period / 1000.0
+        phase = self._phases.get(dev)
+        if phase is None:
+            self._phase_nb += 1
+            phase = (self._phase_nb * self._PHASE_STEP) % 1.0
+            self._phases[dev] = phase
+        now = time.time()
+        offset = (phase * period - now) % period
+        self.scheduler.schedule(self, dev, now + (offset or period))
 
     def containsAttribute(self, attribute):
         """Determines if the polling timer already contains this attribute
@@ -94,15 +518,21 @@ class TaurusPollingTimer(Logger):
                               one attribute registered.
         """
         dev, attr_name = attribute.getParentObj(), attribute.getSimpleName()
-        attr_dict = self.dev_dict.get(dev)
-        if attr_dict is None:
-            if attribute.factory().caseSensitive:
-                self.dev_dict[dev] = attr_dict = {}
-            else:
-                self.dev_dict[dev] = attr_dict = CaselessDict()
-        if attr_name not in attr_dict:
-            attr_dict[attr_name] = attribute
-            self.attr_nb += 1
+        self.lock.acquire()
+        try:
+            attr_dict = self.dev_dict.get(dev)
+            if attr_dict is None:
+                if attribute.factory().caseSensitive:
+                    self.dev_dict[dev] = attr_dict = {}
+                else:
+                    self.dev_dict[dev] = attr_dict = CaselessDict()
+                if self._active:
+                    self._scheduleDevice(dev)
+            if attr_name not in attr_dict:
+                attr_dict[attr_name] = attribute
+                self.attr_nb += 1
+        finally:
+            self.lock.release()
         if self.attr_nb == 1 and auto_start:
             self.start()
         else:
@@ -117,23 +547,40 @@ class TaurusPollingTimer(Logger):
            :param attribute: (taurus.core.taurusattribute.TaurusAttribute) the attribute to be added
         """
         dev, attr_name = attribute.getParentObj(), attribute.getSimpleName()
-        attr_dict = self.dev_dict.get(dev)
-        if attr_dict is None:
-            return
-        if attr_name in attr_dict:
-            del attr_dict[attr_name]
-            if not attr_dict:
-                del self.dev_dict[dev]
-            self.attr_nb -= 1
+        self.lock.acquire()
+        try:
+            attr_dict = self.dev_dict.get(dev)
+            if attr_dict is None:
+                return
+            if attr_name in attr_dict:
+                del attr_dict[attr_name]
+                self._adaptive.pop(attribute, None)
+                if not attr_dict:
+                    del self.dev_dict[dev]
+                    self._phases.pop(dev, None)
+                    self.scheduler.unschedule(self, dev)
+                self.attr_nb -= 1
+        finally:
+            self.lock.release()
         if self.attr_nb < 1:
             self.stop()
 
-    def _pollAttributes(self):
-        """Polls the registered attributes. This method is called by the timer
-           when it is time to poll. Do not call this method directly
+    def _pollDevices(self, devs):
+        """Polls the registered attributes of the given devices. This method
+           is called by the :class:`TaurusPollingScheduler` when it is time
+           to poll. Do not call this method directly
         """
+        self.lock.acquire()
+        try:
+            polled = [(dev, self.dev_dict[dev])
+                      for dev in devs if dev in self.dev_dict]
+            policy = self._policy
+            if policy is not None:
+                polled = self._selectAttributes(policy, polled)
+        finally:
+            self.lock.release()
         req_ids = {}
-        for dev, attrs in self.dev_dict.items():
+        for dev, attrs in polled:
             try:
                 req_id = dev.poll(attrs, asynch=True)
                 req_ids[dev] = attrs, req_id
@@ -145,3 +592,55 @@ class TaurusPollingTimer(Logger):
                 dev.poll(attrs, req_id=req_id)
             except Exception as e:
                 self.error("poll_reply error")
+        if policy is not None:
+            self._updateFactors(policy, polled)
+
+    def _selectAttributes(self, policy, polled):
+        """returns the subset of the attributes that have to be polled in this
+        period according to the adaptive policy. Must be called with the lock
+        acquired"""
+        ret = []
+        idle_factor = policy.getIdleFactor(self.period)
+        for dev, attr_dict in polled:
+            selected = attr_dict.__class__()
+            for name, attr in attr_dict.iteritems():
+                state = self._adaptive.get(attr)
+                if state is None:
+                    self._adaptive[attr] = state = _AdaptiveState()
+                idle = policy.isIdle(attr)
+                if idle:
+                    state.factor = max(state.factor, idle_factor)
+                elif state.idle:
+                    state.reset()  # a listener is active again
+                state.idle = idle
+                if state.countdown > 0:
+                    state.countdown -= 1
+                    continue
+                state.countdown = state.factor - 1
+                selected[name] = attr
+            if selected:
+                ret.append((dev, selected))
+        return ret
+
+    def _updateFactors(self, policy, polled):
+        """updates the adaptive state of the polled attributes according to
+        their new values"""
+        max_factor = policy.getMaxFactor(self.period)
+        for dev, attr_dict in polled:
+            for attr in attr_dict.values():
+                state = self._adaptive.get(attr)
+                if state is None:
+                    continue
+                value = attr.getValueObj(cache=True)
+                if not policy.isSameValue(state.value, value):
+                    state.value = value
+                    if not state.idle:
+                        state.reset()
+                    continue
+                state.same += 1
+                if state.same >= policy.identical_reads:
+                    state.same = 0
+                    state.factor = max(state.factor,
+                                       min(state.factor * policy.step,
+                                           max_factor))
+                    state.countdown = state.factor - 1
@@ -463,5 +463,46 @@ class AttributeTestCase(unittest.TestCase):
                 self.assertTrue(chk, msg)
 
 
+class BulkHelpersTestCase(unittest.TestCase):
+    '''TestCase for the taurus.Attributes, taurus.Devices and the
+    addListeners/removeListeners helpers'''
+
+    def test_Attributes(self):
+        '''check that Attributes returns the same objects as Attribute'''
+        names = ['eval:1', 'eval:{eval:1}*2', 'eval:1', 'eval:@Foo/2']
+        attrs = taurus.Attributes(names)
+        self.assertEqual(len(attrs), len(names))
+        for name, a in zip(names, attrs):
+            self.assertTrue(a is taurus.Attribute(name))
+        self.assertTrue(attrs[0] is attrs[2])
+
+    def test_Devices(self):
+        '''check that Devices returns the same objects as Device'''
+        names = ['eval:@Foo', 'eval://localhost/@Foo', 'eval:@Bar']
+        devs = taurus.Devices(names)
+        self.assertEqual([taurus.Device(n) for n in names], devs)
+        self.assertTrue(devs[0] is devs[1])
+
+    def test_invalid(self):
+        '''check that an invalid name raises an exception'''
+        from taurus.core.taurusexception import TaurusException
+        self.assertRaises(TaurusException, taurus.Attributes,
+                          ['eval:1', 'eval:k-a;k=2;a=3'])
+
+    def test_addListeners(self):
+        '''check that addListeners and removeListeners add and remove the
+        listener to and from each model'''
+        from taurus.core.taurushelper import addListeners, removeListeners
+        attrs = taurus.Attributes(['eval:11', 'eval:rand(2)'])
+
+        def listener(src, evt_type, evt_value):
+            pass
+
+        addListeners(attrs, listener)
+        self.assertTrue(all(a.hasListeners() for a in attrs))
+        removeListeners(attrs, listener)
+        self.assertFalse(any(a.hasListeners() for a in attrs))
+
+
 if __name__ == '__main__':
     pass
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.taurusmanager"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+import time
+import threading
+import subprocess
+from taurus.external import unittest
+import taurus
+from taurus.core.taurusbasetypes import TaurusSerializationMode
+
+
+class CoalescedJobsTestCase(unittest.TestCase):
+    '''Test case for TaurusManager.addCoalescedJob and addSequencedJob'''
+
+    def setUp(self):
+        self.manager = taurus.Manager()
+        self.done = []
+
+    def _block(self, started, release):
+        started.set()
+        release.wait(5)
+
+    def _job(self, key, value):
+        self.done.append((key, value))
+
+    def _wait(self, n, timeout=5):
+        t0 = time.time()
+        while len(self.done) < n and time.time() - t0 < timeout:
+            time.sleep(.01)
+
+    def test_coalescing(self):
+        '''check that pending jobs are replaced by newer ones with the same
+        key and that the latest one is always processed'''
+        started, release = threading.Event(), threading.Event()
+        # keep the key 'a' busy, so that the following jobs are pending
+        self.manager.addCoalescedJob('a', self._block, started, release)
+        started.wait(5)
+        for i in range(10):
+            self.manager.addCoalescedJob('a', self._job, 'a', i)
+            self.manager.addCoalescedJob('b', self._job, 'b', i)
+        release.set()
+        self._wait(2)
+        time.sleep(.1)
+        a = [v for k, v in self.done if k == 'a']
+        b = [v for k, v in self.done if k == 'b']
+        self.assertEqual(a, [9])
+        self.assertEqual(b, sorted(b))
+        self.assertEqual(b[-1], 9)
+
+    def test_sequenced(self):
+        '''check that sequenced jobs keep their order with respect to the
+        coalesced ones with the same key and are not replaced'''
+        started, release = threading.Event(), threading.Event()
+        self.manager.addCoalescedJob('a', self._block, started, release)
+        started.wait(5)
+        self.manager.addCoalescedJob('a', self._job, 'a', 0)
+        self.manager.addCoalescedJob('a', self._job, 'a', 1)
+        self.manager.addSequencedJob('a', self._job, 'a', 'error')
+        self.manager.addCoalescedJob('a', self._job, 'a', 2)
+        self.manager.addCoalescedJob('a', self._job, 'a', 3)
+        self.manager.addSequencedJob('a', self._job, 'a', 'config')
+        release.set()
+        self._wait(4)
+        time.sleep(.1)
+        self.assertEqual([v for k, v in self.done],
+                         [1, 'error', 3, 'config'])
+
+    def test_coalescingKeys(self):
+        '''check that coalesced jobs only replace the pending ones with the
+        same key and keep their order in the sequence of the first item of
+        tuple keys'''
+        started, release = threading.Event(), threading.Event()
+        self.manager.addCoalescedJob('a', self._block, started, release)
+        started.wait(5)
+        self.manager.addCoalescedJob(('a', 'x'), self._job, 'x', 0)
+        self.manager.addCoalescedJob(('a', 'x'), self._job, 'x', 1)
+        self.manager.addCoalescedJob(('a', 'y'), self._job, 'y', 0)
+        self.manager.addCoalescedJob(('a', 'x'), self._job, 'x', 2)
+        self.manager.addSequencedJob('a', self._job, 'a', 'error')
+        release.set()
+        self._wait(4)
+        time.sleep(.1)
+        self.assertEqual(self.done, [('x', 1), ('y', 0), ('x', 2),
+                                     ('a', 'error')])
+
+    def test_long_sequence(self):
+        '''check that the order is kept when the pending jobs of a key are
+        more than those processed in one run'''
+        started, release = threading.Event(), threading.Event()
+        self.manager.addCoalescedJob('a', self._block, started, release)
+        started.wait(5)
+        n = 3 * self.manager.CoalescedJobsPerRun
+        for i in range(n):
+            self.manager.addSequencedJob('a', self._job, 'a', i)
+        release.set()
+        self._wait(n)
+        self.assertEqual([v for k, v in self.done], range(n))
+
+
+class OrderedJobsTestCase(unittest.TestCase):
+    '''Test case for the Ordered serialization mode'''
+
+    def setUp(self):
+        self.manager = taurus.Manager()
+        self._mode = self.manager.getSerializationMode()
+        self.manager.setSerializationMode(TaurusSerializationMode.Ordered)
+        self.done = []
+
+    def tearDown(self):
+        self.manager.setSerializationMode(self._mode)
+
+    def _job(self, key, value):
+        # give other lanes the chance to interleave
+        time.sleep(.001)
+        self.done.append((key, value))
+
+    def test_order(self):
+        '''check that jobs with the same key are processed in order'''
+        keys = ['attr%d' % i for i in range(5)]
+        n = 20
+        for i in range(n):
+            for key in keys:
+                self.manager.addOrderedJob(key, self._job, None, key, i)
+        t0 = time.time()
+        while len(self.done) < n * len(keys) and time.time() - t0 < 5:
+            time.sleep(.01)
+        self.assertEqual(len(self.done), n * len(keys))
+        for key in keys:
+            values = [v for k, v in self.done if k == key]
+            self.assertEqual(values, range(n))
+
+    def test_lanes(self):
+        '''check that jobs with the same key always run in the same thread
+        and that several lanes are used'''
+        names = {}
+
+        def job(key):
+            names.setdefault(key, set()).add(threading.currentThread().name)
+            self.done.append(key)
+        keys = range(32)
+        for i in range(3):
+            for key in keys:
+                self.manager.addOrderedJob(key, job, None, key)
+        t0 = time.time()
+        while len(self.done) < 3 * len(keys) and time.time() - t0 < 5:
+            time.sleep(.01)
+        for key in keys:
+            self.assertEqual(len(names[key]), 1)
+        self.assertGreater(len(set.union(*names.values())), 1)
+
+
+class SchemeRegistryTestCase(unittest.TestCase):
+    '''Test case for the lazy loading of the scheme plugins'''
+
+    def test_registry(self):
+        '''check that the taurus schemes are declared'''
+        registry = taurus.Manager().getSchemeRegistry()
+        for scheme in ('tango', 'eval', 'evaluation', 'res', 'ca', 'epics'):
+            self.assertIn(scheme, registry)
+        self.assertEqual(registry['eval'],
+                         'taurus.core.evaluation.evalfactory.EvaluationFactory')
+
+    def test_getFactory(self):
+        '''check that getFactory returns the same as getPlugins'''
+        manager = taurus.Manager()
+        factory = manager.getFactory('eval')
+        self.assertEqual(factory.__name__, 'EvaluationFactory')
+        self.assertTrue(manager.getPlugins()['eval'] is factory)
+        for module_name, schemes, duration, ok in manager.getImportReport():
+            self.assertTrue(duration >= 0)
+        self.assertIsNone(manager.getFactory('unknownscheme'))
+
+    def test_clearNameCaches(self):
+        '''check that clearNameCaches empties the name caches of the loaded
+        factories'''
+        taurus.Attribute('eval:1')
+        cache = taurus.Factory('eval').getNameCache()
+        self.assertGreater(len(cache), 0)
+        taurus.Manager().clearNameCaches()
+        self.assertEqual(len(cache), 0)
+
+    def test_lazyImport(self):
+        '''check that only the plugins of the used schemes are imported'''
+        code = ('import sys, taurus; taurus.Attribute("eval:1"); ' +
+                'print sorted(m for m in ("taurus.core.epics", ' +
+                '"taurus.core.tango", "taurus.core.evaluation") ' +
+                'if m in sys.modules)')
+        path = os.path.dirname(os.path.dirname(taurus.__file__))
+        env = dict(os.environ, PYTHONPATH=path)
+        out = subprocess.check_output([sys.executable, '-c', code], env=env)
+        self.assertEqual(out.strip().splitlines()[-1],
+                         "['taurus.core.evaluation']")
+
+
+if __name__ == '__main__':
+    pass
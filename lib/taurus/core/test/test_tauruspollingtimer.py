@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.tauruspollingtimer"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import time
+import threading
+from taurus.external import unittest
+from taurus.core.tauruspollingtimer import (TaurusPollingTimer,
+                                            TaurusPollingScheduler,
+                                            AdaptivePollingPolicy)
+
+
+class _FakeFactory(object):
+    caseSensitive = True
+
+
+class _FakeDevice(object):
+    '''minimal device that records the times at which it is polled'''
+
+    def __init__(self, sleep=0):
+        self.calltimes = []
+        self.sleep = sleep
+        self.polled = threading.Event()
+
+    def poll(self, attrs, asynch=False, req_id=None):
+        if asynch:
+            return 1
+        self.calltimes.append(time.time())
+        time.sleep(self.sleep)
+        self.polled.set()
+
+
+class _FakeAttrValue(object):
+
+    def __init__(self, rvalue):
+        self.rvalue = rvalue
+        self.quality = 0
+
+
+class _FakeListener(object):
+
+    def __init__(self, visible=True):
+        self.visible = visible
+
+    def isShown(self):
+        return self.visible
+
+
+class _FakeAttribute(object):
+
+    def __init__(self, dev, name):
+        self._dev = dev
+        self._name = name
+        self._listeners = []
+        self.values = None
+        self.polls = 0
+
+    def getParentObj(self):
+        return self._dev
+
+    def getSimpleName(self):
+        return self._name
+
+    def factory(self):
+        return _FakeFactory()
+
+    def poll(self):
+        pass
+
+    def getValueObj(self, cache=True):
+        self.polls += 1
+        if self.values is None:
+            return None
+        return _FakeAttrValue(self.values(self.polls))
+
+
+class TaurusPollingTimerTestCase(unittest.TestCase):
+    '''Test case for the TaurusPollingTimer and the TaurusPollingScheduler'''
+
+    def setUp(self):
+        self.timers = []
+
+    def tearDown(self):
+        for timer in self.timers:
+            timer.stop()
+
+    def _timer(self, period):
+        timer = TaurusPollingTimer(period)
+        self.timers.append(timer)
+        return timer
+
+    def test_sharedScheduler(self):
+        '''check that all timers are served by the same scheduler'''
+        t1, t2 = self._timer(100), self._timer(200)
+        self.assertIs(t1.scheduler, t2.scheduler)
+        self.assertIs(t1.scheduler, TaurusPollingScheduler())
+
+    def test_addRemove(self):
+        '''check addAttribute/removeAttribute bookkeeping and scheduling'''
+        timer = self._timer(100)
+        dev = _FakeDevice()
+        a, b = _FakeAttribute(dev, 'a'), _FakeAttribute(dev, 'b')
+        timer.addAttribute(a)
+        timer.addAttribute(b)
+        self.assertEqual(timer.getAttributeCount(), 2)
+        self.assertTrue(timer.containsAttribute(a))
+        self.assertTrue(timer.scheduler.isScheduled(timer, dev))
+        timer.removeAttribute(a)
+        self.assertFalse(timer.containsAttribute(a))
+        self.assertTrue(timer.isActive())
+        timer.removeAttribute(b)
+        self.assertEqual(timer.getAttributeCount(), 0)
+        self.assertFalse(timer.isActive())
+        self.assertFalse(timer.scheduler.isScheduled(timer, dev))
+
+    def test_period(self):
+        '''check that each device is polled once per period'''
+        period, n = 50, 5
+        timer = self._timer(period)
+        devs = [_FakeDevice() for _ in range(3)]
+        for i, dev in enumerate(devs):
+            timer.addAttribute(_FakeAttribute(dev, 'attr%d' % i))
+        time.sleep(period * (n + .5) / 1000.)
+        timer.stop()
+        for dev in devs:
+            self.assertIn(len(dev.calltimes), (n, n + 1))
+            ts = dev.calltimes
+            # the median is robust to a poll delayed by the system load
+            dts = sorted([t1 - t0 for t0, t1 in zip(ts, ts[1:])])
+            median = dts[len(dts) // 2]
+            self.assertAlmostEqual(median, period / 1000., delta=.005)
+
+    def test_staggering(self):
+        '''check that devices in the same period are polled at different
+        phases'''
+        timer = self._timer(100)
+        devs = [_FakeDevice() for _ in range(2)]
+        for i, dev in enumerate(devs):
+            timer.addAttribute(_FakeAttribute(dev, 'attr%d' % i))
+        for dev in devs:
+            dev.polled.wait(1)
+        timer.stop()
+        t0, t1 = devs[0].calltimes[0], devs[1].calltimes[0]
+        self.assertGreater(abs(t0 - t1), .01)
+
+    def test_overruns(self):
+        '''check that polls taking longer than the period are counted as
+        overruns'''
+        timer = self._timer(20)
+        dev = _FakeDevice(sleep=.05)
+        timer.addAttribute(_FakeAttribute(dev, 'attr'))
+        time.sleep(.3)
+        timer.stop()
+        self.assertGreater(timer.getOverrunCount(), 0)
+
+
+class AdaptivePollingTestCase(unittest.TestCase):
+    '''Test case for the AdaptivePollingPolicy'''
+
+    def setUp(self):
+        policy = AdaptivePollingPolicy(idle_period=1000, max_period=800,
+                                       identical_reads=2, step=2)
+        self.timer = TaurusPollingTimer(100, policy=policy)
+        self.dev = _FakeDevice()
+        self.attr = _FakeAttribute(self.dev, 'attr')
+        self.listener = _FakeListener()
+        self.attr._listeners.append(self.listener)
+        # register without starting: the ticks are simulated
+        self.timer.addAttribute(self.attr, auto_start=False)
+
+    def _tick(self, n=1):
+        for _ in range(n):
+            self.timer._pollDevices([self.dev])
+
+    def test_identicalValues(self):
+        '''check that the period increases step by step for constant values
+        and snaps back on change'''
+        self.attr.values = lambda n: 1
+        self._tick()
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 100)
+        self._tick(2)
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 200)
+        self._tick(4)
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 400)
+        self._tick(20)
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 800)
+        self.attr.values = lambda n: n
+        self._tick(8)
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 100)
+
+    def test_skipping(self):
+        '''check that slowed down attributes are not polled every tick'''
+        self.attr.values = lambda n: 1
+        self._tick(3)
+        polls = self.attr.polls
+        self._tick(8)
+        self.assertLess(self.attr.polls - polls, 8)
+
+    def test_idle(self):
+        '''check that attributes with hidden listeners use the idle period
+        and that they snap back when a listener is visible again'''
+        self.attr.values = lambda n: n
+        self.listener.visible = False
+        self._tick()
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 1000)
+        self.listener.visible = True
+        self._tick()
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 100)
+
+    def test_untracked(self):
+        '''check that the visibility is only read through isShown (not
+        through Qt's isVisible, which is not thread-safe) and that listeners
+        whose visibility is not tracked are not idle'''
+        class Listener(object):
+            def isVisible(self):
+                raise AssertionError('isVisible called')
+
+            def isShown(self):
+                return None
+        listener = Listener()
+        self.attr._listeners[:] = [listener]
+        self.assertFalse(self.timer.getPolicy().isIdleListener(listener))
+        self.attr.values = lambda n: n
+        self._tick()
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 100)
+
+    def test_refresh(self):
+        '''check that refreshAttribute restores the base period'''
+        self.attr.values = lambda n: 1
+        self._tick(5)
+        self.assertGreater(self.timer.getAttributePeriod(self.attr), 100)
+        self.timer.refreshAttribute(self.attr)
+        self.assertEqual(self.timer.getAttributePeriod(self.attr), 100)
+
+
+if __name__ == '__main__':
+    pass
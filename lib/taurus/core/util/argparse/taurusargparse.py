@@ -106,7 +106,7 @@ def get_taurus_parser(parser=None):
         help_tangohost = "Tango host name"
         help_tauruspolling = "taurus global polling period in milliseconds"
         help_taurusserial = "taurus serialization mode. Allowed values are (case insensitive): "\
-            "serial, concurrent (default)"
+            "serial, concurrent (default), ordered"
         help_rcport = "enables remote debugging using the given port"
         group.add_option("--taurus-log-level", dest="taurus_log_level", metavar="LEVEL",
                          help=help_tauruslog, type="str", default="info")
@@ -0,0 +1,515 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""
+This module provides :class:`BackfillService`, which fetches archived data in
+a background thread and caches it, and the :class:`ArchiveReader` interface
+for the sources of archived data, with the following implementations:
+
+    - :class:`PyTangoArchivingReader`: the Tango archiving (through
+      PyTangoArchiving)
+    - :class:`SQLiteArchiveReader`: a table of (model, time, value) rows in an
+      SQLite database
+    - :class:`NpzArchiveReader`: a directory of numpy .npz files (one per
+      model)
+"""
+
+__all__ = ["ArchiveReader", "PyTangoArchivingReader", "SQLiteArchiveReader",
+           "NpzArchiveReader", "BackfillService", "getDefaultBackfillService"]
+
+__docformat__ = "restructuredtext"
+
+import os
+import re
+import sqlite3
+import threading
+import numpy
+
+from .log import Logger
+from .event import CallableRef
+from .threadpool import ThreadPool
+
+
+def _mergeRanges(ranges):
+    '''returns the union of the given (start, end) ranges as a sorted list of
+    non-overlapping ranges'''
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtractRanges(start, end, ranges):
+    '''returns the parts of the (start, end) range which are not covered by
+    the given sorted and non-overlapping ranges'''
+    parts = []
+    for rstart, rend in ranges:
+        if rend <= start:
+            continue
+        if rstart >= end:
+            break
+        if rstart > start:
+            parts.append((start, rstart))
+        start = rend
+        if start >= end:
+            break
+    if start < end:
+        parts.append((start, end))
+    return parts
+
+
+def _intersectRanges(start, end, ranges):
+    '''returns the parts of the given sorted and non-overlapping ranges which
+    are within the (start, end) range'''
+    return [(max(rstart, start), min(rend, end)) for rstart, rend in ranges
+            if rend >= start and rstart <= end]
+
+
+def _emptyData():
+    return numpy.zeros(0), numpy.zeros(0)
+
+
+class ArchiveReader(object):
+    '''Interface of the archived data sources used by :class:`BackfillService`.
+    Note that :meth:`read` is called from a background thread.
+    '''
+
+    def read(self, model, tmin, tmax):
+        '''Returns the archived values of a model within a time range (both
+        limits included)
+
+        :param model: (str) the model name
+        :param tmin: (float) start of the range (timestamp)
+        :param tmax: (float) end of the range (timestamp)
+
+        :return: (tuple<numpy.ndarray,numpy.ndarray>) the timestamps (sorted
+                 in ascending order) and the values (of shape (n,), or (n,k)
+                 for spectra)
+        '''
+        raise NotImplementedError('read must be implemented in %s' %
+                                  self.__class__.__name__)
+
+
+class PyTangoArchivingReader(ArchiveReader):
+    '''Reads the Tango archiving system (using PyTangoArchiving)'''
+
+    def __init__(self, schema='*'):
+        '''
+        :param schema: (str) the archiving schema (default is '*', i.e. any)
+        '''
+        self._schema = schema
+        self._reader = None
+
+    def read(self, model, tmin, tmax):
+        '''see :meth:`ArchiveReader.read`'''
+        if self._reader is None:
+            import PyTangoArchiving
+            self._reader = PyTangoArchiving.Reader(self._schema)
+        # the archiving uses the attribute names without scheme nor host
+        name = re.sub(r'^\w+://([^/]+:\d+/)?', '', model)
+        values = self._reader.get_attribute_values(name, tmin, tmax)
+        values = [(t, v) for t, v in values if v is not None]
+        if not values:
+            return _emptyData()
+        t, v = zip(*values)
+        return numpy.array(t, dtype='d'), numpy.array(v, dtype='d')
+
+
+class SQLiteArchiveReader(ArchiveReader):
+    '''Reads an SQLite database with a table of (model TEXT, time REAL,
+    value REAL) rows. Only scalar values are supported.
+    '''
+
+    def __init__(self, path, table='archive'):
+        '''
+        :param path: (str) path of the database file
+        :param table: (str) name of the table
+        '''
+        self._path = path
+        self._table = table
+
+    def read(self, model, tmin, tmax):
+        '''see :meth:`ArchiveReader.read`'''
+        # the connections cannot be shared among threads
+        conn = sqlite3.connect(self._path)
+        try:
+            rows = conn.execute('SELECT time, value FROM %s WHERE model=? '
+                                'AND time>=? AND time<=? ORDER BY time' %
+                                self._table, (model, tmin, tmax)).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return _emptyData()
+        data = numpy.array(rows, dtype='d')
+        return data[:, 0], data[:, 1]
+
+
+class NpzArchiveReader(ArchiveReader):
+    '''Reads a directory of numpy .npz files (see :meth:`fileName`), each of
+    them containing a "t" array of (sorted) timestamps and a "v" array of
+    values
+    '''
+
+    def __init__(self, directory):
+        '''
+        :param directory: (str) the directory of the .npz files
+        '''
+        self._directory = directory
+
+    @staticmethod
+    def fileName(model):
+        '''returns the name of the file for the given model (the model name
+        with the characters other than alphanumeric, ".", "_" and "-"
+        replaced by "_", plus the ".npz" extension)
+
+        :param model: (str) the model name
+
+        :return: (str)
+        '''
+        return re.sub(r'[^\w.-]', '_', model) + '.npz'
+
+    def read(self, model, tmin, tmax):
+        '''see :meth:`ArchiveReader.read`'''
+        path = os.path.join(self._directory, self.fileName(model))
+        if not os.path.exists(path):
+            return _emptyData()
+        data = numpy.load(path)
+        try:
+            t, v = data['t'], data['v']
+        finally:
+            data.close()
+        i0 = numpy.searchsorted(t, tmin, 'left')
+        i1 = numpy.searchsorted(t, tmax, 'right')
+        return t[i0:i1], v[i0:i1]
+
+
+class BackfillService(Logger):
+    '''Fetches archived data from an :class:`ArchiveReader` in a background
+    thread and caches it.
+
+    :meth:`request` never blocks: it only queues the parts of the requested
+    range which have not been fetched yet and which are not already queued.
+    The queued ranges of each model are merged and fetched (most recent
+    first) by a single worker thread, and the listeners of the model are
+    called (from the worker thread) once the data of each range is in the
+    cache. The cached data is obtained with :meth:`getData`.
+
+    Ranges whose reading fails are also considered fetched (so that a
+    failing archive is not queried again and again). Use :meth:`clearCache`
+    for retrying them.
+
+    The cache can be limited to a number of points (see
+    :meth:`setMaxPoints`). When it is exceeded, the data of the least
+    recently used models is removed and, if the model whose data has just
+    been fetched exceeds it by itself, only the points closest to the
+    fetched range are kept. The removed ranges are fetched again if they
+    are requested.
+    '''
+
+    def __init__(self, reader, name=None, parent=None, maxPoints=None):
+        '''
+        :param reader: (ArchiveReader) the source of the archived data
+        :param name: (str) name for the logger
+        :param parent: (Logger) parent logger
+        :param maxPoints: (int or None) maximum number of points in the
+                          cache (None for no limit)
+        '''
+        Logger.__init__(self, name, parent)
+        self._reader = reader
+        self._lock = threading.Lock()
+        self._fetched = {}  # model -> fetched ranges
+        self._pending = {}  # model -> ranges to be fetched
+        self._inProgress = {}  # model -> ranges being fetched
+        self._data = {}  # model -> (t, v)
+        self._lastUse = {}  # model -> value of _uses when last used
+        self._uses = 0
+        self._listeners = {}  # model -> weak refs to callbacks
+        self._maxPoints = maxPoints
+        self._version = 0
+        self._pool = ThreadPool(name='%s.Pool' % self.log_name, parent=self,
+                                Psize=1, Qsize=0)
+
+    def getReader(self):
+        '''returns the reader of archived data
+
+        :return: (ArchiveReader)
+        '''
+        return self._reader
+
+    def setMaxPoints(self, maxPoints):
+        '''Limits the number of points in the cache (see the eviction policy
+        in the class documentation)
+
+        :param maxPoints: (int or None) maximum number of points (None for no
+                          limit)
+        '''
+        with self._lock:
+            self._maxPoints = maxPoints
+            self._evict(None)
+
+    def getMaxPoints(self):
+        '''returns the maximum number of points in the cache
+
+        :return: (int or None)
+        '''
+        return self._maxPoints
+
+    def cacheSize(self):
+        '''returns the number of points in the cache
+
+        :return: (int)
+        '''
+        with self._lock:
+            return sum([len(t) for t, v in self._data.itervalues()])
+
+    def getVersion(self):
+        '''returns a number which changes every time that data is added to or
+        removed from the cache
+
+        :return: (int)
+        '''
+        return self._version
+
+    def request(self, model, tmin, tmax, callback=None):
+        '''Requests (without blocking) the archived data of a model within a
+        time range.
+
+        :param model: (str) the model name
+        :param tmin: (float) start of the range (timestamp)
+        :param tmax: (float) end of the range (timestamp)
+        :param callback: (callable) if given, it is added to the listeners of
+                         the model, which are called as
+                         callback(model, tmin, tmax) when the data of a range
+                         has been added to the cache. Only a weak reference
+                         to it is kept
+
+        :return: (bool) True if some part of the range had to be queued
+        '''
+        with self._lock:
+            self._touch(model)
+            if callback is not None:
+                listeners = self._listeners.setdefault(model, [])
+                ref = CallableRef(callback)
+                if ref not in listeners:
+                    listeners.append(ref)
+            known = _mergeRanges(self._fetched.get(model, []) +
+                                 self._pending.get(model, []) +
+                                 self._inProgress.get(model, []))
+            missing = _subtractRanges(tmin, tmax, known)
+            if not missing:
+                return False
+            scheduled = model in self._pending or model in self._inProgress
+            self._pending[model] = _mergeRanges(self._pending.get(model, []) +
+                                                missing)
+        if not scheduled:
+            self._pool.add(self._fetch, None, model)
+        return True
+
+    def getData(self, model, tmin, tmax):
+        '''Returns the cached data of a model within a time range
+
+        :param model: (str) the model name
+        :param tmin: (float) start of the range (timestamp)
+        :param tmax: (float) end of the range (timestamp)
+
+        :return: (tuple<numpy.ndarray,numpy.ndarray>) timestamps and values
+                 (see :meth:`ArchiveReader.read`)
+        '''
+        with self._lock:
+            self._touch(model)
+            t, v = self._data.get(model, _emptyData())
+        i0 = numpy.searchsorted(t, tmin, 'left')
+        i1 = numpy.searchsorted(t, tmax, 'right')
+        return t[i0:i1], v[i0:i1]
+
+    def getFetchedRanges(self, model):
+        '''returns the ranges already fetched for a model
+
+        :param model: (str) the model name
+
+        :return: (list<tuple<float,float>>) sorted list of (start, end)
+        '''
+        with self._lock:
+            return list(self._fetched.get(model, []))
+
+    def getPendingRanges(self, model):
+        '''returns the ranges of a model which are queued or being fetched
+
+        :param model: (str) the model name
+
+        :return: (list<tuple<float,float>>) sorted list of (start, end)
+        '''
+        with self._lock:
+            return _mergeRanges(self._pending.get(model, []) +
+                                self._inProgress.get(model, []))
+
+    def clearCache(self, model=None):
+        '''Removes the cached data (and the record of fetched ranges)
+
+        :param model: (str or None) the model name. If None, the data of all
+                      models is removed
+        '''
+        with self._lock:
+            if model is None:
+                self._fetched.clear()
+                self._data.clear()
+                self._lastUse.clear()
+            else:
+                self._fetched.pop(model, None)
+                self._data.pop(model, None)
+                self._lastUse.pop(model, None)
+            self._version += 1
+
+    def _touch(self, model):
+        '''records the use of the data of a model (called with the lock)'''
+        self._uses += 1
+        self._lastUse[model] = self._uses
+
+    def _fetch(self, model):
+        '''fetches the pending ranges of a model (run in the worker thread)'''
+        while True:
+            with self._lock:
+                ranges = self._pending.pop(model, [])
+                if not ranges:
+                    self._inProgress.pop(model, None)
+                    return
+                self._inProgress[model] = ranges
+            # the most recent data is the closest to the one already shown
+            for tmin, tmax in reversed(ranges):
+                try:
+                    t, v = self._reader.read(model, tmin, tmax)
+                except Exception, e:
+                    self.warning('Cannot read the archived data of %s: %s',
+                                 model, e)
+                    t, v = _emptyData()
+                self._addData(model, tmin, tmax, numpy.asarray(t, dtype='d'),
+                              numpy.asarray(v))
+                self._notify(model, tmin, tmax)
+
+    def _addData(self, model, tmin, tmax, t, v):
+        '''adds the fetched data of a range to the cache'''
+        with self._lock:
+            self._fetched[model] = _mergeRanges(self._fetched.get(model, []) +
+                                                [(tmin, tmax)])
+            if len(t):
+                if model in self._data:
+                    ct, cv = self._data[model]
+                    try:
+                        t = numpy.concatenate((ct, t))
+                        v = numpy.concatenate((cv, v))
+                    except ValueError, e:
+                        self.warning('Inconsistent archived data of %s: %s',
+                                     model, e)
+                        return
+                    order = numpy.argsort(t, kind='mergesort')
+                    t, v = t[order], v[order]
+                    # the limits of contiguous ranges may be read twice
+                    unique = numpy.r_[True, t[1:] != t[:-1]]
+                    t, v = t[unique], v[unique]
+                self._data[model] = t, v
+                self._evict(model, tmin, tmax)
+            self._version += 1
+
+    def _evict(self, model, tmin=None, tmax=None):
+        '''removes data from the cache until it does not exceed the maximum
+        number of points: first the data of the least recently used models
+        other than the given one, and then the data of the given model
+        farthest from the (tmin, tmax) range (called with the lock)'''
+        maxPoints = self._maxPoints
+        if maxPoints is None:
+            return
+        total = sum([len(t) for t, v in self._data.itervalues()])
+        others = sorted([(self._lastUse.get(m, 0), m) for m in self._data
+                         if m != model])
+        for _, m in others:
+            if total <= maxPoints:
+                return
+            total -= len(self._data.pop(m)[0])
+            self._fetched.pop(m, None)
+            self._lastUse.pop(m, None)
+        if total <= maxPoints or model not in self._data:
+            return
+        t, v = self._data[model]
+        n = max(maxPoints, 1)
+        # keep a window of n points, centered on the fetched range (or on
+        # its most recent part, if it does not fit)
+        i0 = numpy.searchsorted(t, tmin, 'left')
+        i1 = numpy.searchsorted(t, tmax, 'right')
+        if i1 - i0 >= n:
+            start = i1 - n
+        else:
+            start = i0 - (n - (i1 - i0)) // 2
+        start = max(min(start, len(t) - n), 0)
+        end = start + n
+        # the ranges are kept up to the removed points (excluded)
+        rstart = t[start] if start > 0 else -numpy.inf
+        rend = t[end - 1] if end < len(t) else numpy.inf
+        self._data[model] = t[start:end], v[start:end]
+        self._fetched[model] = _intersectRanges(rstart, rend,
+                                                self._fetched.get(model, []))
+
+    def _notify(self, model, tmin, tmax):
+        '''calls the listeners of a model'''
+        with self._lock:
+            refs = list(self._listeners.get(model, []))
+        for ref in refs:
+            callback = ref()
+            if callback is None:
+                with self._lock:
+                    self._listeners[model].remove(ref)
+                continue
+            try:
+                callback(model, tmin, tmax)
+            except Exception:
+                self.warning('Error in the backfill listener %r', callback,
+                             exc_info=1)
+
+
+_defaultService = None
+_defaultServiceLock = threading.Lock()
+
+
+def getDefaultBackfillService():
+    '''Returns the :class:`BackfillService` shared by the widgets which do not
+    set their own one. It reads the Tango archiving (see
+    :class:`PyTangoArchivingReader`)
+
+    The size of its cache is given by `BACKFILL_CACHE_MAX_POINTS` in
+    tauruscustomsettings.
+
+    :return: (BackfillService)
+    '''
+    global _defaultService
+    with _defaultServiceLock:
+        if _defaultService is None:
+            from taurus import tauruscustomsettings
+            maxPoints = getattr(tauruscustomsettings,
+                                'BACKFILL_CACHE_MAX_POINTS', 2**22)
+            _defaultService = BackfillService(PyTangoArchivingReader(),
+                                              maxPoints=maxPoints)
+        return _defaultService
@@ -31,7 +31,7 @@ python distribution.
 __all__ = ["CaselessList", "CaselessDict", "CaselessWeakValueDict", "LoopList",
            "CircBuf", "LIFO", "TimedQueue", "self_locked", "ThreadDict",
            "defaultdict", "defaultdict_fromkey", "CaselessDefaultDict",
-           "DefaultThreadDict", "getDictAsTree", "ArrayBuffer", ]
+           "DefaultThreadDict", "getDictAsTree", "ArrayBuffer", "LRUCache", ]
 
 __docformat__ = "restructuredtext"
 
@@ -39,6 +39,8 @@ import copy
 import time
 import weakref
 import operator
+import threading
+from collections import OrderedDict
 
 
 class CaselessList(list):
@@ -1043,6 +1045,74 @@ class DefaultThreadDict(defaultdict_fromkey, ThreadDict):
     pass
 
 
+class LRUCache(object):
+    """A thread-safe mapping with a bounded size. When full, adding a new key
+    discards the least recently used one.
+
+    It also counts the number of successful (:attr:`hits`) and failed
+    (:attr:`misses`) lookups done with :meth:`get`.
+
+    Usage::
+
+        >>> cache = LRUCache(maxSize=2)
+        >>> cache['a'] = 1
+        >>> cache['b'] = 2
+        >>> cache.get('a')
+        1
+        >>> cache['c'] = 3  # discards 'b', the least recently used
+        >>> cache.get('b') is None
+        True
+    """
+
+    def __init__(self, maxSize=1024):
+        self._maxSize = maxSize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Returns the value for the given key (and marks it as the most
+        recently used) or default if the key is not in the cache"""
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            if len(self._data) > self._maxSize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def pop(self, key, default=None):
+        """Removes the given key and returns its value (or default if the key
+        is not in the cache)"""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """Removes all the items (the hit and miss counters are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def getMaxSize(self):
+        """Returns the maximum number of items in the cache"""
+        return self._maxSize
+
+
 def getDictAsTree(dct):
     """This method will print a recursive dict in a tree-like
        shape::
@@ -1090,7 +1160,21 @@ class ArrayBuffer(object):
 
     The :meth:`append` and meth:`extend` methods are designed to be cheap
     (especially if the internal buffer size is already at the maximum size), at
-    the expense of memory usage'''
+    the expense of memory usage: the internal buffer is allowed to grow up to
+    the maximum size plus a margin (see :attr:`Slack`). The contents are a
+    window of the internal buffer which slides towards its end when new
+    elements are added (the oldest ones being discarded by just moving the
+    start of the window). Only when the end of the internal buffer is
+    reached, the contents are copied to the beginning of a new internal
+    buffer. Therefore appending has a constant amortized cost and
+    :meth:`contents` always returns a view (not a copy) of the internal
+    buffer, which is not modified by adding or discarding elements (so it
+    can be kept instead of a copy of the contents).'''
+
+    #: margin of the internal buffer beyond the maximum size, as a fraction
+    #: of the maximum size. Once the contents fill the maximum size, they are
+    #: moved in the internal buffer once every Slack*maxSize new elements
+    Slack = 0.5
 
     def __init__(self, buffer, maxSize=0):
         '''Creator.
@@ -1105,38 +1189,70 @@ class ArrayBuffer(object):
         '''
 
         self.__buffer = buffer
+        self.__start = 0
         self.__end = 0
         self.__bsize = self.__buffer.shape[0]
-        self.__maxSize = max(maxSize, self.__bsize)
+        self.__setMaxSize(max(maxSize, self.__bsize))
 
     def __getitem__(self, i):
-        return self.__buffer[:self.__end].__getitem__(i)
+        return self.contents().__getitem__(i)
 
     def __getslice__(self, i, j):
-        return self.__buffer[:self.__end].__getslice__(i, j)
+        return self.contents().__getslice__(i, j)
 
     def __len__(self):
-        return self.__end
+        return self.__end - self.__start
 
     def __repr__(self):
-        return "ArrayBuffer with contents = %s" % self.__buffer[:self.__end].__repr__()
+        return "ArrayBuffer with contents = %s" % self.contents().__repr__()
 
     def __str__(self):
-        return self.__buffer[:self.__end].__str__()
+        return self.contents().__str__()
 
     def __nonzero__(self):
-        return self.__buffer[:self.__end].__nonzero__()
+        return self.contents().__nonzero__()
 
     def __setitem__(self, i, x):
-        self.__buffer[:self.__end].__setitem__(i, x)
+        self.contents().__setitem__(i, x)
 
     def __setslice__(self, i, j, a):
-        if i >= self.__end or j > self.__end:
+        if i >= len(self) or j > len(self):
             raise IndexError()
-        self.__buffer[:self.__end].__setslice__(i, j, a)
+        self.contents().__setslice__(i, j, a)
+
+    def __setMaxSize(self, maxSize):
+        self.__maxSize = maxSize
+        # the internal buffer may grow up to this size
+        self.__limit = maxSize + max(int(maxSize * self.Slack), 1)
+
+    def __compact(self):
+        '''moves the contents to the beginning of a new internal buffer (the
+        current one is not modified, since there may be views of it)'''
+        if self.__start == 0:
+            return
+        import numpy
+        size = self.__end - self.__start
+        buffer = numpy.empty_like(self.__buffer)
+        buffer[:size] = self.__buffer[self.__start:self.__end]
+        self.__buffer = buffer
+        self.__start, self.__end = 0, size
+
+    def __makeRoom(self, n):
+        '''discards the oldest elements that do not fit in the maximum size
+        once n new elements are added and makes room for them at the end of
+        the internal buffer (n must not exceed the maximum size)'''
+        self.__start = max(self.__start, self.__end + n - self.__maxSize)
+        while self.__end + n > self.__bsize:
+            if self.__bsize < self.__limit:
+                needed = self.__end - self.__start + n
+                self.resizeBuffer(min(max(2 * self.__bsize, needed),
+                                      self.__limit))
+            else:
+                self.__compact()
 
     def resizeBuffer(self, newlen):
         '''resizes the internal buffer'''
+        self.__compact()
         if newlen < self.__end:
             self.__end = newlen
         shape = list(self.__buffer.shape)
@@ -1158,15 +1274,11 @@ class ArrayBuffer(object):
 
         .. seealso:: :meth:`extend`
         '''
-        try:
-            self.__buffer[self.__end] = x
-        except IndexError:
-            if self.__bsize < self.__maxSize:
-                self.resizeBuffer(min(2 * self.__bsize, self.__maxSize))
-                # recursively call itself again after resizing
-                return self.append(x)
-            self.moveLeft(1)
-            self.__buffer[self.__end] = x
+        if self.__end - self.__start >= self.__maxSize:
+            self.__start += 1  # discard the oldest element
+        if self.__end >= self.__bsize:
+            self.__makeRoom(1)
+        self.__buffer[self.__end] = x
         self.__end += 1
 
     def extend(self, a):
@@ -1178,18 +1290,13 @@ class ArrayBuffer(object):
 
         .. seealso:: :meth:`append`, :meth:`extendLeft`
         '''
-        newend = self.__end + a.shape[0]
-        if newend < self.__bsize:
-            self.__buffer[self.__end:newend] = a
-            self.__end = newend
-        elif self.__bsize < self.__maxSize:
-            self.resizeBuffer(min(2 * self.__bsize, self.__maxSize))
-            # recursively call itself again after resizing
-            return self.extend(a)
-        else:
-            self.moveLeft(newend - self.__bsize)
-            self.__buffer[self.__end:] = a[-min(a.shape[0], self.__bsize):]
-            self.__end = self.__bsize
+        n = a.shape[0]
+        if n > self.__maxSize:
+            a = a[-self.__maxSize:]
+            n = self.__maxSize
+        self.__makeRoom(n)
+        self.__buffer[self.__end:self.__end + n] = a
+        self.__end += n
 
     def extendLeft(self, a):
         ''' Prepends data to the current contents. Note that, contrary to the
@@ -1200,32 +1307,37 @@ class ArrayBuffer(object):
 
         .. seealso:: :meth:`extend`'''
         len_a = a.shape[0]
-        newend = self.__end + len_a
-        if newend < self.__bsize:
-            self.__buffer[len_a:newend] = self.__buffer[
-                0:self.__end]  # move the contents to the right
-            self.__buffer[0:len_a] = a
-            self.__end = newend
-        elif newend < self.__maxSize:
-            self.resizeBuffer(min(2 * self.__bsize, self.__maxSize))
-            # recursively call itself again after resizing
-            return self.extendLeft(a)
-        else:
+        newsize = self.__end - self.__start + len_a
+        if newsize >= self.__maxSize:
             raise ValueError(
                 'Maximum buffer size cannot be exceeded when calling extendLeft ')
+        if len_a <= self.__start:
+            # there is room before the contents
+            self.__start -= len_a
+            self.__buffer[self.__start:self.__start + len_a] = a
+            return
+        import numpy
+        shape = list(self.__buffer.shape)
+        if newsize > self.__bsize:
+            shape[0] = min(max(2 * self.__bsize, newsize), self.__limit)
+        # move the contents to the right (in a new internal buffer)
+        buffer = numpy.empty(shape, dtype=self.__buffer.dtype)
+        buffer[len_a:newsize] = self.__buffer[self.__start:self.__end]
+        buffer[0:len_a] = a
+        self.__buffer = buffer
+        self.__bsize = shape[0]
+        self.__start, self.__end = 0, newsize
 
     def moveLeft(self, n):
-        '''discards n elements from the begginning to make space at the end of
-        the buffer. Moves all elements n positions to the left and the contents
-        size gets decreased by n
+        '''discards n elements from the begginning. The contents size gets
+        decreased by n (the elements are not actually moved in the internal
+        buffer)
 
-        **Note:** if n is larger or equal than the maximum buffer size, the
+        **Note:** if n is larger or equal than the contents size, the
         whole buffer is wiped
 
         :param n: (int)'''
-        newend = max(0, self.__end - n)
-        self.__buffer[0:newend] = self.__buffer[n:self.__end]
-        self.__end = newend
+        self.__start = min(self.__start + n, self.__end)
 
     def contents(self):
         '''returns the array of the contents that have already been filled. Note
@@ -1234,11 +1346,13 @@ class ArrayBuffer(object):
 
         It is equivalent to b[:]
 
-        :return: (numpy.array) array of contents
+        :return: (numpy.array) array of contents (a view of the internal
+                 buffer, which keeps these elements when others are added
+                 or discarded)
 
         .. seealso:: :meth:`toArray`
         '''
-        return self.__buffer[:self.__end]
+        return self.__buffer[self.__start:self.__end]
 
     def toArray(self):
         '''returns a copy of the array of the contents. It is equivalent to
@@ -1258,7 +1372,7 @@ class ArrayBuffer(object):
 
         .. seealso:: :meth:`maxSize`
         '''
-        return self.__end
+        return self.__end - self.__start
 
     def bufferSize(self):
         '''Returns the current size of the internal buffer
@@ -1287,10 +1401,11 @@ class ArrayBuffer(object):
 
         .. seealso:: :meth:`contentsSize`, :meth:`append`, :meth:`extend`, :meth:`isFull`
         '''
-        if maxSize < self.__bsize:
+        bsize = min(self.__bsize, self.__maxSize)  # excluding the slack
+        if maxSize < bsize:
             raise ValueError(
-                'Cannot set a maximum size below the current buffer size (%i)' % self.__bsize)
-        self.__maxSize = maxSize
+                'Cannot set a maximum size below the current buffer size (%i)' % bsize)
+        self.__setMaxSize(maxSize)
 
     def isFull(self):
         '''Whether the contents fill the whole of the internal buffer
@@ -1299,7 +1414,7 @@ class ArrayBuffer(object):
 
         .. seealso:: :meth:`maxSize`
         '''
-        return self.__end >= self.__maxSize
+        return self.__end - self.__start >= self.__maxSize
 
     def remainingSize(self):
         '''returns the remaining free space in the internal buffer (e.g., 0 if it is full)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""
+This module provides decimation algorithms for reducing the number of points
+of a curve to the ones that can actually be distinguished when it is drawn
+into a given number of pixel columns.
+
+Two algorithms are provided:
+
+    - :class:`MinMaxDecimator` keeps, for each pixel column, the points with
+      the minimum and maximum y values (i.e., the envelope of the curve). It
+      can update its result incrementally when the data only changes at its
+      ends (e.g. in trends)
+    - :func:`lttbDecimate` implements the Largest-Triangle-Three-Buckets
+      algorithm, which gives a smoother visual result at the cost of not
+      preserving all the extrema
+
+All functions work with 1D numpy arrays where x is sorted in ascending order.
+Unsorted data is returned unchanged.
+"""
+
+__all__ = ["minMaxDecimate", "minMaxIndices", "lttbDecimate",
+           "MinMaxDecimator"]
+
+__docformat__ = "restructuredtext"
+
+import numpy
+
+
+def _isSorted(x):
+    '''returns True if x is sorted in ascending order (NaNs make it False)'''
+    return len(x) < 2 or bool(numpy.all(x[1:] >= x[:-1]))
+
+
+def _binStart(x, w, k):
+    '''returns the index of the first element of the (sorted) x array whose
+    bin (floor(x/w)) is >= k'''
+    n = len(x)
+    j = int(numpy.searchsorted(x, k * w, 'left'))
+    # k*w and floor(x/w) may disagree by rounding at the bin boundary
+    while j > 0 and numpy.floor(x[j - 1] / w) >= k:
+        j -= 1
+    while j < n and numpy.floor(x[j] / w) < k:
+        j += 1
+    return j
+
+
+def _visibleSlice(x, xmin, xmax):
+    '''returns the (start, stop) indices of the part of the sorted x array
+    which lies in [xmin, xmax], extended with one point at each side (so that
+    the lines to the points out of the range can be drawn)'''
+    i0 = max(int(numpy.searchsorted(x, xmin, 'left')) - 1, 0)
+    i1 = min(int(numpy.searchsorted(x, xmax, 'right')) + 1, len(x))
+    return i0, i1
+
+
+def _minMaxIndices(x, y, w):
+    '''returns the indices of the points to keep and the bin of each of them
+    for a min/max decimation of a sorted x array into bins of width w.
+
+    For each bin, the points with the minimum and the maximum y values are
+    kept (in x order). NaNs are ignored unless all the values of a bin are
+    NaN, in which case the first point of the bin is kept.
+    '''
+    if len(x) == 0:
+        return numpy.zeros(0, dtype=int), numpy.zeros(0, dtype=int)
+    k = numpy.floor(x / w).astype(numpy.int64)
+    starts = numpy.flatnonzero(numpy.r_[True, k[1:] != k[:-1]])
+    counts = numpy.diff(numpy.r_[starts, len(x)])
+    binid = numpy.repeat(numpy.arange(len(starts)), counts)
+    nans = numpy.isnan(y)
+    indices = []
+    for fill, reduction in ((numpy.inf, numpy.minimum),
+                            (-numpy.inf, numpy.maximum)):
+        yy = numpy.where(nans, fill, y)
+        extrema = reduction.reduceat(yy, starts)
+        hits = numpy.flatnonzero(yy == numpy.repeat(extrema, counts))
+        hitbins = binid[hits]
+        # keep only the first hit in each bin
+        first = numpy.r_[True, hitbins[1:] != hitbins[:-1]]
+        indices.append(hits[first])
+    imin, imax = indices
+    sel = numpy.column_stack((numpy.minimum(imin, imax),
+                              numpy.maximum(imin, imax))).ravel()
+    sel = sel[numpy.r_[True, sel[1:] != sel[:-1]]]
+    return sel, k[sel]
+
+
+def minMaxDecimate(x, y, xmin, xmax, nbins):
+    '''Decimates a curve keeping, for each of the nbins equal-width bins in
+    which the [xmin, xmax] range is divided, only the points with the minimum
+    and the maximum y values. Points out of the range are dropped (except the
+    closest one at each side). The data is returned unchanged if x is not
+    sorted or if it already has less than 2*nbins points in the range.
+
+    :param x: (numpy.ndarray) abscissas (sorted in ascending order)
+    :param y: (numpy.ndarray) ordinates
+    :param xmin: (float) lower limit of the visible range
+    :param xmax: (float) upper limit of the visible range
+    :param nbins: (int) number of bins (typically the width in pixels)
+
+    :return: (tuple<numpy.ndarray,numpy.ndarray>) the decimated x and y arrays
+    '''
+    return MinMaxDecimator().decimate(x, y, xmin, xmax, nbins)
+
+
+def minMaxIndices(x, y, binWidth):
+    '''Returns the indices of the points kept by a min/max decimation of a
+    curve into bins of the given width (aligned to multiples of it). Unlike
+    :func:`minMaxDecimate`, all the points are considered (not only the ones
+    within a given range).
+
+    :param x: (numpy.ndarray) abscissas (sorted in ascending order)
+    :param y: (numpy.ndarray) ordinates. If it is 2D (one column per curve),
+              the indices kept for any of the columns are returned
+    :param binWidth: (float) width of the bins (in x units)
+
+    :return: (numpy.ndarray) sorted indices of the points to keep
+    '''
+    if numpy.ndim(y) == 1:
+        return _minMaxIndices(x, y, binWidth)[0]
+    sel = [_minMaxIndices(x, y[:, j], binWidth)[0]
+           for j in xrange(y.shape[1])]
+    return numpy.unique(numpy.concatenate(sel))
+
+
+def lttbDecimate(x, y, nout, xmin=None, xmax=None):
+    '''Decimates a curve to nout points using the Largest-Triangle-Three-Buckets
+    algorithm (S. Steinarsson, "Downsampling Time Series for Visual
+    Representation", 2013). The first and last points are always kept.
+    The data is returned unchanged if it already has nout points or less.
+
+    :param x: (numpy.ndarray) abscissas (sorted in ascending order)
+    :param y: (numpy.ndarray) ordinates
+    :param nout: (int) number of points of the result
+    :param xmin: (float or None) if given (together with xmax), the points out
+                 of the [xmin, xmax] range are dropped before decimating
+                 (except the closest one at each side)
+    :param xmax: (float or None) see xmin
+
+    :return: (tuple<numpy.ndarray,numpy.ndarray>) the decimated x and y arrays
+    '''
+    x = numpy.asarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    if xmin is not None and xmax is not None and _isSorted(x):
+        i0, i1 = _visibleSlice(x, xmin, xmax)
+        x, y = x[i0:i1], y[i0:i1]
+    n = len(x)
+    if nout >= n or nout < 3:
+        return x, y
+    # the points between the first and the last are split in nout-2 buckets
+    edges = numpy.linspace(1, n - 1, nout - 1).astype(int)
+    # bucket means (computed with cumulative sums to avoid a loop)
+    cx = numpy.r_[0., numpy.cumsum(x)]
+    cy = numpy.r_[0., numpy.cumsum(numpy.where(numpy.isnan(y), 0., y))]
+    cn = numpy.r_[0, numpy.cumsum(~numpy.isnan(y))]
+    lo, hi = edges[:-1], edges[1:]
+    meanx = (cx[hi] - cx[lo]) / (hi - lo)
+    meany = (cy[hi] - cy[lo]) / numpy.maximum(cn[hi] - cn[lo], 1)
+    # the "next bucket" of the last bucket is the last point
+    meanx = numpy.r_[meanx[1:], x[-1]]
+    meany = numpy.r_[meany[1:], y[-1]]
+    sel = numpy.empty(nout, dtype=int)
+    sel[0], sel[-1] = 0, n - 1
+    a = 0
+    for i in xrange(nout - 2):
+        bx, by = x[lo[i]:hi[i]], y[lo[i]:hi[i]]
+        area = numpy.abs((x[a] - meanx[i]) * (by - y[a]) -
+                         (x[a] - bx) * (meany[i] - y[a]))
+        area[numpy.isnan(area)] = -1
+        a = lo[i] + int(numpy.argmax(area))
+        sel[i + 1] = a
+    return x[sel], y[sel]
+
+
+class MinMaxDecimator(object):
+    '''Min/max (envelope) decimator which caches its last result so that it
+    can be updated incrementally.
+
+    When :meth:`decimate` is called with `appendOnly=True` and the same bin
+    width as in the previous call, the data is assumed to have changed only
+    by adding or removing points at its ends (as it happens in trends). In
+    that case only the bins at the ends of the previously decimated range are
+    recomputed, so that the cost of the update does not depend on the number
+    of points but on the number of bins and of new points. Note that the bins are aligned to multiples of the bin
+    width, so panning without zooming also reuses the cached bins.
+    '''
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        '''Discards the cached result'''
+        self._w = None
+        self._x = None
+        self._y = None
+        self._k = None
+
+    def decimate(self, x, y, xmin, xmax, nbins, appendOnly=False):
+        '''Decimates a curve keeping, for each of the nbins equal-width bins in
+        which the [xmin, xmax] range is divided, only the points with the
+        minimum and the maximum y values. See :func:`minMaxDecimate`
+
+        :param x: (numpy.ndarray) abscissas (sorted in ascending order)
+        :param y: (numpy.ndarray) ordinates
+        :param xmin: (float) lower limit of the visible range
+        :param xmax: (float) upper limit of the visible range
+        :param nbins: (int) number of bins (typically the width in pixels)
+        :param appendOnly: (bool) if True, the data is assumed to have changed
+                           only at its ends since the previous call, and the
+                           cached result is reused for the inner bins
+
+        :return: (tuple<numpy.ndarray,numpy.ndarray>) the decimated x and y
+                 arrays
+        '''
+        x = numpy.asarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        w = (float(xmax) - xmin) / nbins if nbins > 0 else 0.
+        if not (w > 0 and numpy.isfinite(w)):
+            self.reset()
+            return x, y
+        i0, i1 = _visibleSlice(x, xmin, xmax)
+        x, y = x[i0:i1], y[i0:i1]
+        if len(x) <= 2 * nbins:
+            self.reset()
+            return x, y
+        if (appendOnly and w == self._w and len(self._k) and
+                numpy.isfinite(x[0]) and numpy.isfinite(x[-1])):
+            # only the new points need to be checked for sortedness
+            ka = max(self._k[0], int(numpy.floor(x[0] / w))) + 1
+            kb = min(self._k[-1], int(numpy.floor(x[-1] / w))) - 1
+            if ka <= kb:
+                jl, jr = _binStart(x, w, ka), _binStart(x, w, kb + 1)
+                if _isSorted(x[:jl + 1]) and _isSorted(x[jr - 1:]):
+                    cl = numpy.searchsorted(self._k, ka, 'left')
+                    cr = numpy.searchsorted(self._k, kb, 'right')
+                    lsel, lk = _minMaxIndices(x[:jl], y[:jl], w)
+                    rsel, rk = _minMaxIndices(x[jr:], y[jr:], w)
+                    self._x = numpy.concatenate(
+                        (x[lsel], self._x[cl:cr], x[jr:][rsel]))
+                    self._y = numpy.concatenate(
+                        (y[lsel], self._y[cl:cr], y[jr:][rsel]))
+                    self._k = numpy.concatenate((lk, self._k[cl:cr], rk))
+                    return self._x, self._y
+        if not _isSorted(x):
+            self.reset()
+            return x, y
+        sel, self._k = _minMaxIndices(x, y, w)
+        self._w, self._x, self._y = w, x[sel], y[sel]
+        return self._x, self._y
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""
+This module provides :class:`DiskHistory`, an append-only history of
+(x, y0, y1, ...) rows stored on disk, in a directory of memory-mapped chunk
+files. It is meant for keeping long histories (e.g. of trends) out of memory:
+only the rows within a requested range of x are read back, optionally
+decimated.
+"""
+
+__all__ = ["DiskHistory"]
+
+__docformat__ = "restructuredtext"
+
+import os
+import atexit
+import bisect
+import weakref
+import numpy
+
+from .decimation import minMaxIndices
+
+# the histories whose files must be removed at exit
+_openHistories = weakref.WeakSet()
+
+
+@atexit.register
+def _closeAll():
+    for history in list(_openHistories):
+        history.close()
+
+
+class DiskHistory(object):
+    '''An append-only history of rows of float64 values, each row consisting
+    of an x value (e.g. a timestamp) and ncols y values. The rows are written
+    in chunk files of up to :attr:`ChunkRows` rows in the given directory, and
+    read back through memory maps only for the requested range of x (see
+    :meth:`getRange`), so that the memory used does not depend on the size of
+    the history.
+
+    The x values must be appended in ascending order.
+
+    The size of the history can be limited in bytes and/or in age (i.e. in x
+    units from the latest x value). Whole chunks are removed when the limits
+    are exceeded, except the last one.
+
+    The files (and the directory, if it ends up empty) are removed by
+    :meth:`close`, which is also called at exit.
+    '''
+
+    #: default number of rows of the chunk files
+    ChunkRows = 65536
+
+    def __init__(self, directory, ncols=1, chunkRows=None, maxSize=None,
+                 maxAge=None):
+        '''
+        :param directory: (str) directory for the chunk files (it is created
+                          if it does not exist). It should not be shared with
+                          other histories
+        :param ncols: (int) number of y values per row
+        :param chunkRows: (int or None) number of rows per chunk file. If None,
+                          :attr:`ChunkRows` is used
+        :param maxSize: (int or None) maximum size of the history (in bytes)
+        :param maxAge: (float or None) maximum age of the history (in x units)
+        '''
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._directory = directory
+        self._ncols = ncols
+        self._chunkRows = chunkRows or self.ChunkRows
+        self._chunks = []  # [path, nrows, xfirst, xlast] for each chunk
+        self._file = None  # the file of the last chunk (open for writing)
+        self._fileCount = 0
+        self._version = 0
+        self._maxSize = None
+        self._maxAge = None
+        _openHistories.add(self)
+        self.setRetention(maxSize=maxSize, maxAge=maxAge)
+
+    def __len__(self):
+        return sum([c[1] for c in self._chunks])
+
+    def getDirectory(self):
+        '''returns the directory of the chunk files
+
+        :return: (str)
+        '''
+        return self._directory
+
+    def getVersion(self):
+        '''returns a number which changes every time that rows are appended
+        or removed (e.g. for invalidating data read with :meth:`getRange`)
+
+        :return: (int)
+        '''
+        return self._version
+
+    def diskSize(self):
+        '''returns the size of the history files (in bytes)
+
+        :return: (int)
+        '''
+        return len(self) * 8 * (1 + self._ncols)
+
+    def xRange(self):
+        '''returns the first and last x values of the history
+
+        :return: (tuple<float,float> or None) None if the history is empty
+        '''
+        if not self._chunks:
+            return None
+        return self._chunks[0][2], self._chunks[-1][3]
+
+    def setRetention(self, maxSize=None, maxAge=None):
+        '''Limits the size of the history. The oldest chunks are removed when
+        any of the limits is exceeded.
+
+        :param maxSize: (int or None) maximum size (in bytes). None for no limit
+        :param maxAge: (float or None) maximum age (in x units, i.e. seconds
+                       for timestamps) relative to the latest x value. None
+                       for no limit
+        '''
+        self._maxSize = maxSize
+        self._maxAge = maxAge
+        self._applyRetention()
+
+    def getRetention(self):
+        '''returns the limits of the history (see :meth:`setRetention`)
+
+        :return: (tuple<int,float>) maximum size and maximum age
+        '''
+        return self._maxSize, self._maxAge
+
+    def append(self, x, y):
+        '''Appends rows to the history
+
+        :param x: (sequence<float>) x values (of length n)
+        :param y: (sequence) y values (of length n, or of shape (n, ncols))
+        '''
+        x = numpy.asarray(x, dtype='d').reshape(-1)
+        if len(x) == 0:
+            return
+        y = numpy.asarray(y, dtype='d').reshape(len(x), self._ncols)
+        rows = numpy.column_stack((x, y))
+        start = 0
+        while start < len(rows):
+            if self._file is None or self._chunks[-1][1] >= self._chunkRows:
+                self._newChunk()
+            chunk = self._chunks[-1]
+            part = rows[start:start + self._chunkRows - chunk[1]]
+            self._file.write(part.tostring())
+            if chunk[1] == 0:
+                chunk[2] = part[0, 0]
+            chunk[1] += len(part)
+            chunk[3] = part[-1, 0]
+            start += len(part)
+        self._file.flush()
+        self._version += 1
+        self._applyRetention()
+
+    def getRange(self, xmin, xmax, nbins=None, binWidth=None):
+        '''Returns the rows whose x value is within the given range (plus
+        the closest ones at each side). If nbins or binWidth is given, the
+        rows are decimated keeping, for each y column, the ones with the
+        minimum and the maximum values in each bin (see
+        :mod:`taurus.core.util.decimation`; the bins are aligned to multiples
+        of their width). Only one chunk is read into memory at a time.
+
+        :param xmin: (float) lower limit of the range
+        :param xmax: (float) upper limit of the range
+        :param nbins: (int or None) number of bins in which the range is
+                      divided for decimating the result. If None (and
+                      binWidth is None), the rows are not decimated
+        :param binWidth: (float or None) width of the bins (in x units) for
+                         decimating the result. It takes precedence over
+                         nbins (and, unlike it, it does not depend on the
+                         range, so the decimation of the rows shared by
+                         different ranges is the same)
+
+        :return: (tuple<numpy.ndarray,numpy.ndarray>) the x values (shape
+                 (n,)) and the y values (shape (n,ncols)) of the rows
+        '''
+        if self._maxAge is not None and self._chunks:
+            xmin = max(xmin, self._chunks[-1][3] - self._maxAge)
+        if binWidth is not None and binWidth <= 0:
+            binWidth = None
+        if binWidth is None and nbins and xmax > xmin:
+            binWidth = (float(xmax) - xmin) / nbins
+        # chunks overlapping the range, plus the previous and the next ones
+        # if the closest rows out of the range are in them
+        n = len(self._chunks)
+        first = bisect.bisect_left([c[3] for c in self._chunks], xmin)
+        if first > 0 and (first == n or self._chunks[first][2] >= xmin):
+            first -= 1
+        last = bisect.bisect_right([c[2] for c in self._chunks], xmax)
+        if last < n and (last == 0 or self._chunks[last - 1][3] <= xmax):
+            last += 1
+        parts = []
+        for path, nrows, xfirst, xlast in self._chunks[first:last]:
+            if nrows == 0:
+                continue
+            data = numpy.memmap(path, dtype='d', mode='r',
+                                shape=(nrows, 1 + self._ncols))
+            x = data[:, 0]
+            i0 = max(int(numpy.searchsorted(x, xmin, 'left')) - 1, 0)
+            i1 = min(int(numpy.searchsorted(x, xmax, 'right')) + 1, nrows)
+            rows = data[i0:i1]
+            if (binWidth is not None and
+                    len(rows) > 2 * (rows[-1, 0] - rows[0, 0]) / binWidth):
+                rows = rows[minMaxIndices(rows[:, 0], rows[:, 1:], binWidth)]
+            parts.append(numpy.array(rows))
+            del data
+        if not parts:
+            return numpy.zeros(0), numpy.zeros((0, self._ncols))
+        rows = numpy.concatenate(parts)
+        return rows[:, 0], rows[:, 1:]
+
+    def clear(self):
+        '''Removes all the rows (and their files)'''
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        for chunk in self._chunks:
+            self._removeFile(chunk[0])
+        self._chunks = []
+        self._version += 1
+
+    def close(self):
+        '''Removes all the rows and the directory (if empty). The history
+        should not be used after closing it'''
+        self.clear()
+        try:
+            os.rmdir(self._directory)
+        except OSError:
+            pass
+        _openHistories.discard(self)
+
+    def _newChunk(self):
+        '''starts a new chunk file'''
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self._directory, 'chunk%08d.dat' % self._fileCount)
+        self._fileCount += 1
+        self._file = open(path, 'wb')
+        self._chunks.append([path, 0, numpy.nan, numpy.nan])
+
+    def _applyRetention(self):
+        '''removes the oldest chunks (except the last one) while the
+        retention limits are exceeded'''
+        while len(self._chunks) > 1:
+            tooBig = self._maxSize is not None and \
+                self.diskSize() > self._maxSize
+            tooOld = self._maxAge is not None and \
+                self._chunks[0][3] < self._chunks[-1][3] - self._maxAge
+            if not (tooBig or tooOld):
+                break
+            self._removeFile(self._chunks.pop(0)[0])
+            self._version += 1
+
+    def _removeFile(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -27,7 +27,8 @@
 event.py:
 """
 
-__all__ = ["BoundMethodWeakref", "CallableRef", "EventGenerator",
+__all__ = ["BoundMethodWeakref", "CallableRef", "ListenerRef",
+           "WeakListenerRegistry", "EventGenerator",
            "ConfigEventGenerator", "ListEventGenerator", "EventListener",
            "AttributeEventWait", "AttributeEventIterator"]
 
@@ -38,6 +39,7 @@ import weakref
 import threading
 import time
 import operator
+import collections
 
 import taurus.core
 
@@ -100,6 +102,159 @@ def CallableRef(object, del_cb=None):
     return weakref.ref(object, del_cb)
 
 
+def _callEventReceived(obj, *args):
+    return obj.eventReceived(*args)
+
+
+class ListenerRef(weakref.ref):
+    """A weak reference to a listener registered in a
+    :class:`WeakListenerRegistry`. Calling it returns the referenced object
+    (or None if it has been deleted). It also stores how the listener has to
+    be notified: if `func` is None, the object itself is called. Otherwise
+    `func` is called with the object as first argument (the listener object
+    for listeners implementing `eventReceived`, or the instance for bound
+    methods)"""
+
+    __slots__ = ('key', 'func')
+
+    def __new__(cls, obj, func, key, callback=None):
+        return weakref.ref.__new__(cls, obj, callback)
+
+    def __init__(self, obj, func, key, callback=None):
+        weakref.ref.__init__(self, obj, callback)
+        self.func = func
+        self.key = key
+
+    def dispatch(self, *args):
+        """notifies the listener (if it still exists) with the given args
+
+        :return: (bool) True if the listener was notified
+        """
+        obj = self()
+        if obj is None:
+            return False
+        func = self.func
+        if func is None:
+            obj(*args)
+        else:
+            func(obj, *args)
+        return True
+
+
+class WeakListenerRegistry(object):
+    """A registry of weakly referenced listeners keyed by identity.
+
+    Listeners may be objects implementing `eventReceived` or any other
+    callable (e.g. a function or a bound method). Adding, removing and
+    checking the membership of a listener are O(1) operations and the way
+    of notifying each listener is resolved only once, when it is added (see
+    :class:`ListenerRef`). Listeners are automatically removed when they are
+    deleted. Iterating over the registry yields the :class:`ListenerRef`
+    objects (in order of registration) from a snapshot, so the registry can
+    be modified while iterating.
+    """
+
+    def __init__(self):
+        # (reentrant because the weakref callbacks may be triggered by
+        # garbage collection while the lock is held)
+        self._lock = threading.RLock()
+        self._refs = collections.OrderedDict()
+        self._snapshot = ()
+
+    @staticmethod
+    def _getKey(listener):
+        im_self = getattr(listener, 'im_self', None)
+        if im_self is not None:
+            return id(im_self), id(listener.im_func)
+        return id(listener)
+
+    def _refDied(self, ref):
+        with self._lock:
+            if self._refs.get(ref.key) is ref:
+                del self._refs[ref.key]
+                self._snapshot = None
+
+    def add(self, listener):
+        """Adds a listener
+
+        :param listener: (object) an object implementing `eventReceived` or a
+                         callable
+
+        :return: (bool) True if it was added or False if it was already
+                 registered (or if it is not a valid listener)
+        """
+        key = self._getKey(listener)
+        if key in self._refs:
+            return False
+        meth = getattr(listener, 'eventReceived', None)
+        if meth is not None and callable(meth):
+            obj = listener
+            if getattr(meth, 'im_self', None) is listener:
+                func = meth.im_func
+            else:
+                func = _callEventReceived
+        elif callable(listener):
+            im_self = getattr(listener, 'im_self', None)
+            if im_self is not None:
+                obj, func = im_self, listener.im_func
+            else:
+                obj, func = listener, None
+        else:
+            return False
+        ref = ListenerRef(obj, func, key, self._refDied)
+        with self._lock:
+            if key in self._refs:
+                return False
+            self._refs[key] = ref
+            self._snapshot = None
+        return True
+
+    def remove(self, listener):
+        """Removes a listener
+
+        :param listener: (object) a previously added listener
+
+        :return: (bool) True if it was removed or False if it was not
+                 registered
+        """
+        key = self._getKey(listener)
+        with self._lock:
+            if self._refs.pop(key, None) is None:
+                return False
+            self._snapshot = None
+        return True
+
+    def clear(self):
+        """Removes all the listeners"""
+        with self._lock:
+            self._refs.clear()
+            self._snapshot = None
+
+    def refs(self):
+        """Returns the references of the registered listeners
+
+        :return: (tuple<ListenerRef>) the references (in order of
+                 registration)
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot = tuple(self._refs.itervalues())
+        return snapshot
+
+    def __contains__(self, listener):
+        return self._getKey(listener) in self._refs
+
+    def __len__(self):
+        return len(self._refs)
+
+    def __nonzero__(self):
+        return len(self._refs) > 0
+
+    def __iter__(self):
+        return iter(self.refs())
+
+
 class EventStack(object):
     "internal usage event stack"
 
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module provides :class:`LazyModule`, which allows a package to export
+the names defined in its submodules without importing them until they are
+first accessed (see `LIGHTWEIGHT_IMPORTS` in tauruscustomsettings).
+
+Usage (in the `__init__.py` of a package)::
+
+    from taurus.core.util.lazymodule import makeLazy
+    makeLazy(__name__, ['submodule1', ('submodule2', ['Foo', 'Bar'])])
+
+which is equivalent to (but much faster than)::
+
+    from .submodule1 import *
+    from .submodule2 import Foo, Bar
+"""
+
+__all__ = ["LazyModule", "makeLazy"]
+
+__docformat__ = "restructuredtext"
+
+import os
+import re
+import sys
+import ast
+import types
+import threading
+import importlib
+
+# matches a literal __all__ definition in a python source file
+_ALL_RE = re.compile(r'^__all__\s*=\s*(\[[^\]]*\]|\([^\)]*\))', re.M)
+
+
+def _readAll(filename):
+    """returns the names in the (literal) `__all__` of a python source file,
+    or None if it cannot be determined without importing the module"""
+    try:
+        with open(filename) as f:
+            m = _ALL_RE.search(f.read())
+        return list(ast.literal_eval(m.group(1)))
+    except Exception:
+        return None
+
+
+def _exportedNames(module):
+    """returns the names that `from module import *` would import"""
+    names = getattr(module, '__all__', None)
+    if names is None:
+        names = [n for n in dir(module) if not n.startswith('_')]
+    return names
+
+
+class LazyModule(types.ModuleType):
+    """A module that replaces a package in :attr:`sys.modules` and imports its
+    submodules when the names they export (or the submodules themselves) are
+    first accessed.
+
+    .. note:: use :func:`makeLazy` instead of instantiating it directly
+    """
+
+    def __init__(self, module, submodules, names):
+        """
+        :param module: (module) the package module being replaced
+        :param submodules: (seq<str>) names of the submodules whose names are
+                           exported, in import order
+        :param names: (dict<str,str>) the submodule that defines each of the
+                      names known in advance
+        """
+        types.ModuleType.__init__(self, module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        # keep a reference to the original module (python 2 clears the
+        # globals of a module when it is garbage-collected)
+        self.__dict__['_LazyModule__module'] = module
+        self.__dict__['_LazyModule__submodules'] = list(submodules)
+        self.__dict__['_LazyModule__names'] = dict(names)
+        self.__dict__['_LazyModule__lock'] = threading.RLock()
+        if '__all__' not in self.__dict__:
+            self.__all__ = sorted(names)
+
+    def __getattr__(self, name):
+        # only called for names that are not (yet) in the module dict
+        if name.startswith('__'):
+            raise AttributeError(name)
+        with self.__lock:
+            if name in self.__dict__:
+                return self.__dict__[name]
+            submodule = self.__names.get(name)
+            if submodule is not None:
+                module = self.__importSubmodule(submodule)
+                return self.__export(name, getattr(module, name))
+            # a submodule (or subpackage) of the package?
+            if self.__isSubmodule(name):
+                return self.__importSubmodule(name)
+            # a name not known in advance: look for it in all the submodules
+            for submodule in self.__submodules:
+                try:
+                    module = self.__importSubmodule(submodule)
+                except Exception:
+                    continue  # (as optional submodules in try blocks)
+                if name in _exportedNames(module):
+                    return self.__export(name, getattr(module, name))
+        raise AttributeError("'module' object has no attribute '%s'" % name)
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self.__names))
+
+    def __export(self, name, value):
+        self.__dict__[name] = value
+        return value
+
+    def __importSubmodule(self, submodule):
+        return importlib.import_module('%s.%s' % (self.__name__, submodule))
+
+    def __isSubmodule(self, name):
+        for path in getattr(self, '__path__', ()):
+            base = os.path.join(path, name)
+            if (os.path.isfile(os.path.join(base, '__init__.py')) or
+                    os.path.isfile(base + '.py')):
+                return True
+        return False
+
+
+def makeLazy(name, submodules=(), optional=()):
+    """Replaces the given package (in :attr:`sys.modules`) by a
+    :class:`LazyModule` that exports the names of the given submodules, which
+    are imported only when one of those names is first accessed. It is meant
+    to be called from the `__init__.py` of the package.
+
+    The names exported by each submodule are read from the `__all__` defined
+    in its source file (without importing it). If they cannot be read, the
+    submodule is imported when a name that is not known is accessed.
+    The same applies to the optional submodules (those which may fail to
+    import, e.g. because of missing dependencies), whose names are never
+    included in the `__all__` of the package.
+
+    :param name: (str) full name of the package
+    :param submodules: (seq<str or tuple>) the submodules whose names are
+                       exported by the package, in import order. Each item is
+                       either a submodule name (to export all its names, as in
+                       `from .submodule import *`) or a tuple of submodule name
+                       and a list of the names to export
+    :param optional: (seq<str>) names of the optional submodules
+
+    :return: (LazyModule) the module that replaces the package
+    """
+    module = sys.modules[name]
+    pkg_dir = os.path.dirname(module.__file__)
+    names = {}
+    unknown = []
+    for submodule in submodules:
+        if isinstance(submodule, tuple):
+            submodule, exported = submodule
+        else:
+            filename = os.path.join(pkg_dir, submodule + '.py')
+            if not os.path.isfile(filename):
+                filename = os.path.join(pkg_dir, submodule, '__init__.py')
+            exported = _readAll(filename)
+            if exported is None:
+                unknown.append(submodule)
+                continue
+        for n in exported:
+            names[n] = submodule
+    lazy = LazyModule(module, unknown + list(optional), names)
+    sys.modules[name] = lazy
+    return lazy
@@ -31,6 +31,8 @@ __all__ = ["SafeEvaluator"]
 
 __docformat__ = "restructuredtext"
 
+from .containers import LRUCache
+
 
 class SafeEvaluator(object):
     """This class provides a safe eval replacement.
@@ -43,8 +45,13 @@ class SafeEvaluator(object):
     Functions can be removed by name using removeSafe()
 
     Note: In order to use variables defined outside, the user must explicitly declare them safe.
+
+    The expressions are compiled only the first time they are evaluated (the
+    code objects are kept in a cache of up to `CodeCacheSize` expressions)
     """
 
+    CodeCacheSize = 1024
+
     def __init__(self, safedict=None, defaultSafe=True):
         self._default_numpy = ('abs', 'array', 'arange', 'arccos', 'arcsin', 'arctan', 'arctan2', 'average',
                                'ceil', 'cos', 'cosh', 'degrees', 'dot', 'e', 'exp', 'fabs', 'floor', 'fmod',
@@ -79,10 +86,26 @@ class SafeEvaluator(object):
             self.safe_dict['Q'] = Quantity  # Q() is an alias for Quantity()
 
         self._originalSafeDict = self.safe_dict.copy()
+        self._globals = {"__builtins__": None}
+        self._code_cache = LRUCache(maxSize=self.CodeCacheSize)
+
+    def compile(self, expr):
+        """Returns the code object corresponding to the given expression,
+        compiling it only if it is not in the cache
+
+        :param expr: (str) expression
+
+        :return: (code) the compiled expression
+        """
+        code = self._code_cache.get(expr)
+        if code is None:
+            code = compile(expr, '<SafeEvaluator>', 'eval')
+            self._code_cache[expr] = code
+        return code
 
     def eval(self, expr):
         """safe eval"""
-        return eval(expr, {"__builtins__": None}, self.safe_dict)
+        return eval(self.compile(expr), self._globals, self.safe_dict)
 
     def addSafe(self, safedict, permanent=False):
         """The values in safedict will be evaluable (whitelisted)
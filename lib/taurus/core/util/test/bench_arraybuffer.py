@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of :class:`taurus.core.util.containers.ArrayBuffer`.
+
+It compares the cost of appending a point (and of getting the contents, as
+the trends do after each new point) to a full ArrayBuffer with that of the
+previous implementation, which shifted the whole buffer once it was full.
+
+Usage: python -m taurus.core.util.test.bench_arraybuffer
+"""
+
+__docformat__ = 'restructuredtext'
+
+import numpy
+from taurus.core.util.containers import ArrayBuffer
+from taurus.test import benchmark, printBenchmarks
+
+
+class _ShiftingArrayBuffer(object):
+    '''the relevant part of the previous ArrayBuffer implementation'''
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._end = 0
+        self._bsize = buffer.shape[0]
+
+    def append(self, x):
+        try:
+            self._buffer[self._end] = x
+        except IndexError:
+            self.moveLeft(1)
+            self._buffer[self._end] = x
+        self._end += 1
+
+    def extend(self, a):
+        newend = self._end + a.shape[0]
+        if newend < self._bsize:
+            self._buffer[self._end:newend] = a
+            self._end = newend
+        else:
+            self.moveLeft(newend - self._bsize)
+            self._buffer[self._end:] = a[-min(a.shape[0], self._bsize):]
+            self._end = self._bsize
+
+    def moveLeft(self, n):
+        newend = max(0, self._end - n)
+        self._buffer[0:newend] = self._buffer[n:self._end]
+        self._end = newend
+
+    def contents(self):
+        return self._buffer[:self._end]
+
+
+def _full(klass, size, shape=()):
+    b = klass(numpy.zeros((size,) + shape))
+    b.extend(numpy.ones((size,) + shape))
+    return b
+
+
+def main():
+    results = []
+    for size in (1000, 10000, 100000):
+        old, new = _full(_ShiftingArrayBuffer, size), _full(ArrayBuffer, size)
+
+        def appendOld():
+            old.append(1.)
+            old.contents()
+
+        def appendNew():
+            new.append(1.)
+            new.contents()
+
+        def extendOld():
+            old.extend(numpy.ones(10))
+
+        def extendNew():
+            new.extend(numpy.ones(10))
+
+        results.append(('append, %d points' % size,
+                        benchmark(appendOld), benchmark(appendNew)))
+        results.append(('extend(10), %d points' % size,
+                        benchmark(extendOld), benchmark(extendNew)))
+
+    # image trend buffers (one row per point)
+    old = _full(_ShiftingArrayBuffer, 1000, (1024,))
+    new = _full(ArrayBuffer, 1000, (1024,))
+    row = numpy.ones(1024)
+    results.append(('append row, 1000x1024',
+                    benchmark(lambda: old.append(row)),
+                    benchmark(lambda: new.append(row))))
+    printBenchmarks(results, title='ArrayBuffer (shifting vs sliding window)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of :mod:`taurus.core.util.decimation`.
+
+It measures the cost of decimating a curve to the width of a typical plot
+canvas (1500 pixels) after a new point is appended (as the trends do), both
+recomputing the whole min/max envelope and updating it incrementally. The
+cost of the LTTB decimation is also given.
+
+Usage: python -m taurus.core.util.test.bench_decimation
+"""
+
+__docformat__ = 'restructuredtext'
+
+import numpy
+from taurus.core.util.decimation import MinMaxDecimator, lttbDecimate
+from taurus.test import benchmark, printBenchmarks
+
+WIDTH = 1500
+
+
+def main():
+    results = []
+    for size in (10000, 100000, 1000000):
+        x = numpy.arange(2. * size)
+        y = numpy.random.randn(2 * size)
+        full, incremental = MinMaxDecimator(), MinMaxDecimator()
+        counter = {'full': 0, 'incremental': 0}
+
+        def decimate(decimator, key, appendOnly):
+            # append a point and scroll the range by one point
+            i = counter[key] = counter[key] + 1
+            decimator.decimate(x[i:size + i], y[i:size + i], x[i], x[size + i],
+                               WIDTH, appendOnly=appendOnly)
+
+        results.append(('minmax (full vs incremental), %d points' % size,
+                        benchmark(lambda: decimate(full, 'full', False),
+                                  number=100),
+                        benchmark(lambda: decimate(incremental, 'incremental',
+                                                   True), number=100)))
+        results.append(('lttb, %d points' % size,
+                        benchmark(lambda: lttbDecimate(x[:size], y[:size],
+                                                       2 * WIDTH), number=3)))
+    printBenchmarks(results, title='Decimation to %d pixels' % WIDTH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of :class:`taurus.core.util.diskhistory.DiskHistory`.
+
+It fills a history with a week of 10 Hz data (in blocks of 16K points, as a
+TaurusTrend with the default buffer size spills them) and measures the cost
+of reading back (decimated to 1500 pixels) the last hour, day and week, as
+well as the memory used by the process.
+
+Usage: python -m taurus.core.util.test.bench_diskhistory
+"""
+
+__docformat__ = 'restructuredtext'
+
+import os
+import shutil
+import resource
+import tempfile
+import numpy
+from taurus.core.util.diskhistory import DiskHistory
+from taurus.test import benchmark, printBenchmarks
+
+RATE = 10.  # points per second
+BLOCK = 16384
+WIDTH = 1500
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        history = DiskHistory(os.path.join(tmpdir, 'history'))
+        npoints = int(7 * 86400 * RATE)
+        t0 = 1.5e9
+        for i in xrange(0, npoints, BLOCK):
+            x = t0 + numpy.arange(i, min(i + BLOCK, npoints)) / RATE
+            history.append(x, numpy.random.randn(len(x)))
+        block = numpy.random.randn(BLOCK)
+        xblock = t0 + npoints / RATE + numpy.arange(BLOCK) / RATE
+        results = [('append %d points' % BLOCK,
+                    benchmark(lambda: history.append(xblock, block),
+                              number=1))]
+        tmax = history.xRange()[1]
+        for label, span in (('hour', 3600), ('day', 86400),
+                            ('week', 7 * 86400)):
+            results.append(('read last %s' % label,
+                            benchmark(lambda: history.getRange(
+                                tmax - span, tmax, nbins=WIDTH), number=1)))
+        printBenchmarks(results, title='DiskHistory (%d points, %.0f MB)' %
+                        (len(history), history.diskSize() / 2.**20))
+        print 'max rss: %.0f MB' % (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.)
+        history.close()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
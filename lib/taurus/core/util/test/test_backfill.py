@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.backfill"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+import threading
+import numpy
+from taurus.external import unittest
+from taurus.core.util.backfill import (ArchiveReader, SQLiteArchiveReader,
+                                       NpzArchiveReader, BackfillService)
+
+
+class _SlowReader(ArchiveReader):
+    '''reader of a linear ramp which blocks until it is released'''
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def read(self, model, tmin, tmax):
+        self.calls.append((model, tmin, tmax))
+        self.release.wait(5)
+        t = numpy.arange(numpy.ceil(tmin), numpy.floor(tmax) + 1)
+        return t, 2 * t
+
+
+class _Listener(object):
+
+    def __init__(self, count):
+        self.ranges = []
+        self.count = count
+        self.done = threading.Event()
+
+    def __call__(self, model, tmin, tmax):
+        self.ranges.append((tmin, tmax))
+        if len(self.ranges) == self.count:
+            self.done.set()
+
+
+class ArchiveReaderTestCase(unittest.TestCase):
+    '''Test case for the SQLite and npz readers of taurus.core.util.backfill'''
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.t = numpy.arange(100.)
+        self.v = numpy.sin(self.t)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _check(self, reader):
+        t, v = reader.read('eval:rand()', 10, 20.5)
+        self.assertEqual(t.tolist(), range(10, 21))
+        self.assertTrue(numpy.array_equal(v, self.v[10:21]))
+        t, v = reader.read('eval:other', 10, 20)
+        self.assertEqual(len(t), 0)
+
+    def test_sqlite(self):
+        '''check the SQLite reader'''
+        path = os.path.join(self.tmpdir, 'archive.db')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE archive (model TEXT, time REAL, '
+                     'value REAL)')
+        conn.executemany('INSERT INTO archive VALUES (?, ?, ?)',
+                         [('eval:rand()', t, v) for t, v in
+                          zip(self.t[::-1], self.v[::-1])])
+        conn.commit()
+        conn.close()
+        self._check(SQLiteArchiveReader(path))
+
+    def test_npz(self):
+        '''check the npz reader'''
+        fname = NpzArchiveReader.fileName('eval:rand()')
+        self.assertEqual(fname, 'eval_rand__.npz')
+        numpy.savez(os.path.join(self.tmpdir, fname), t=self.t, v=self.v)
+        self._check(NpzArchiveReader(self.tmpdir))
+
+
+class BackfillServiceTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.backfill.BackfillService class'''
+
+    def setUp(self):
+        self.reader = _SlowReader()
+        self.service = BackfillService(self.reader)
+
+    def tearDown(self):
+        self.reader.release.set()
+
+    def test_request(self):
+        '''check that requests do not block and that ranges are merged'''
+        listener = _Listener(2)
+        t0 = time.time()
+        self.assertTrue(self.service.request('a', 100, 200, listener))
+        # wait for the worker to start reading the first range
+        while not self.reader.calls:
+            time.sleep(0.01)
+        self.assertTrue(self.service.request('a', 50, 150, listener))
+        self.assertTrue(self.service.request('a', 0, 60, listener))
+        self.assertFalse(self.service.request('a', 10, 190, listener))
+        self.assertTrue(time.time() - t0 < 1)
+        self.assertEqual(self.service.getPendingRanges('a'), [(0, 200)])
+        self.assertEqual(len(self.service.getData('a', 0, 200)[0]), 0)
+        self.reader.release.set()
+        self.assertTrue(listener.done.wait(5))
+        # the two pending requests were merged into one read
+        self.assertEqual(self.reader.calls, [('a', 100, 200), ('a', 0, 100)])
+        self.assertEqual(listener.ranges, [(100, 200), (0, 100)])
+        self.assertEqual(self.service.getFetchedRanges('a'), [(0, 200)])
+        self.assertEqual(self.service.getPendingRanges('a'), [])
+        t, v = self.service.getData('a', 0, 200)
+        self.assertEqual(t.tolist(), range(0, 201))
+        self.assertTrue(numpy.array_equal(v, 2 * t))
+        # cached ranges are not read again
+        self.assertFalse(self.service.request('a', 20, 30))
+        self.service.clearCache('a')
+        self.assertEqual(len(self.service.getData('a', 0, 200)[0]), 0)
+        self.assertTrue(self.service.request('a', 20, 30))
+
+    def test_eviction(self):
+        '''check that the least recently used models and the points farthest
+        from the latest fetched range are removed from a full cache'''
+        self.reader.release.set()
+        self.service.setMaxPoints(150)
+        for model, tmin, tmax in (('a', 0, 100), ('b', 0, 100)):
+            listener = _Listener(1)
+            self.service.request(model, tmin, tmax, listener)
+            self.assertTrue(listener.done.wait(5))
+        self.assertEqual(self.service.getFetchedRanges('a'), [])
+        self.assertEqual(self.service.getFetchedRanges('b'), [(0, 100)])
+        self.assertEqual(self.service.cacheSize(), 101)
+        listener = _Listener(1)
+        self.service.request('b', 300, 360, listener)
+        self.assertTrue(listener.done.wait(5))
+        self.assertEqual(self.service.cacheSize(), 150)
+        t, v = self.service.getData('b', 0, 400)
+        self.assertEqual(t.tolist(), range(12, 101) + range(300, 361))
+        self.assertEqual(self.service.getFetchedRanges('b'),
+                         [(12, 100), (300, 360)])
+        # the removed ranges are fetched again
+        self.assertTrue(self.service.request('b', 0, 20))
+
+    def test_failure(self):
+        '''check that a failing reader does not stop the service'''
+        def fail(model, tmin, tmax):
+            raise RuntimeError('archive not available')
+        self.reader.read = fail
+        listener = _Listener(1)
+        self.service.request('b', 0, 10, listener)
+        self.assertTrue(listener.done.wait(5))
+        self.assertEqual(self.service.getFetchedRanges('b'), [(0, 10)])
+        self.assertEqual(len(self.service.getData('b', 0, 10)[0]), 0)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.containers"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import numpy
+from taurus.external import unittest
+from taurus.core.util.containers import LRUCache, ArrayBuffer
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.containers.LRUCache class'''
+
+    def test_eviction(self):
+        '''check that the least recently used key is discarded'''
+        cache = LRUCache(maxSize=3)
+        for k in 'abc':
+            cache[k] = k.upper()
+        self.assertEqual(cache.get('a'), 'A')  # 'b' is now the oldest
+        cache['d'] = 'D'
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn('b', cache)
+        for k in 'acd':
+            self.assertEqual(cache.get(k), k.upper())
+
+    def test_counters(self):
+        '''check the hit and miss counters'''
+        cache = LRUCache()
+        cache['a'] = 1
+        cache.get('a')
+        cache.get('b')
+        cache.get('b', 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_clear(self):
+        '''check pop and clear'''
+        cache = LRUCache()
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertIsNone(cache.pop('a'))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    pass
+
+
+class ArrayBufferTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.containers.ArrayBuffer class'''
+
+    def test_append(self):
+        '''check that the oldest elements are discarded when full'''
+        b = ArrayBuffer(numpy.zeros(2), maxSize=10)
+        for i in range(100):
+            b.append(i)
+            self.assertEqual(b.contents().tolist(),
+                             range(max(0, i - 9), i + 1))
+        self.assertTrue(b.isFull())
+        self.assertEqual(b[-1], 99)
+        self.assertEqual(b[:3].tolist(), [90, 91, 92])
+        self.assertTrue(b.bufferSize() <= 10 * (1 + ArrayBuffer.Slack) + 1)
+
+    def test_extend(self):
+        '''check extend, extendLeft and moveLeft'''
+        b = ArrayBuffer(numpy.zeros(4), maxSize=8)
+        b.extend(numpy.arange(6.))
+        b.extend(numpy.arange(6., 9.))
+        self.assertEqual(b.toArray().tolist(), range(1, 9))
+        b.moveLeft(3)
+        self.assertEqual(b.toArray().tolist(), range(4, 9))
+        b.extendLeft(numpy.arange(1., 3.))
+        self.assertEqual(b.toArray().tolist(), [1, 2, 4, 5, 6, 7, 8])
+        self.assertRaises(ValueError, b.extendLeft, numpy.arange(3.))
+        b.extend(numpy.arange(100.))
+        self.assertEqual(b.toArray().tolist(), range(92, 100))
+        b[0] = -1
+        self.assertEqual(b.contents()[0], -1)
+
+    def test_views(self):
+        '''check that the contents returned before adding elements are not
+        modified'''
+        b = ArrayBuffer(numpy.zeros(2), maxSize=10)
+        views = []
+        for i in range(100):
+            b.append(i)
+            views.append(b.contents())
+        for i, view in enumerate(views):
+            self.assertEqual(view.tolist(), range(max(0, i - 9), i + 1))
+        b = ArrayBuffer(numpy.zeros(4), maxSize=8)
+        b.extend(numpy.arange(4.))
+        view = b.contents()
+        b.extendLeft(numpy.arange(2.))
+        self.assertEqual(view.tolist(), range(4))
+        self.assertEqual(b.toArray().tolist(), [0, 1, 0, 1, 2, 3])
+
+    def test_2d(self):
+        '''check a buffer of rows (as used by the image trends)'''
+        b = ArrayBuffer(numpy.zeros((2, 3)), maxSize=5)
+        for i in range(12):
+            b.append(numpy.ones(3) * i)
+        self.assertEqual(b.contents().shape, (5, 3))
+        self.assertEqual(b[:, 0].tolist(), range(7, 12))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.decimation"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import numpy
+from taurus.external import unittest
+from taurus.core.util.decimation import (minMaxDecimate, lttbDecimate,
+                                         MinMaxDecimator)
+
+
+class MinMaxDecimateTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.decimation.minMaxDecimate function'''
+
+    def setUp(self):
+        r = numpy.random.RandomState(0)
+        self.x = numpy.cumsum(r.rand(20000))
+        self.y = r.randn(20000)
+        self.y[r.rand(20000) < 0.05] = numpy.nan
+
+    def test_envelope(self):
+        '''check that the min and max of each bin are kept'''
+        x, y = self.x, self.y
+        xd, yd = minMaxDecimate(x, y, x[0], x[-1], 100)
+        self.assertTrue(len(xd) <= 200 + 2)
+        self.assertTrue(numpy.all(numpy.diff(xd) > 0))
+        w = (x[-1] - x[0]) / 100
+        k, kd = numpy.floor(x / w), numpy.floor(xd / w)
+        for b in numpy.unique(k):
+            self.assertEqual(numpy.nanmin(y[k == b]), numpy.nanmin(yd[kd == b]))
+            self.assertEqual(numpy.nanmax(y[k == b]), numpy.nanmax(yd[kd == b]))
+
+    def test_range(self):
+        '''check that at most one point out of the range is kept at each side'''
+        x, y = self.x, self.y
+        xmin, xmax = x[5000], x[9000]
+        xd, yd = minMaxDecimate(x, y, xmin, xmax, 100)
+        self.assertTrue(len(xd) <= 200 + 2)
+        self.assertTrue(numpy.all((xd >= x[4999]) & (xd <= x[9001])))
+
+    def test_unchanged(self):
+        '''check that few points, unsorted x or a null range are not touched'''
+        x, y = self.x, self.y
+        xd, yd = minMaxDecimate(x[:150], y[:150], x[0], x[149], 100)
+        self.assertTrue(numpy.array_equal(xd, x[:150]))
+        xd, yd = minMaxDecimate(x[::-1], y, x[0], x[-1], 100)
+        self.assertTrue(numpy.array_equal(xd, x[::-1]))
+        xd, yd = minMaxDecimate(x, y, x[0], x[0], 100)
+        self.assertTrue(numpy.array_equal(xd, x))
+
+    def test_allnan(self):
+        '''check that bins with only NaNs keep a point'''
+        x = numpy.arange(1000.)
+        y = numpy.ones(1000)
+        y[100:200] = numpy.nan
+        xd, yd = minMaxDecimate(x, y, 0, 1000, 10)
+        self.assertEqual(xd.tolist(), [0, 100] + range(200, 1000, 100))
+        self.assertTrue(numpy.isnan(yd[1]))
+
+
+class MinMaxDecimatorTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.decimation.MinMaxDecimator class'''
+
+    def test_appendOnly(self):
+        '''check that incremental updates give the same result as full ones'''
+        r = numpy.random.RandomState(1)
+        x = numpy.cumsum(r.rand(30000))
+        y = r.randn(30000)
+        span = x[10000] - x[0]
+        decimator = MinMaxDecimator()
+        start, stop = 0, 10000
+        for i in range(50):
+            start += r.randint(0, 100)
+            stop += r.randint(0, 200)
+            if i == 25:  # zoom
+                span /= 2
+            xx, yy = x[start:stop], y[start:stop]
+            xmax = xx[-1] - r.rand() * span / 10
+            inc = decimator.decimate(xx, yy, xmax - span, xmax, 300,
+                                     appendOnly=True)
+            full = minMaxDecimate(xx, yy, xmax - span, xmax, 300)
+            self.assertTrue(numpy.array_equal(inc[0], full[0]))
+            self.assertTrue(numpy.array_equal(inc[1], full[1]))
+
+
+class LTTBDecimateTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.decimation.lttbDecimate function'''
+
+    def test_lttb(self):
+        '''check the size and the end points of the result'''
+        x = numpy.arange(10000.)
+        y = numpy.sin(x / 100)
+        y[500] = 10  # a spike must be kept
+        xd, yd = lttbDecimate(x, y, 100)
+        self.assertEqual(len(xd), 100)
+        self.assertEqual((xd[0], xd[-1]), (x[0], x[-1]))
+        self.assertTrue(numpy.all(numpy.diff(xd) > 0))
+        self.assertTrue(500 in xd)
+        xd, yd = lttbDecimate(x[:50], y[:50], 100)
+        self.assertEqual(len(xd), 50)
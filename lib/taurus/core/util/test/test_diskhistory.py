@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.diskhistory"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import os
+import shutil
+import tempfile
+import numpy
+from taurus.external import unittest
+from taurus.core.util.diskhistory import DiskHistory
+
+
+class DiskHistoryTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.diskhistory.DiskHistory class'''
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.history = DiskHistory(os.path.join(self.tmpdir, 'history'),
+                                   ncols=2, chunkRows=100)
+        self.x = numpy.arange(1000.)
+        self.y = numpy.column_stack((numpy.sin(self.x), numpy.cos(self.x)))
+        for i in xrange(0, 1000, 30):
+            self.history.append(self.x[i:i + 30], self.y[i:i + 30])
+
+    def tearDown(self):
+        self.history.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_append(self):
+        '''check that the rows are written in chunks'''
+        h = self.history
+        self.assertEqual(len(h), 1000)
+        self.assertEqual(h.xRange(), (0, 999))
+        self.assertEqual(len(os.listdir(h.getDirectory())), 10)
+        self.assertEqual(h.diskSize(), 1000 * 3 * 8)
+
+    def test_getRange(self):
+        '''check that the rows in the range (and their neighbours) are read'''
+        for xmin, xmax in ((250.5, 470.2), (299.5, 400.5), (300, 399),
+                           (-5, 3), (990, 2000), (2000, 3000), (10, 10)):
+            x, y = self.history.getRange(xmin, xmax)
+            i0 = max(numpy.searchsorted(self.x, xmin) - 1, 0)
+            i1 = numpy.searchsorted(self.x, xmax, 'right') + 1
+            self.assertEqual(x.tolist(), self.x[i0:i1].tolist())
+            self.assertTrue(numpy.array_equal(y, self.y[i0:i1]))
+
+    def test_getRangeDecimated(self):
+        '''check that the extrema of each column are kept when decimating'''
+        x, y = self.history.getRange(0, 1000, nbins=10)
+        self.assertTrue(len(x) <= 10 * 2 * 2 + 2 * 10)
+        self.assertEqual(y.shape, (len(x), 2))
+        self.assertEqual(y[:, 0].max(), self.y[:, 0].max())
+        self.assertEqual(y[:, 1].min(), self.y[:, 1].min())
+
+    def test_getRangeBinWidth(self):
+        '''check that, with a given bin width, the rows shared by different
+        ranges are decimated in the same way'''
+        x1, y1 = self.history.getRange(0, 800, binWidth=50)
+        x2, y2 = self.history.getRange(200, 1000, binWidth=50)
+        self.assertTrue(len(x1) <= 16 * 2 * 2 + 2)
+        self.assertEqual(y1.shape, (len(x1), 2))
+        shared1 = x1[(x1 >= 200) & (x1 < 800)]
+        shared2 = x2[(x2 >= 200) & (x2 < 800)]
+        self.assertEqual(shared1.tolist(), shared2.tolist())
+
+    def test_retention(self):
+        '''check that the oldest chunks are removed'''
+        h = self.history
+        h.setRetention(maxSize=500 * 3 * 8)
+        self.assertEqual(h.xRange(), (500, 999))
+        h.setRetention(maxAge=250)
+        self.assertEqual(h.xRange(), (700, 999))
+        self.assertEqual(h.getRange(0, 1000)[0][0], 748)
+        self.assertEqual(len(os.listdir(h.getDirectory())), 3)
+
+    def test_close(self):
+        '''check that close removes the files and the directory'''
+        directory = self.history.getDirectory()
+        self.history.close()
+        self.assertFalse(os.path.exists(directory))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.event"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import gc
+from taurus.external import unittest
+from taurus.core.util.event import WeakListenerRegistry
+
+
+class _Listener(object):
+
+    def __init__(self):
+        self.events = []
+
+    def eventReceived(self, *args):
+        self.events.append(args)
+
+    def method(self, *args):
+        self.events.append(args)
+
+
+class WeakListenerRegistryTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.event.WeakListenerRegistry class'''
+
+    def setUp(self):
+        self.registry = WeakListenerRegistry()
+
+    def test_add_remove(self):
+        '''check adding and removing listeners of different kinds'''
+        l = _Listener()
+        func = lambda *args: None
+        for listener in (l, l.method, func):
+            self.assertTrue(self.registry.add(listener))
+            self.assertFalse(self.registry.add(listener))
+            self.assertIn(listener, self.registry)
+        self.assertEqual(len(self.registry), 3)
+        for listener in (l, l.method, func):
+            self.assertTrue(self.registry.remove(listener))
+            self.assertFalse(self.registry.remove(listener))
+        self.assertFalse(self.registry)
+
+    def test_dispatch(self):
+        '''check that the listeners are notified in order of registration'''
+        calls = []
+        l = _Listener()
+        func = lambda *args: calls.append(args)
+        self.registry.add(l)
+        self.registry.add(func)
+        self.registry.add(l.method)
+        for ref in self.registry:
+            ref.dispatch('model', 1, 2)
+        self.assertEqual(l.events, [('model', 1, 2)] * 2)
+        self.assertEqual(calls, [('model', 1, 2)])
+
+    def test_weak(self):
+        '''check that deleted listeners are removed from the registry'''
+        l = _Listener()
+        self.registry.add(l)
+        self.registry.add(l.method)
+        self.assertEqual(len(self.registry.refs()), 2)
+        del l
+        gc.collect()
+        self.assertEqual(len(self.registry), 0)
+        self.assertEqual(self.registry.refs(), ())
+
+    def test_snapshot(self):
+        '''check that the registry can be modified while iterating'''
+        listeners = [_Listener() for _ in range(3)]
+        for l in listeners:
+            self.registry.add(l)
+        for ref in self.registry:
+            self.registry.remove(ref())
+        self.assertEqual(len(self.registry), 0)
+
+
+if __name__ == '__main__':
+    pass
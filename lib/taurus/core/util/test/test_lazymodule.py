@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.lazymodule"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import os
+import sys
+import shutil
+import tempfile
+from taurus.external import unittest
+from taurus.core.util.lazymodule import LazyModule
+
+_INIT = '''
+from taurus.core.util.lazymodule import makeLazy
+makeLazy(__name__, ['mod1', ('mod2', ['B'])], optional=['broken'])
+'''
+
+_MODULES = {
+    'mod1.py': "__all__ = ['A', 'C']\nA = 1\nC = 3\n",
+    'mod2.py': "B = 2\nD = 4\n",
+    'mod3.py': "E = 5\n",
+    'broken.py': "import _not_existing_module_\n",
+}
+
+
+class LazyModuleTestCase(unittest.TestCase):
+    '''Test case for the LazyModule class'''
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.name = '_taurus_lazy_test_pkg'
+        pkg_dir = os.path.join(self.path, self.name)
+        os.mkdir(pkg_dir)
+        with open(os.path.join(pkg_dir, '__init__.py'), 'w') as f:
+            f.write(_INIT)
+        for fname, code in _MODULES.items():
+            with open(os.path.join(pkg_dir, fname), 'w') as f:
+                f.write(code)
+        sys.path.insert(0, self.path)
+
+    def tearDown(self):
+        sys.path.remove(self.path)
+        for name in list(sys.modules):
+            if name.startswith(self.name):
+                del sys.modules[name]
+        shutil.rmtree(self.path)
+
+    def test_lazy(self):
+        '''check that the submodules are imported on first access'''
+        pkg = __import__(self.name)
+        self.assertIsInstance(pkg, LazyModule)
+        self.assertEqual(sorted(pkg.__all__), ['A', 'B', 'C'])
+        self.assertNotIn(self.name + '.mod1', sys.modules)
+        self.assertEqual(pkg.A, 1)
+        self.assertIn(self.name + '.mod1', sys.modules)
+        self.assertNotIn(self.name + '.mod2', sys.modules)
+        # from ... import syntax
+        ns = {}
+        exec 'from %s import B' % self.name in ns
+        self.assertEqual(ns['B'], 2)
+        # submodules can be accessed as attributes
+        self.assertEqual(pkg.mod3.E, 5)
+        # unknown names (and failing optional modules)
+        self.assertRaises(AttributeError, getattr, pkg, 'F')
+
+    def test_import_submodule(self):
+        '''check that the submodules can be imported with their full name'''
+        mod2 = __import__(self.name + '.mod2', fromlist=['D'])
+        self.assertEqual(mod2.D, 4)
+        self.assertTrue(sys.modules[self.name].mod2 is mod2)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.safeeval"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+from taurus.external import unittest
+from taurus.core.util.safeeval import SafeEvaluator
+
+
+class SafeEvaluatorTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.safeeval.SafeEvaluator class'''
+
+    def test_eval(self):
+        '''check evaluation with registered variables'''
+        sev = SafeEvaluator({'x': 3})
+        self.assertEqual(sev.eval('pow(x, 2) + 1'), 10)
+        sev.addSafe({'x': 4})
+        self.assertEqual(sev.eval('pow(x, 2) + 1'), 17)
+
+    def test_code_cache(self):
+        '''check that expressions are compiled only once'''
+        sev = SafeEvaluator({'x': 3})
+        code = sev.compile('x*2')
+        self.assertTrue(sev.compile('x*2') is code)
+        self.assertFalse(sev.compile('x*3') is code)
+
+    def test_unsafe(self):
+        '''check that non-whitelisted names cannot be evaluated'''
+        sev = SafeEvaluator()
+        self.assertRaises(Exception, sev.eval, 'open("/etc/passwd")')
+        self.assertRaises(NameError, sev.eval, 'y+1')
+        self.assertRaises(SyntaxError, sev.eval, '1+')
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.threadpool"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import time
+import functools
+import threading
+from taurus.external import unittest
+from taurus.core.util.threadpool import ThreadPool
+
+
+class ThreadPoolTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.threadpool.ThreadPool class'''
+
+    def setUp(self):
+        self.pool = ThreadPool(name='TestTP', Psize=1, Qsize=100)
+        self.done = []
+
+    def tearDown(self):
+        self.pool.join()
+
+    def _block(self, started, release):
+        started.set()
+        release.wait(5)
+
+    def _job(self, name):
+        self.done.append(name)
+
+    def _wait(self, n, timeout=5):
+        t0 = time.time()
+        while len(self.done) < n and time.time() - t0 < timeout:
+            time.sleep(.01)
+
+    def test_priority(self):
+        '''check that priority jobs are processed before pending jobs'''
+        started, release = threading.Event(), threading.Event()
+        self.pool.add(self._block, None, started, release)
+        started.wait(5)
+        for i in range(3):
+            self.pool.add(self._job, None, 'normal%d' % i)
+        self.pool.addPriority(self._job, None, 'high0')
+        self.pool.addPriority(self._job, None, 'high1')
+        release.set()
+        self._wait(5)
+        self.assertEqual(self.done, ['high0', 'high1',
+                                     'normal0', 'normal1', 'normal2'])
+
+    def test_callback(self):
+        '''check that the callback receives the result of the job'''
+        self.pool.add(lambda x: x * 2, self.done.append, 21)
+        self._wait(1)
+        self.assertEqual(self.done, [42])
+
+    def test_originSampling(self):
+        '''check that the origin is only recorded for the sampled jobs'''
+        stacks = []
+        put = self.pool.jobs.put
+        self.pool.jobs.put = lambda item: (stacks.append(item[2][5]),
+                                           put(item))
+        self.pool.setOriginSampling(0)
+        self.pool.add(self._job, None, 'a')
+        self.pool.setOriginSampling(1)
+        self.pool.add(self._job, None, 'b')
+        self._wait(2)
+        self.assertIsNone(stacks[0])
+        self.assertIsNotNone(stacks[1])
+        self.assertEqual(self.done, ['a', 'b'])
+
+    def test_metrics(self):
+        '''check the metrics reported by the pool'''
+        self.pool.RateWindow = .05
+        def slowJob():
+            time.sleep(.05)
+            self.done.append(None)
+        self.pool.add(slowJob)
+        for i in range(4):
+            self.pool.add(self._job, None, i)
+        self._wait(5)
+        time.sleep(.05)
+        metrics = self.pool.getMetrics()
+        self.assertEqual(metrics['jobs_done'], 5)
+        self.assertEqual(metrics['qsize'], 0)
+        self.assertGreaterEqual(metrics['busy_time'], .05)
+        self.assertGreater(metrics['jobs_per_second'], 0)
+        self.assertEqual(metrics['slowest_jobs'][0][0], 'slowJob')
+
+    def test_rate(self):
+        '''check that reading the metrics does not change the job rate'''
+        self.pool.RateWindow = .1
+        for i in range(4):
+            self.pool.add(self._job, None, i)
+        self._wait(4)
+        time.sleep(.15)
+        rate = self.pool.getMetrics()['jobs_per_second']
+        self.assertGreater(rate, 0)
+        self.assertLessEqual(self.pool.getMetrics()['jobs_per_second'], rate)
+        self.assertGreater(self.pool.getMetrics()['jobs_per_second'], 0)
+
+    def test_jobNames(self):
+        '''check that the jobs without __name__ get a stable name'''
+        done = self.done
+
+        class Job(object):
+            def __call__(self, arg):
+                done.append(arg)
+        for i in range(3):
+            self.pool.add(functools.partial(self._job, i))
+            self.pool.add(Job(), None, i)
+        self._wait(6)
+        time.sleep(.05)
+        names = [n for n, _ in self.pool.getMetrics()['slowest_jobs']]
+        self.assertEqual(sorted(names), ['Job', '_job'])
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Test for taurus.core.util.units"""
+
+#__all__ = []
+
+__docformat__ = 'restructuredtext'
+
+import warnings
+import threading
+import numpy
+from taurus.external import unittest
+import taurus.external.pint
+from taurus.external.pint import Quantity, DimensionalityError, UR
+from taurus.core.util.units import (getUnit, getConversion, convertMagnitude,
+                                    toUnits)
+
+
+class UnitsTestCase(unittest.TestCase):
+    '''Test case for the taurus.core.util.units module'''
+
+    def test_conversion(self):
+        '''check that the results are the same as with Quantity.to'''
+        a = numpy.linspace(-10, 10, 7)
+        for src, dst in (('mm', 'm'), ('degC', 'K'), ('degF', 'degC'),
+                         ('km/hour', 'm/s')):
+            expected = Quantity(a, src).to(dst)
+            got = toUnits(Quantity(a, src), dst)
+            self.assertEqual(got.units, expected.units)
+            self.assertTrue(numpy.allclose(got.magnitude, expected.magnitude))
+
+    def test_same_units(self):
+        '''check that no copy is done when the units are the same'''
+        q = Quantity(numpy.arange(5.), 'mm')
+        self.assertTrue(toUnits(q, 'mm') is q)
+        self.assertTrue(convertMagnitude(q.magnitude, 'mm', 'mm')
+                        is q.magnitude)
+
+    def test_cache(self):
+        '''check that the conversion is cached'''
+        self.assertTrue(getConversion('mm', 'um') is
+                        getConversion('mm', 'um'))
+
+    def test_getUnit(self):
+        '''check that the units strings are memoized'''
+        u = getUnit('mm/s')
+        self.assertEqual(u, UR.parse_units('mm/s'))
+        self.assertTrue(getUnit('mm/s') is u)
+        self.assertTrue(getUnit(u) is u)
+        self.assertEqual(getUnit(None), UR.parse_units(''))
+
+    def test_incompatible(self):
+        '''check that incompatible units raise DimensionalityError'''
+        self.assertRaises(DimensionalityError, toUnits,
+                          Quantity(1., 'mm'), 's')
+
+
+@unittest.skipIf(not hasattr(taurus.external.pint, '_LazyUnitRegistry'),
+                 'the unit registry is not lazy with this version of pint')
+class LazyUnitRegistryTestCase(unittest.TestCase):
+    '''Test case for the lazy unit registry of taurus.external.pint'''
+
+    def test_threaded_first_use(self):
+        '''check that concurrent first uses of the registry wait for the
+        definitions to be loaded'''
+        for _ in range(3):
+            ur = taurus.external.pint._LazyUnitRegistry()
+            start = threading.Event()
+            results, errors = [], []
+
+            def use(i):
+                start.wait()
+                try:
+                    if i % 2:
+                        results.append(ur.parse_units('mV'))
+                    else:
+                        q = ur.Quantity(1., 'mm').to('m')
+                        results.append(q.units)
+                except Exception, e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=use, args=(i,))
+                       for i in range(16)]
+            for t in threads:
+                t.start()
+            start.set()
+            for t in threads:
+                t.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(sorted(str(u) for u in results),
+                             ['meter'] * 8 + ['millivolt'] * 8)
+            self.assertFalse(ur.parse_units('mV').dimensionless)
+
+    def test_fallback(self):
+        '''check that a plain registry is created if pint does not call the
+        _after_init hook'''
+        lazy = taurus.external.pint._LazyUnitRegistry
+        after_init = lazy.__dict__['_after_init']
+        lazy._after_init = lambda self: None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                ur = taurus.external.pint._newUnitRegistry()
+        finally:
+            lazy._after_init = after_init
+        self.assertIs(type(ur), taurus.external.pint.UnitRegistry)
+        self.assertFalse(ur.parse_units('mV').dimensionless)
+
+
+if __name__ == '__main__':
+    pass
@@ -29,8 +29,10 @@ __all__ = ["ThreadPool", "Worker"]
 
 __docformat__ = "restructuredtext"
 
-from threading import Thread, currentThread
-from Queue import Queue
+import heapq
+import itertools
+from threading import Thread, Lock, currentThread
+from Queue import PriorityQueue
 from time import sleep, time
 from traceback import extract_stack, format_list
 
@@ -38,17 +40,49 @@ from prop import propertx
 from log import Logger, DebugIt, TraceIt
 
 
+def _jobName(cmd):
+    """Returns a name of the job that does not depend on the instance (it
+    is used as key of the job metrics, so it must not contain addresses)"""
+    func = getattr(cmd, 'func', cmd)  # functools.partial
+    return getattr(func, '__name__', None) or type(func).__name__
+
+
 class ThreadPool(Logger):
-    """"""
+    """A pool of worker threads processing jobs from a bounded queue.
+
+    Jobs added with :meth:`addPriority` are processed before any pending job
+    added with :meth:`add`. Jobs of the same priority are processed in the
+    order they were added.
+
+    Capturing the stack of the caller (used for reporting where a failed job
+    was submitted from) is expensive, so it is only done for one of every
+    `origin_sampling` jobs (1 means every job and 0 means never).
+    """
 
     NoJob = 6 * (None,)
 
-    def __init__(self, name=None, parent=None, Psize=20, Qsize=20, daemons=True):
+    HighPriority, NormalPriority, NoJobPriority = 0, 1, 2
+
+    SlowestJobsCount = 10
+
+    #: minimum duration (s) of the windows over which the job rate is measured
+    RateWindow = 5.
+
+    def __init__(self, name=None, parent=None, Psize=20, Qsize=20, daemons=True,
+                 origin_sampling=1):
         Logger.__init__(self, name, parent)
         self._daemons = daemons
+        self._seq = itertools.count()
+        self._origin_sampling = origin_sampling
         self.localThreadId = 0
         self.workers = []
-        self.jobs = Queue(Qsize)
+        self.jobs = PriorityQueue(Qsize)
+        self._stats_lock = Lock()
+        self._done_nb = 0
+        self._busy_time = 0.
+        self._max_times = {}
+        self._rate_window = time(), 0
+        self._rate = 0.
         self.size = Psize
         self.accept = True
 
@@ -71,7 +105,7 @@ class ThreadPool(Logger):
             # remove the old worker threads
             nb_workers = len(self.workers)
             for i in range(nb_workers - newSize):
-                self.jobs.put(self.NoJob)
+                self._put(self.NoJobPriority, self.NoJob)
 
         def get(self):
             """get method for the size property"""
@@ -79,19 +113,60 @@ class ThreadPool(Logger):
 
         return get, set, None, "number of threads"
 
-    def add(self, job, callback=None, *args, **kw):
+    def _put(self, priority, job):
+        self.jobs.put((priority, next(self._seq), job))
+
+    def _addJob(self, priority, job, callback, args, kw):
         if self.accept:
-            # first gather some information on the object which requested the
-            # job in case the job throws an exception
-            th_id, stack = currentThread().name, extract_stack()[:-1]
-            self.jobs.put((job, args, kw, callback, th_id, stack))
+            # gather some information on the object which requested the job
+            # in case the job throws an exception (expensive: only sampled)
+            seq = next(self._seq)
+            sampling = self._origin_sampling
+            if sampling and seq % sampling == 0:
+                stack = extract_stack()[:-2]
+            else:
+                stack = None
+            th_id = currentThread().name
+            self.jobs.put((priority, seq,
+                           (job, args, kw, callback, th_id, stack)))
+
+    def add(self, job, callback=None, *args, **kw):
+        """Adds a new job to the queue
+
+        :param job: (callable) a callable object
+        :param callback: (callable) called with the job result after the job
+                         has been processed
+        :param args: (list) list of arguments passed to the job
+        :param kw: (dict) keyword arguments passed to the job
+        """
+        self._addJob(self.NormalPriority, job, callback, args, kw)
+
+    def addPriority(self, job, callback=None, *args, **kw):
+        """Same as :meth:`add` but the job is processed before all the
+        pending jobs added with :meth:`add`"""
+        self._addJob(self.HighPriority, job, callback, args, kw)
+
+    def setOriginSampling(self, sampling):
+        """Sets how often the origin (stack) of the jobs is recorded
+
+        :param sampling: (int) record one of every `sampling` jobs. 1 records
+                         all jobs and 0 disables the recording
+        """
+        self._origin_sampling = sampling
+
+    def getOriginSampling(self):
+        """Returns how often the origin (stack) of the jobs is recorded
+
+        :return: (int) one of every how many jobs is recorded (0 for never)
+        """
+        return self._origin_sampling
 
     def join(self):
         self.accept = False
         while True:
             for w in self.workers:
                 if w.isAlive():
-                    self.jobs.put(self.NoJob)
+                    self._put(self.NoJobPriority, self.NoJob)
                     break
             else:
                 break
@@ -109,6 +184,53 @@ class ThreadPool(Logger):
                 n += 1
         return n
 
+    def _jobDone(self, name, duration):
+        """called by the workers after processing each job"""
+        now = time()
+        with self._stats_lock:
+            self._done_nb += 1
+            self._busy_time += duration
+            if duration > self._max_times.get(name, -1):
+                self._max_times[name] = duration
+            t0, done0 = self._rate_window
+            if now - t0 >= self.RateWindow:
+                self._rate = (self._done_nb - done0) / (now - t0)
+                self._rate_window = now, self._done_nb
+
+    def getMetrics(self):
+        """Returns a snapshot of the pool activity.
+
+        The returned dictionary contains:
+
+        - 'qsize': number of pending jobs
+        - 'busy_workers': number of workers currently processing a job
+        - 'jobs_done': total number of processed jobs
+        - 'busy_time': total time (s) spent by the workers processing jobs
+        - 'jobs_per_second': processing rate over the last complete window
+          of at least :attr:`RateWindow` seconds (or over the current window
+          if it is already longer)
+        - 'slowest_jobs': list of (job name, max duration) of the slowest
+          jobs, slowest first
+
+        :return: (dict) the pool metrics
+        """
+        now = time()
+        with self._stats_lock:
+            done, busy_time = self._done_nb, self._busy_time
+            slowest = heapq.nlargest(self.SlowestJobsCount,
+                                     self._max_times.iteritems(),
+                                     key=lambda item: item[1])
+            t0, done0 = self._rate_window
+            rate = self._rate
+        if now - t0 >= self.RateWindow:
+            rate = (done - done0) / (now - t0)
+        return dict(qsize=self.qsize,
+                    busy_workers=self.getNumOfBusyWorkers(),
+                    jobs_done=done,
+                    busy_time=busy_time,
+                    jobs_per_second=rate,
+                    slowest_jobs=slowest)
+
 
 class Worker(Thread, Logger):
 
@@ -120,25 +242,33 @@ class Worker(Thread, Logger):
         self.pool = pool
         self.cmd = ''
         self.busy = False
+        self.busy_time = 0.
 
     def run(self):
         get = self.pool.jobs.get
         while True:
-            cmd, args, kw, callback, th_id, stack = get()
+            _, _, (cmd, args, kw, callback, th_id, stack) = get()
             if cmd:
                 self.busy = True
-                self.cmd = cmd.__name__
+                self.cmd = _jobName(cmd)
+                t0 = time()
                 try:
                     if callback:
                         callback(cmd(*args, **kw))
                     else:
                         cmd(*args, **kw)
                 except:
-                    orig_stack = "".join(format_list(stack))
+                    if stack is None:
+                        orig_stack = "(origin not recorded)"
+                    else:
+                        orig_stack = "".join(format_list(stack))
                     self.error("Uncaught exception running job '%s' called "
                                "from thread %s:\n%s",
                                self.cmd, th_id, orig_stack, exc_info=1)
                 finally:
+                    duration = time() - t0
+                    self.busy_time += duration
+                    self.pool._jobDone(self.cmd, duration)
                     self.busy = False
                     self.cmd = ''
             else:
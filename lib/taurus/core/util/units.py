@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""This module provides helpers for converting the units of (possibly large)
+numerical values without the overhead of :meth:`pint.Quantity.to`.
+
+The factor and offset of a conversion between two units are obtained from
+the unit registry only once and cached, so converting an array is reduced to
+(at most) a multiplication and an addition. Converting to the same units
+returns the very same object (no copy).
+"""
+
+__all__ = ["getUnit", "getConversion", "convertMagnitude", "toUnits"]
+
+__docformat__ = "restructuredtext"
+
+from taurus.external.pint import UR, Quantity
+
+# cache of the (factor, offset) of each (source, target) pair of units
+_conversions = {}
+
+# memo of the Unit corresponding to each units string (shared by all schemes)
+_units = {}
+
+
+def getUnit(units):
+    """Returns the :class:`pint.Unit` corresponding to the given units. The
+    units strings are parsed only once (the results are memoized).
+
+    :param units: (str or pint.Unit or None) units (None means dimensionless)
+
+    :return: (pint.Unit)
+    :raise: (pint.UndefinedUnitError) if the units are not defined
+    """
+    if units is None or isinstance(units, basestring):
+        try:
+            return _units[units]
+        except KeyError:
+            unit = _units[units] = UR.parse_units(units)
+            return unit
+    return units
+
+
+def getConversion(src_units, dst_units):
+    """Returns the factor and offset that convert a magnitude expressed in
+    `src_units` into `dst_units` (i.e. dst = src * factor + offset).
+    The values are cached.
+
+    :param src_units: (str or pint.Unit) source units
+    :param dst_units: (str or pint.Unit) target units
+
+    :return: (tuple<float,float>) factor and offset
+    :raise: (pint.DimensionalityError) if the units are not compatible
+    """
+    key = str(src_units), str(dst_units)
+    try:
+        return _conversions[key]
+    except KeyError:
+        src_units, dst_units = getUnit(src_units), getUnit(dst_units)
+        zero = Quantity(0., src_units).to(dst_units).magnitude
+        one = Quantity(1., src_units).to(dst_units).magnitude
+        conversion = _conversions[key] = (one - zero, zero)
+        return conversion
+
+
+def convertMagnitude(magnitude, src_units, dst_units):
+    """Converts a magnitude (a number or a numpy array) from `src_units` into
+    `dst_units`.
+
+    :param magnitude: (number or numpy.ndarray) value to convert
+    :param src_units: (str or pint.Unit) units of magnitude
+    :param dst_units: (str or pint.Unit) target units
+
+    :return: (number or numpy.ndarray) the converted magnitude (which is the
+             given magnitude object itself if the units are the same)
+    """
+    if src_units == dst_units:
+        return magnitude
+    factor, offset = getConversion(src_units, dst_units)
+    if factor == 1 and offset == 0:
+        return magnitude
+    ret = magnitude * factor
+    if offset:
+        ret += offset
+    return ret
+
+
+def toUnits(quantity, units):
+    """Returns the given quantity expressed in the given units. It is
+    equivalent to :meth:`pint.Quantity.to` but it uses the cached conversion
+    (see :func:`convertMagnitude`) and does not copy the magnitude if the
+    units are the same.
+
+    :param quantity: (pint.Quantity) quantity to convert
+    :param units: (str or pint.Unit) target units
+
+    :return: (pint.Quantity) the quantity in the target units
+    """
+    units = getUnit(units)
+    src_units = quantity.units
+    if src_units == units:
+        return quantity
+    magnitude = convertMagnitude(quantity.magnitude, src_units, units)
+    return Quantity(magnitude, units)
@@ -39,8 +39,83 @@ except ImportError:
     __version__ = __local_pint_version + '-taurus'
     del warnings
 
+
+# The lazy registry relies on a private hook of pint (>= 0.8): the
+# UnitRegistry metaclass calls _after_init (which loads the definitions) after
+# __init__. Without it (or if it does not behave as expected) the registry is
+# built eagerly
+if hasattr(UnitRegistry, '_after_init'):
+
+    import threading as _threading
+
+    #: attributes of a _LazyUnitRegistry that do not need the definitions
+    _LAZY_SAFE = frozenset(('Quantity', 'Unit', 'Measurement',
+                            'default_format'))
+
+    def _loadDefinitions(registry):
+        '''loads the definitions of a _LazyUnitRegistry (only once, even if
+        it is called concurrently) and turns it into a plain UnitRegistry'''
+        d = object.__getattribute__(registry, '__dict__')
+        lock = d.get('_lazy_lock')
+        if lock is None:  # still in UnitRegistry.__init__
+            return
+        with lock:
+            # (it is re-entered by the loading thread from _after_init)
+            if type(registry) is not _LazyUnitRegistry or d['_lazy_loading']:
+                return
+            d['_lazy_loading'] = True
+            try:
+                UnitRegistry._after_init(registry)
+            finally:
+                d['_lazy_loading'] = False
+            # only now (with the registry completely built) the other threads
+            # are allowed to bypass the lock
+            object.__setattr__(registry, '__class__', UnitRegistry)
+
+    class _LazyUnitRegistry(UnitRegistry):
+        '''UnitRegistry that defers the loading of the unit definitions (which
+        is the most expensive part of its creation) until it is first used.
+        Its Quantity and Unit classes are available from the beginning.
+
+        The first access to any other attribute loads the definitions (see
+        pint's UnitRegistry._after_init) under a lock, during which the
+        accesses from other threads wait. Then the registry becomes a plain
+        UnitRegistry, so that the later accesses have no overhead.
+        '''
+
+        def _after_init(self):
+            # called by the UnitRegistry metaclass after __init__: postpone it
+            d = self.__dict__
+            d['_lazy_lock'] = _threading.RLock()
+            d['_lazy_loading'] = False
+
+        def __getattribute__(self, item):
+            if not item.startswith('__') and item not in _LAZY_SAFE:
+                _loadDefinitions(self)
+            return UnitRegistry.__getattribute__(self, item)
+
+    def _newUnitRegistry():
+        '''returns a new _LazyUnitRegistry or, if this version of pint did not
+        call its _after_init hook as expected, a plain UnitRegistry'''
+        try:
+            registry = _LazyUnitRegistry()
+            d = object.__getattribute__(registry, '__dict__')
+            if '_lazy_lock' in d:
+                return registry
+        except Exception:
+            pass
+        import warnings
+        warnings.warn('Cannot defer the loading of the unit definitions with '
+                      'pint %s' % __version__, RuntimeWarning)
+        del warnings
+        return UnitRegistry()
+
+    UR = _newUnitRegistry()
+
+else:
+    UR = UnitRegistry()
+
 # Ininitialize the unit registry for taurus
-UR = UnitRegistry()
 UR.default_format = '~' # use abbreviated units
 Q_ = Quantity = UR.Quantity
 
@@ -45,4 +45,9 @@ __icon.registerTheme(name=getattr(__S, 'QT_THEME_NAME', 'Tango'),
                      path=getattr(__S, 'QT_THEME_DIR', ''),
                      force=getattr(__S, 'QT_THEME_FORCE_ON_LINUX', False))
 
-del os, glob, __icon, icon_dir
\ No newline at end of file
+del os, glob, __icon, icon_dir
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the subpackages are imported when they are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__)
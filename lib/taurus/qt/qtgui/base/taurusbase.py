@@ -1106,6 +1106,21 @@ class TaurusBaseComponent(TaurusListener, BaseConfigurableClass):
         self._autoProtectOperation = protect
 
 
+class _ShownWatcher(Qt.QObject):
+    """Event filter that keeps whether a widget is shown in a plain python
+    attribute (updated in the GUI thread on its show and hide events), so
+    that it can be read from other threads (see
+    :meth:`TaurusBaseWidget.isShown`)"""
+
+    def eventFilter(self, obj, event):
+        etype = event.type()
+        if etype == Qt.QEvent.Show:
+            obj._isShown = True
+        elif etype == Qt.QEvent.Hide:
+            obj._isShown = False
+        return False
+
+
 class TaurusBaseWidget(TaurusBaseComponent):
     """The base class for all Qt Taurus widgets.
 
@@ -1122,9 +1137,35 @@ class TaurusBaseWidget(TaurusBaseComponent):
         self._disconnect_on_hide = False
         self._supportedMimeTypes = None
         self._autoTooltip = True
+        self._isShown = None
         self.call__init__(TaurusBaseComponent, name,
                           parent=parent, designMode=designMode)
         self._setText = self._findSetTextMethod()
+        from taurus import tauruscustomsettings
+        if getattr(tauruscustomsettings, 'ADAPTIVE_POLLING', False):
+            self._watchShown()
+
+    def _watchShown(self):
+        '''starts keeping track of whether the widget is shown (see
+        :meth:`isShown`)'''
+        self._isShown = self.isVisible()
+        self._shownWatcher = _ShownWatcher(self)
+        self.installEventFilter(self._shownWatcher)
+
+    def isShown(self):
+        '''Returns whether the widget is shown, i.e. whether it received a
+        show event after its last hide event (so it is False while it or an
+        ancestor is hidden or minimized). Unlike :meth:`QWidget.isVisible`,
+        it can be called from any thread (e.g. by
+        :class:`taurus.core.tauruspollingtimer.AdaptivePollingPolicy`).
+
+        It is only tracked for the widgets created with `ADAPTIVE_POLLING`
+        enabled in tauruscustomsettings
+
+        :return: (bool or None) whether the widget is shown or None if it is
+                 not tracked
+        '''
+        return self._isShown
 
     # It makes the GUI to hang... If this needs implementing, we should
     # reimplement it using the Qt parent class, not QWidget...
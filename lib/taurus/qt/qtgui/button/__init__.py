@@ -27,5 +27,15 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qbuttonbox import *
-from .taurusbutton import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'qbuttonbox',
+        'taurusbutton',
+    ])
+else:
+    from .qbuttonbox import *
+    from .taurusbutton import *
@@ -28,5 +28,15 @@ to provide several functionalities in a reduced space"""
 
 __docformat__ = 'restructuredtext'
 
-from .abstractswitcher import *
-from .basicswitcher import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'abstractswitcher',
+        'basicswitcher',
+    ])
+else:
+    from .abstractswitcher import *
+    from .basicswitcher import *
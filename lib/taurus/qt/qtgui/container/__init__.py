@@ -27,11 +27,27 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qcontainer import *
-from .taurusbasecontainer import *
-from .taurusframe import *
-from .tauruswidget import *
-from .taurusgroupbox import *
-from .taurusgroupwidget import *
-from .taurusscrollarea import *
-from .taurusmainwindow import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'qcontainer',
+        'taurusbasecontainer',
+        'taurusframe',
+        'tauruswidget',
+        'taurusgroupbox',
+        'taurusgroupwidget',
+        'taurusscrollarea',
+        'taurusmainwindow',
+    ])
+else:
+    from .qcontainer import *
+    from .taurusbasecontainer import *
+    from .taurusframe import *
+    from .tauruswidget import *
+    from .taurusgroupbox import *
+    from .taurusgroupwidget import *
+    from .taurusscrollarea import *
+    from .taurusmainwindow import *
@@ -28,5 +28,15 @@ panels like forms or panels to be inserted in dialogs"""
 
 __docformat__ = 'restructuredtext'
 
-from .taurusmessagebox import *
-from .taurusinputdialog import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'taurusmessagebox',
+        'taurusinputdialog',
+    ])
+else:
+    from .taurusmessagebox import *
+    from .taurusinputdialog import *
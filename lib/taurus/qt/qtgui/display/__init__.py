@@ -29,11 +29,27 @@ Examples of widgets that suite this rule are labels, leds and LCDs"""
 
 __docformat__ = 'restructuredtext'
 
-from .qfallback import *
-from .qpixmapwidget import *
-from .qled import *
-from .qlogo import *
-from .qsevensegment import *
-from .tauruslabel import *
-from .taurusled import *
-from .tauruslcd import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'qfallback',
+        'qpixmapwidget',
+        'qled',
+        'qlogo',
+        'qsevensegment',
+        'tauruslabel',
+        'taurusled',
+        'tauruslcd',
+    ])
+else:
+    from .qfallback import *
+    from .qpixmapwidget import *
+    from .qled import *
+    from .qlogo import *
+    from .qsevensegment import *
+    from .tauruslabel import *
+    from .taurusled import *
+    from .tauruslcd import *
@@ -27,5 +27,17 @@
 
 __docformat__ = 'restructuredtext'
 
-from .plot import TaurusImageDialog, TaurusCurveDialog, TaurusTrendDialog
-from .taurustrend2d import TaurusTrend2DDialog
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        ('plot', ['TaurusImageDialog',
+                  'TaurusCurveDialog',
+                  'TaurusTrendDialog']),
+        ('taurustrend2d', ['TaurusTrend2DDialog']),
+    ])
+else:
+    from .plot import TaurusImageDialog, TaurusCurveDialog, TaurusTrendDialog
+    from .taurustrend2d import TaurusTrend2DDialog
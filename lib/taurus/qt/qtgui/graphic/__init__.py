@@ -27,13 +27,25 @@
 
 __docformat__ = 'restructuredtext'
 
-from .taurusgraphic import *
-from .taurusgraphicview import *
+from taurus import tauruscustomsettings as __S
 
-try:
-    from .jdraw import *
-except:
-    import taurus.core.util.log
-    _logger = taurus.core.util.log.Logger(__name__)
-    _logger.debug("jdraw widgets could not be initialized")
-    _logger.traceback()
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    # (jdraw is optional: it is only imported if a name not found in the
+    # other submodules is accessed)
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'taurusgraphic',
+        'taurusgraphicview',
+    ], optional=['jdraw'])
+else:
+    from .taurusgraphic import *
+    from .taurusgraphicview import *
+
+    try:
+        from .jdraw import *
+    except:
+        import taurus.core.util.log
+        _logger = taurus.core.util.log.Logger(__name__)
+        _logger.debug("jdraw widgets could not be initialized")
+        _logger.traceback()
@@ -23,7 +23,15 @@
 ##
 #############################################################################
 
-"""This module parses jdraw files"""
+"""This module parses jdraw files
+
+If the ``JDRAW_PARSE_CACHE`` option of :mod:`taurus.tauruscustomsettings`
+is enabled, the parsed element tree of each file is cached on disk (in the
+``~/.taurus/jdraw_cache`` directory), so that later loads of an unchanged
+file skip the lexing and parsing and go straight to the construction of the
+scene by the factory. Only the cache files owned by the user and not
+writable by others are read.
+"""
 
 from __future__ import absolute_import
 
@@ -32,6 +40,10 @@ __all__ = ["new_parser", "parse"]
 import os
 import re
 import imp
+import zlib
+import hashlib
+import cPickle
+import threading
 
 from ply import lex
 from ply import yacc
@@ -343,22 +355,193 @@ def new_parser(optimize=None, debug=0, outputdir=None):
     return l, p
 
 
+#-------------------------------------------------------------------------
+# Element tree and parse cache
+#-------------------------------------------------------------------------
+
+# version of the format of the cache files. Increase it whenever the grammar
+# or the element tree change
+_CACHE_VERSION = 1
+
+_parser = None
+_parserLock = threading.Lock()
+
+
+class _Element(object):
+    """A node of the parsed element tree: the arguments of a call to the
+    getObj method of the factory"""
+
+    __slots__ = ('name', 'params')
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+
+
+class _TreeFactory(object):
+    """Factory used while parsing. Instead of creating the objects, it
+    records the element tree so that it can be cached and built later with
+    :func:`_buildScene`"""
+
+    def getObj(self, name, params):
+        return _Element(name, params)
+
+    def getSceneObj(self, items):
+        return items
+
+
+def _buildElements(elements, factory):
+    objs = []
+    for i, element in enumerate(elements):
+        obj = _buildElement(element, factory)
+        # as in the element_list rules, only the first element is kept if
+        # its object could not be created
+        if obj is not None or i == 0:
+            objs.append(obj)
+    return objs
+
+
+def _buildElement(element, factory):
+    # the children are created before their parent (as when parsing)
+    params = dict(element.params)
+    for k, v in params.iteritems():
+        if isinstance(v, list) and v and isinstance(v[0], _Element):
+            params[k] = _buildElements(v, factory)
+    obj = factory.getObj(element.name, params)
+    if obj is None:
+        Logger('JDraw Parser').info("Unable to create obj '%s'" %
+                                    element.name)
+    return obj
+
+
+def _buildScene(tree, factory):
+    """Returns the scene created by the factory from a parsed element tree
+
+    :param tree: (list<_Element>) the elements of the jdraw file
+    :param factory: (TaurusBaseGraphicsFactory) the factory
+
+    :return: (object) the scene object returned by the factory
+    """
+    scene = factory.getSceneObj(_buildElements(tree, factory))
+    if scene is None:
+        Logger('JDraw Parser').info("Unable to create Scene")
+    return scene
+
+
+def _getParser():
+    """Returns the (lexer, parser) pair shared by all the calls to
+    :func:`parse`. It is created on first use"""
+    global _parser
+    if _parser is None:
+        l, p = new_parser()
+        l.log = p.log = Logger('JDraw Parser')
+        _parser = l, p
+    return _parser
+
+
+def _parseTree(text):
+    """Parses the contents of a jdraw file into an element tree
+
+    :param text: (str) contents of the jdraw file
+
+    :return: (list<_Element> or None) the elements of the file
+    """
+    with _parserLock:
+        l, p = _getParser()
+        l.lineno = 1
+        p.factory = _TreeFactory()
+        p.modelStack = []
+        p.modelStack2 = []
+        try:
+            return p.parse(text, lexer=l)
+        finally:
+            p.factory = None
+
+
+def _getCacheFileName(filename):
+    from taurus import tauruscustomsettings
+    if not getattr(tauruscustomsettings, 'JDRAW_PARSE_CACHE', False):
+        return None
+    cachedir = os.path.join(os.path.expanduser('~'), '.taurus',
+                            'jdraw_cache')
+    if isinstance(filename, unicode):
+        filename = filename.encode('utf-8')
+    return os.path.join(cachedir, hashlib.sha1(filename).hexdigest())
+
+
+def _readCache(cachefile, key):
+    try:
+        with open(cachefile, 'rb') as f:
+            # do not unpickle files that others could have written
+            st = os.fstat(f.fileno())
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                return None
+            data = cPickle.loads(zlib.decompress(f.read()))
+    except Exception:
+        return None
+    if data[0] != key:
+        return None
+    return data[1]
+
+
+def _writeCache(cachefile, key, tree):
+    """Writes the element tree in the cache file (compressed pickle). The
+    file is replaced atomically, so that other processes never read a
+    partially written cache"""
+    try:
+        cachedir = os.path.dirname(cachefile)
+        if not os.path.exists(cachedir):
+            os.makedirs(cachedir, 0o700)
+        data = zlib.compress(cPickle.dumps((key, tree), 2))
+        tmpfile = '%s.%d.tmp' % (cachefile, os.getpid())
+        fd = os.open(tmpfile, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(tmpfile, cachefile)
+    except Exception:
+        log = Logger('JDraw Parser')
+        log.debug("Cannot write the parse cache %s", cachefile, exc_info=1)
+
+
 def parse(filename=None, factory=None):
+    """Parses a jdraw file and returns the scene created with the factory.
 
-    if filename is None or factory is None:
-        return
+    If the ``JDRAW_PARSE_CACHE`` option of :mod:`taurus.tauruscustomsettings`
+    is enabled, the parsed element tree is cached on disk keyed by the path,
+    modification time and size of the file.
 
-    _, p = new_parser()
+    :param filename: (str) path of the jdraw file
+    :param factory: (TaurusBaseGraphicsFactory) the factory
 
-    p.factory = factory
-    p.modelStack = []
-    p.modelStack2 = []
+    :return: (object) the scene object returned by the factory (or None if
+             the file could not be parsed)
+    """
+    if filename is None or factory is None:
+        return
 
     res = None
     try:
         filename = os.path.realpath(filename)
-        f = open(filename)
-        res = yacc.parse(f.read())
+        # the cache is only an optimization: if it fails, parse the file
+        tree = cachefile = None
+        try:
+            st = os.stat(filename)
+            key = (_CACHE_VERSION, filename, st.st_mtime, st.st_size)
+            cachefile = _getCacheFileName(filename)
+            if cachefile is not None:
+                tree = _readCache(cachefile, key)
+        except Exception:
+            log = Logger('JDraw Parser')
+            log.debug("Cannot use the parse cache for %r", filename,
+                      exc_info=1)
+            tree = cachefile = None
+        if tree is None:
+            with open(filename) as f:
+                tree = _parseTree(f.read())
+            if tree is not None and cachefile is not None:
+                _writeCache(cachefile, key, tree)
+        if tree is not None:
+            res = _buildScene(tree, factory)
     except:
         log = Logger('JDraw Parser')
         log.warning("Failed to parse %s" % filename)
@@ -0,0 +1,188 @@
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Unit tests for the jdraw parser and its parse cache"""
+
+import os
+import sys
+import shutil
+import tempfile
+import pkg_resources
+
+from taurus import tauruscustomsettings
+from taurus.external import unittest
+from taurus.qt.qtgui.graphic.jdraw import jdraw_parser
+
+
+_LABEL_JDW = '''JDFile v11 {
+  Global {
+  }
+  JDLabel {
+    summit:39,19,148,40
+    origin:120,30
+    name:"mylabel"
+    text:"label"
+  }
+}
+'''
+
+
+class _Factory(object):
+    '''Factory that creates plain tuples and records the calls'''
+
+    def __init__(self):
+        self.calls = []
+
+    def getObj(self, name, params):
+        self.calls.append((name, params.get('name'), params.get('summit')))
+        return name, len(self.calls), params.get('children')
+
+    def getSceneObj(self, items):
+        return 'scene', items
+
+
+class JDrawParseCacheTestCase(unittest.TestCase):
+    '''Test case for the parse cache of the jdraw parser'''
+
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self._oldhome = os.environ.get('HOME')
+        os.environ['HOME'] = self.home
+        fname = pkg_resources.resource_filename(
+            'taurus.qt.qtgui.graphic.jdraw.test.res',
+            'SimpleScalarViewer.jdw')
+        self.fname = os.path.join(self.home, 'test.jdw')
+        shutil.copy(fname, self.fname)
+        self._oldcache = getattr(tauruscustomsettings, 'JDRAW_PARSE_CACHE',
+                                 False)
+        tauruscustomsettings.JDRAW_PARSE_CACHE = True
+
+    def tearDown(self):
+        tauruscustomsettings.JDRAW_PARSE_CACHE = self._oldcache
+        if self._oldhome is None:
+            os.environ.pop('HOME')
+        else:
+            os.environ['HOME'] = self._oldhome
+        shutil.rmtree(self.home)
+
+    def _parse(self):
+        factory = _Factory()
+        scene = jdraw_parser.parse(self.fname, factory)
+        return scene, factory.calls
+
+    def test_cache(self):
+        '''check that the cached loads create the same scene'''
+        scene, calls = self._parse()
+        self.assertEqual(scene[0], 'scene')
+        self.assertTrue(len(calls) > 0)
+        cachefile = jdraw_parser._getCacheFileName(self.fname)
+        self.assertTrue(os.path.exists(cachefile))
+        # the cached tree is used even if the parser is not available
+        orig = jdraw_parser._parseTree
+        jdraw_parser._parseTree = None
+        try:
+            self.assertEqual(self._parse(), (scene, calls))
+        finally:
+            jdraw_parser._parseTree = orig
+
+    def _grammarParse(self, factory):
+        '''parses the file with the grammar calling the factory directly
+        (as without the element tree)'''
+        with jdraw_parser._parserLock:
+            l, p = jdraw_parser._getParser()
+            l.lineno = 1
+            p.factory = factory
+            p.modelStack = []
+            p.modelStack2 = []
+            try:
+                with open(self.fname) as f:
+                    return p.parse(f.read(), lexer=l)
+            finally:
+                p.factory = None
+
+    def test_examples(self):
+        '''check that the cached loads of the example files create the same
+        scene as the grammar'''
+        examples = [('taurus.qt.qtgui.graphic.jdraw.test.res',
+                     'SimpleScalarViewer.jdw'),
+                    ('taurus.qt.qtgui.graphic.jdraw.test.res', 'styles.jdw'),
+                    ('taurus.qt.qtgui.taurusgui.conf.tgconf_example01',
+                     'images/example01.jdw'),
+                    ('taurus.qt.qtgui.taurusgui.conf.tgconf_example01',
+                     'images/syn2.jdw')]
+        for package, name in examples:
+            shutil.copy(pkg_resources.resource_filename(package, name),
+                        self.fname)
+            factory = _Factory()
+            expected = self._grammarParse(factory), factory.calls
+            self.assertEqual(self._parse(), expected)
+            self.assertTrue(
+                os.path.exists(jdraw_parser._getCacheFileName(self.fname)))
+            self.assertEqual(self._parse(), expected)
+
+    def test_disabled(self):
+        '''check that no cache is written if the option is disabled'''
+        tauruscustomsettings.JDRAW_PARSE_CACHE = False
+        self.assertIsNone(jdraw_parser._getCacheFileName(self.fname))
+        self._parse()
+        self.assertFalse(os.path.exists(os.path.join(self.home, '.taurus')))
+
+    def test_invalidation(self):
+        '''check that the cache is not used if the file changed'''
+        self._parse()
+        with open(self.fname, 'w') as f:
+            f.write(_LABEL_JDW)
+        scene, calls = self._parse()
+        self.assertEqual(calls, [('JDLabel', 'mylabel', [39., 19., 148., 40.])])
+
+    def test_nonAsciiPath(self):
+        '''check that files with non-ascii paths are parsed and cached'''
+        fname = os.path.join(self.home, u'\xe9t\xe9.jdw')
+        try:
+            fname.encode(sys.getfilesystemencoding() or 'ascii')
+        except UnicodeError:
+            self.skipTest('the file system encoding is not unicode')
+        shutil.copy(self.fname, fname)
+        self.fname = fname
+        scene, calls = self._parse()
+        self.assertEqual(scene[0], 'scene')
+        self.assertTrue(os.path.exists(jdraw_parser._getCacheFileName(fname)))
+        self.assertEqual(self._parse(), (scene, calls))
+
+    def test_cacheFailure(self):
+        '''check that the file is parsed if the cache cannot be used'''
+        scene, calls = self._parse()
+        orig = jdraw_parser._getCacheFileName
+
+        def _getCacheFileName(filename):
+            raise RuntimeError('cache failure')
+        jdraw_parser._getCacheFileName = _getCacheFileName
+        try:
+            self.assertEqual(self._parse(), (scene, calls))
+        finally:
+            jdraw_parser._getCacheFileName = orig
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,6 +28,17 @@ provide a way to browse through the application help system"""
 
 __docformat__ = 'restructuredtext'
 
-from .assistant import *
-from .aboutdialog import *
-from .helppanel import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'assistant',
+        'aboutdialog',
+        'helppanel',
+    ])
+else:
+    from .assistant import *
+    from .aboutdialog import *
+    from .helppanel import *
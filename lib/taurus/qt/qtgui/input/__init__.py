@@ -28,10 +28,25 @@ with the user. Examples are line edits, comboboxes and checkboxes"""
 
 __docformat__ = 'restructuredtext'
 
-from .qwheel import *
-from .tauruscheckbox import *
-from .tauruscombobox import *
-from .tauruslineedit import *
-from .taurusspinbox import *
-from .tauruswheel import *
-from .choicedlg import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'qwheel',
+        'tauruscheckbox',
+        'tauruscombobox',
+        'tauruslineedit',
+        'taurusspinbox',
+        'tauruswheel',
+        'choicedlg',
+    ])
+else:
+    from .qwheel import *
+    from .tauruscheckbox import *
+    from .tauruscombobox import *
+    from .tauruslineedit import *
+    from .taurusspinbox import *
+    from .tauruswheel import *
+    from .choicedlg import *
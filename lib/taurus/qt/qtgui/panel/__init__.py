@@ -28,15 +28,35 @@ panels like forms or panels to be inserted in dialogs"""
 
 __docformat__ = 'restructuredtext'
 
-from .qrawdatachooser import *
-from .qdataexportdialog import *
-from .taurusmessagepanel import *
-from .taurusinputpanel import *
-from .taurusmodelchooser import *
-from .taurusvalue import *
-from .taurusform import *
-from .taurusmodellist import *
-from .taurusconfigeditor import *
-from .qdoublelist import *
-from .taurusdevicepanel import *
-from .taurusconfigurationpanel import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'qrawdatachooser',
+        'qdataexportdialog',
+        'taurusmessagepanel',
+        'taurusinputpanel',
+        'taurusmodelchooser',
+        'taurusvalue',
+        'taurusform',
+        'taurusmodellist',
+        'taurusconfigeditor',
+        'qdoublelist',
+        'taurusdevicepanel',
+        'taurusconfigurationpanel',
+    ])
+else:
+    from .qrawdatachooser import *
+    from .qdataexportdialog import *
+    from .taurusmessagepanel import *
+    from .taurusinputpanel import *
+    from .taurusmodelchooser import *
+    from .taurusvalue import *
+    from .taurusform import *
+    from .taurusmodellist import *
+    from .taurusconfigeditor import *
+    from .qdoublelist import *
+    from .taurusdevicepanel import *
+    from .taurusconfigurationpanel import *
@@ -35,7 +35,8 @@ from taurus.external.qt import Qt
 import PyTango
 
 import taurus.core
-from taurus.core import TaurusDevState
+from taurus.core import TaurusDevState, TaurusElementType
+from taurus.core.taurushelper import addListeners, removeListeners
 
 from taurus.qt.qtcore.mimetypes import (TAURUS_ATTR_MIME_TYPE, TAURUS_DEV_MIME_TYPE,
                                         TAURUS_MODEL_LIST_MIME_TYPE, TAURUS_MODEL_MIME_TYPE)
@@ -81,9 +82,24 @@ class TaurusForm(TaurusWidget):
 
     By default, the form provides global Apply and Cancel buttons.
 
+    In virtualized mode (see :meth:`setVirtualized`) only the items of the
+    rows that are within (or close to) the visible part of the form are
+    created, and they are destroyed when scrolled far away. This allows to
+    show forms with thousands of models, but note that in this mode
+    :meth:`getItems` (and the list-like interface) only gives access to the
+    items that currently exist.
+
     You can also see some code that exemplifies the use of TaurusForm in :ref:`Taurus
     coding examples <examples>` '''
 
+    #: estimated height (in pixels) of the rows not yet created in
+    #: virtualized mode
+    VirtualRowHeight = 24
+    #: number of rows above and below the visible ones that are also created
+    #: in virtualized mode. The items are destroyed when they are beyond
+    #: twice this margin
+    VirtualMargin = 5
+
     def __init__(self, parent=None,
                  formWidget=None,
                  buttons=None,
@@ -97,6 +113,10 @@ class TaurusForm(TaurusWidget):
         self._customWidgetMap = {}
         self._model = []
         self._children = []
+        self._virtualModels = None
+        self._virtualItems = {}
+        self._itemsLabelConfig = None
+        self._virtualized = False
         self.setFormWidget(formWidget)
 
         self.setLayout(Qt.QVBoxLayout())
@@ -110,6 +130,15 @@ class TaurusForm(TaurusWidget):
         self.layout().addWidget(self.scrollArea)
         self.__modelChooserDlg = None
 
+        # the rows shown in virtualized mode are updated (at most once per
+        # event loop iteration) when scrolling or resizing
+        self._virtualTimer = Qt.QTimer(self)
+        self._virtualTimer.setSingleShot(True)
+        self._virtualTimer.setInterval(0)
+        self._virtualTimer.timeout.connect(self._updateVirtualRows)
+        self.scrollArea.verticalScrollBar().valueChanged.connect(
+            self._scheduleVirtualUpdate)
+
         self.buttonBox = QButtonBox(buttons=buttons, parent=self)
         self.layout().addWidget(self.buttonBox)
 
@@ -142,11 +171,14 @@ class TaurusForm(TaurusWidget):
                                     TAURUS_ATTR_MIME_TYPE, TAURUS_MODEL_MIME_TYPE, 'text/plain'])
 
         self.resetCompact()
+        self.resetVirtualized()
 
         # properties
         self.registerConfigProperty(
             self.isWithButtons, self.setWithButtons, 'withButtons')
         self.registerConfigProperty(self.isCompact, self.setCompact, 'compact')
+        self.registerConfigProperty(self.isVirtualized, self.setVirtualized,
+                                    'virtualized')
 
     def __getitem__(self, key):
         '''provides a list-like interface: items of the form can be accessed using slice notation'''
@@ -375,6 +407,33 @@ class TaurusForm(TaurusWidget):
         from taurus import tauruscustomsettings
         self.setCompact(getattr(tauruscustomsettings, 'T_FORM_COMPACT', {}))
 
+    def setVirtualized(self, virtualized):
+        '''Sets whether the items are created only for the visible rows
+        (virtualized mode) or for all the rows of the form
+
+        :param virtualized: (bool)
+        '''
+        virtualized = bool(virtualized)
+        if virtualized == self._virtualized:
+            return
+        self._virtualized = virtualized
+        if self._model:
+            self.destroyChildren()
+            self.fillWithChildren()
+
+    def isVirtualized(self):
+        return self._virtualized
+
+    def resetVirtualized(self):
+        from taurus import tauruscustomsettings
+        self.setVirtualized(getattr(tauruscustomsettings,
+                                    'T_FORM_VIRTUALIZED', False))
+
+    def resizeEvent(self, event):
+        '''reimplemented to update the rows shown in virtualized mode'''
+        TaurusWidget.resizeEvent(self, event)
+        self._scheduleVirtualUpdate()
+
     def dropEvent(self, event):
         '''reimplemented to support dropping of modelnames in forms'''
         mtype = self.handleMimeData(event.mimeData(), self.addModels)
@@ -417,6 +476,8 @@ class TaurusForm(TaurusWidget):
             child.setModel(None)
             child.deleteLater()
         self._children = []
+        self._virtualModels = None
+        self._virtualItems = {}
 
     def fillWithChildren(self):
         frame = TaurusWidget()
@@ -430,12 +491,35 @@ class TaurusForm(TaurusWidget):
             if parent_model:
                 parent_name = parent_model.getFullName()
 
-        for i, model in enumerate(self.getModel()):
-            if not model:
-                continue
-            if parent_name:
+        models = []
+        for model in self.getModel():
+            if model and parent_name:
                 # @todo: Change this (it assumes tango model naming!)
                 model = "%s/%s" % (parent_name, model)
+            models.append(model)
+
+        # in virtualized mode, the rows get a placeholder height and their
+        # items are created later by _updateVirtualRows
+        if self._virtualized and hasattr(self._defaultFormWidget,
+                                         'setPreferredRow'):
+            layout = frame.layout()
+            for i, model in enumerate(models):
+                if model:
+                    layout.setRowMinimumHeight(i + 1, self.VirtualRowHeight)
+            layout.addItem(Qt.QSpacerItem(0, 0, Qt.QSizePolicy.Minimum,
+                                          Qt.QSizePolicy.MinimumExpanding),
+                           len(models) + 1, 0)
+            self.scrollArea.setWidget(frame)
+            self._virtualModels = models
+            self._scheduleVirtualUpdate()
+            return
+
+        # (keep the prefetched attributes alive until the children use them)
+        prefetched = self._prefetchAttributes(models)
+
+        for i, model in enumerate(models):
+            if not model:
+                continue
             klass, args, kwargs = self.getFormWidget(model=model)
             widget = klass(frame, *args, **kwargs)
             # @todo UGLY... See if this can be done in other ways... (this causes trouble with widget that need more vertical space , like PoolMotorTV)
@@ -458,12 +542,166 @@ class TaurusForm(TaurusWidget):
             self.registerConfigDelegate(widget)
             self._children.append(widget)
 
+        self._releasePrefetched(prefetched)
+
         frame.layout().addItem(Qt.QSpacerItem(
             0, 0, Qt.QSizePolicy.Minimum, Qt.QSizePolicy.MinimumExpanding))
         self.scrollArea.setWidget(frame)
 #        self.scrollArea.setWidgetResizable(True)
         self.scrollArea.setMinimumWidth(frame.layout().sizeHint().width() + 20)
 
+    def _scheduleVirtualUpdate(self, *args):
+        if self._virtualModels is not None:
+            self._virtualTimer.start()
+
+    def _virtualRowAt(self, layout, y):
+        '''returns the index of the model whose row is at the given vertical
+        position of the frame (binary search on the layout geometry)'''
+        n = len(self._virtualModels)
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            rect = layout.cellRect(mid + 1, 0)
+            if not rect.isValid():
+                # the layout has not been set up yet: use the estimation
+                return min(y // self.VirtualRowHeight, n - 1)
+            if rect.bottom() < y:
+                lo = mid + 1
+            else:
+                hi = mid
+        return min(lo, n - 1)
+
+    def _updateVirtualRows(self):
+        '''creates the items of the rows that are visible (or within the
+        margin) and destroys those that are far from the visible ones'''
+        models = self._virtualModels
+        if not models:
+            return
+        frame = self.scrollArea.widget()
+        layout = frame.layout()
+        layout.activate()
+        top = self.scrollArea.verticalScrollBar().value()
+        bottom = top + self.scrollArea.viewport().height()
+        first = self._virtualRowAt(layout, top)
+        last = self._virtualRowAt(layout, bottom)
+        margin = self.VirtualMargin
+
+        created = False
+        for i in xrange(max(first - margin, 0),
+                        min(last + margin + 1, len(models))):
+            if models[i] and i not in self._virtualItems:
+                self._virtualItems[i] = self._createVirtualItem(frame, i)
+                created = True
+
+        for i in self._virtualItems.keys():
+            if first - 2 * margin <= i <= last + 2 * margin:
+                continue
+            item = self._virtualItems[i]
+            if not hasattr(item, 'setPreferredRow'):
+                continue  # kept once created (see _createVirtualItem)
+            # do not lose the values being edited by the user
+            try:
+                pending = item.writeWidget(
+                    followCompact=True).hasPendingOperations()
+            except AttributeError:
+                pending = False
+            if not pending:
+                self._releaseVirtualItem(layout, i)
+
+        self._children = [self._virtualItems[i]
+                          for i in sorted(self._virtualItems)]
+        if created:
+            width = layout.sizeHint().width() + 20
+            if width > self.scrollArea.minimumWidth():
+                self.scrollArea.setMinimumWidth(width)
+
+    def _createVirtualItem(self, frame, index):
+        '''creates the item of the given row. The items whose class cannot be
+        placed in a given row (i.e. without setPreferredRow, e.g. some custom
+        widgets) are added to the row by the form and they are never
+        released (as in the non-virtualized mode)'''
+        model = self._virtualModels[index]
+        klass, args, kwargs = self.getFormWidget(model=model)
+        widget = klass(None, *args, **kwargs)
+        widget.setMinimumHeight(20)
+        try:
+            placed = hasattr(widget, 'setPreferredRow')
+            if placed:
+                widget.setPreferredRow(index + 1)
+            widget.setCompact(self.isCompact())
+            if self._itemsLabelConfig is not None:
+                widget.labelConfig = self._itemsLabelConfig
+            widget.setModel(model)
+            widget.setParent(frame)
+            if not placed:
+                frame.layout().addWidget(widget, index + 1, 0, 1, -1)
+        except:
+            self.warning(
+                'an error occurred while adding the child "%s". Skipping' % model)
+            self.traceback(level=taurus.Debug)
+        try:
+            widget.setModifiableByUser(self.isModifiableByUser())
+        except:
+            pass
+        widget.setObjectName("__item%i" % index)
+        self.registerConfigDelegate(widget)
+        return widget
+
+    def _releaseVirtualItem(self, layout, index):
+        item = self._virtualItems.pop(index)
+        row = index + 1
+        # keep the actual height of the row for when it is created again
+        layout.setRowMinimumHeight(row, max(layout.cellRect(row, 0).height(),
+                                            self.VirtualRowHeight))
+        self.unregisterConfigurableItem(item, raiseOnError=False)
+        item.setModel(None)
+        # the subwidgets are children of the frame, not of the item
+        for w in (item.labelWidget(), item.readWidget(), item.writeWidget(),
+                  item.unitsWidget(), item.customWidget(), item.extraWidget()):
+            if w is not None:
+                w.deleteLater()
+        for column in xrange(layout.columnCount()):
+            layoutItem = layout.itemAtPosition(row, column)
+            if layoutItem is not None and layoutItem.spacerItem() is not None:
+                layout.removeItem(layoutItem)
+        item.deleteLater()
+
+    def _prefetchAttributes(self, models):
+        '''creates in bulk (see :func:`taurus.Attributes`) the attribute
+        models among the given ones and subscribes concurrently to their
+        events (see :func:`taurus.core.taurushelper.addListeners`), so that
+        the children do not need to do it one by one.
+
+        :param models: (seq<str>) model names
+
+        :return: (list<TaurusAttribute>) the prefetched attributes, which
+                 must be kept until the children are created and then passed
+                 to :meth:`_releasePrefetched`
+        '''
+        attr_names = [m for m in models if m and
+                      taurus.isValidName(m, [TaurusElementType.Attribute])]
+        if len(attr_names) < 2:
+            return []
+        try:
+            attrs = taurus.Attributes(attr_names)
+            addListeners(attrs, self._onPrefetchedEvent)
+        except Exception:
+            self.debug('Cannot prefetch the attribute models', exc_info=1)
+            return []
+        return attrs
+
+    def _releasePrefetched(self, attrs):
+        '''undoes the subscriptions done by :meth:`_prefetchAttributes` (the
+        attributes keep those of the children)'''
+        try:
+            removeListeners(attrs, self._onPrefetchedEvent)
+        except Exception:
+            self.debug('Cannot release the prefetched models', exc_info=1)
+
+    def _onPrefetchedEvent(self, evt_src, evt_type, evt_value):
+        '''listener of the prefetched attributes (it ignores their events)'''
+        pass
+
     def getItemByModel(self, model, index=0):
         '''returns the child item with given model. If there is more than one item
         with the same model, the index parameter can be used to distinguish among them
@@ -501,6 +739,7 @@ class TaurusForm(TaurusWidget):
         labelConfig, ok = Qt.QInputDialog.getItem(self, 'Change Label', msg,
                                                   keys, 0, True)
         if ok:
+            self._itemsLabelConfig = str(labelConfig)
             for item in self.getItems():
                 item.labelConfig = (str(labelConfig))
 
@@ -990,6 +1229,9 @@ def taurusFormMain():
                       default="TaurusForm", help="Name of the window")
     parser.add_option("--config", "--config-file", dest="config_file", default=None,
                       help="use the given config file for initialization")
+    parser.add_option("--virtualized", action="store_true",
+                      dest="virtualized", default=False,
+                      help="create the widgets only for the visible rows")
     app = TaurusApplication(cmd_line_parser=parser,
                             app_name="taurusform",
                             app_version=taurus.Release.version)
@@ -1000,6 +1242,8 @@ def taurusFormMain():
     dialog.setModifiableByUser(True)
     dialog.setModelInConfig(True)
     dialog.setWindowTitle(options.window_name)
+    if options.virtualized:
+        dialog.setVirtualized(True)
 
     # Make sure the window size and position are restored
     dialog.registerConfigProperty(dialog.saveGeometry, dialog.restoreGeometry,
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of the opening of big TaurusForms.
+
+It measures the time until a TaurusForm with 100, 1000 and 5000 rows is
+shown (and the increase of the peak memory of the process) in the default
+and in the virtualized modes. Each case is run in a separate process.
+
+Usage: python -m taurus.qt.qtgui.panel.test.bench_taurusform
+"""
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import subprocess
+from taurus.test import printBenchmarks
+
+
+_ROWS = (100, 1000, 5000)
+
+_SCRIPT = '''
+import time, resource
+from taurus.qt.qtgui.application import TaurusApplication
+from taurus.qt.qtgui.panel import TaurusForm
+app = TaurusApplication([])
+models = ['eval:%%d*1.0' %% i for i in range(%d)]
+mem0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.time()
+form = TaurusForm(withButtons=False)
+form.setVirtualized(%r)
+form.setModel(models)
+form.resize(600, 800)
+form.show()
+for _ in range(10):
+    app.processEvents()
+t = time.time() - t0
+mem = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - mem0
+print t, mem
+'''
+
+
+def _openForm(rows, virtualized):
+    '''returns the time (in s) and memory (in kB) needed for showing a form
+    with the given number of rows'''
+    out = subprocess.check_output([sys.executable, '-c',
+                                   _SCRIPT % (rows, virtualized)])
+    t, mem = out.split()[-2:]
+    return float(t), int(mem)
+
+
+def main():
+    times, memory = [], []
+    for rows in _ROWS:
+        t0, mem0 = _openForm(rows, False)
+        t1, mem1 = _openForm(rows, True)
+        name = '%d rows' % rows
+        times.append((name, t0, t1))
+        memory.append('%-10s %10d kB %10d kB' % (name, mem0, mem1))
+    printBenchmarks(times, title='Form open time (default vs virtualized)')
+    title = 'Form memory (default vs virtualized)'
+    print '%s\n%s\n%s\n' % (title, '-' * len(title), '\n'.join(memory))
+
+
+if __name__ == '__main__':
+    main()
@@ -25,7 +25,7 @@
 """Unit tests for Taurus Forms"""
 
 from taurus.external import unittest
-from taurus.qt.qtgui.test import GenericWidgetTestCase
+from taurus.qt.qtgui.test import GenericWidgetTestCase, BaseWidgetTestCase
 from taurus.qt.qtgui.panel import TaurusForm, TaurusAttrForm
 
 
@@ -54,6 +54,46 @@ class TaurusFormTest(GenericWidgetTestCase, unittest.TestCase):
                   ]
 
 
+class VirtualizedTaurusFormTest(BaseWidgetTestCase, unittest.TestCase):
+
+    '''
+    Tests for the virtualized mode of TaurusForm
+    '''
+    _klass = TaurusForm
+    _BUG_334_WORKAROUND_TIME = 0
+
+    def _processEvents(self):
+        for _ in range(5):
+            self._app.processEvents()
+
+    def test_virtualized(self):
+        '''Check that only the items of the visible rows are created'''
+        n = 200
+        self._widget.setVirtualized(True)
+        self._widget.setModel(['eval:%d' % i for i in range(n)])
+        self._widget.resize(400, 300)
+        self._widget.show()
+        self._processEvents()
+        items = self._widget.getItems()
+        self.assertTrue(0 < len(items) < n)
+        self.assertEqual(items[0].getModel(), 'eval:0')
+        # scroll to the end
+        scrollbar = self._widget.scrollArea.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+        self._processEvents()
+        items = self._widget.getItems()
+        self.assertTrue(0 < len(items) < n)
+        self.assertEqual(items[-1].getModel(), 'eval:%d' % (n - 1))
+        # disabling the virtualized mode creates all the items
+        self._widget.setVirtualized(False)
+        self.assertEqual(len(self._widget), n)
+
+    def tearDown(self):
+        self._widget.setModel([])
+        self._widget.close()
+        unittest.TestCase.tearDown(self)
+
+
 class TaurusAttrFormTest(GenericWidgetTestCase, unittest.TestCase):
 
     '''
@@ -31,13 +31,32 @@ This module is part of Taurus Widgets. It contains specialized widgets for 2D pl
 in Taurus. It depends on the `PyQwt module <http://pyqwt.sourceforge.net/>`_
 """
 
-from .qwtdialog import TaurusPlotConfigDialog
-from .scales import *
-from .taurusplot import *
-from .taurustrend import *
-from .arrayedit import ArrayEditor
-from .taurusarrayedit import TaurusArrayEditor
-from .curvesAppearanceChooserDlg import CurveAppearanceProperties, CurvesAppearanceChooser
-from .curveprops import CurvePropertiesView
-from .monitor import TaurusMonitorTiny
-from .curveStatsDlg import CurveStatsDialog
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        ('qwtdialog', ['TaurusPlotConfigDialog']),
+        'scales',
+        'taurusplot',
+        'taurustrend',
+        ('arrayedit', ['ArrayEditor']),
+        ('taurusarrayedit', ['TaurusArrayEditor']),
+        ('curvesAppearanceChooserDlg', ['CurveAppearanceProperties',
+                                        'CurvesAppearanceChooser']),
+        ('curveprops', ['CurvePropertiesView']),
+        ('monitor', ['TaurusMonitorTiny']),
+        ('curveStatsDlg', ['CurveStatsDialog']),
+    ])
+else:
+    from .qwtdialog import TaurusPlotConfigDialog
+    from .scales import *
+    from .taurusplot import *
+    from .taurustrend import *
+    from .arrayedit import ArrayEditor
+    from .taurusarrayedit import TaurusArrayEditor
+    from .curvesAppearanceChooserDlg import CurveAppearanceProperties, CurvesAppearanceChooser
+    from .curveprops import CurvePropertiesView
+    from .monitor import TaurusMonitorTiny
+    from .curveStatsDlg import CurveStatsDialog
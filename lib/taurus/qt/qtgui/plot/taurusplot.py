@@ -43,6 +43,7 @@ from taurus.core.taurusbasetypes import DataFormat
 # TODO: Tango-centric
 from taurus.core.util.containers import LoopList, CaselessDict, CaselessList
 from taurus.core.util.safeeval import SafeEvaluator
+from taurus.core.util.decimation import MinMaxDecimator, lttbDecimate
 from taurus.qt.qtcore.util.signal import baseSignal
 from taurus.qt.qtcore.mimetypes import TAURUS_MODEL_LIST_MIME_TYPE, TAURUS_ATTR_MIME_TYPE
 from taurus.qt.qtgui.base import TaurusBaseComponent, TaurusBaseWidget
@@ -268,6 +269,12 @@ class TaurusCurve(Qwt5.QwtPlotCurve, TaurusBaseComponent):
         self.isRawData = not(rawData is None)
         self.droppedEventsCount = 0
         self.consecutiveDroppedEventsCount = 0
+        self._decimation = None
+        self._decimator = MinMaxDecimator()
+        self._incrementalDecimation = False
+        self._fullData = None
+        self._fullBoundingRect = None
+        self._fullExtrema = None
         if optimized:
             self.setPaintAttribute(self.PaintFiltered, True)
             self.setPaintAttribute(self.ClipPolygons, True)
@@ -810,9 +817,203 @@ class TaurusCurve(Qwt5.QwtPlotCurve, TaurusBaseComponent):
             self.warning(
                 "setData(x[%d],y[%d]): array sizes don't match!" % (len(x), len(y)))
 
-        # now proceed as usual
+        # now proceed as usual (the data passed to Qwt may be decimated)
+        self._setFullData(x, y)
+        if self._fullData is not None:
+            x, y = self._decimatedData()
         Qwt5.QwtPlotCurve.setData(self, x, y)
 
+    def _setFullData(self, x, y):
+        '''keeps the full-resolution data (and its bounding rectangle) if
+        decimation is enabled. The arrays are kept by reference (not copied),
+        so they must not be modified afterwards (e.g. the trends pass views
+        of their ArrayBuffers, which are not modified when they grow).
+
+        For incremental curves (see :meth:`setIncrementalDecimation`) the
+        bounding rectangle is updated with the points added after the
+        previous ones, instead of being recomputed for the whole data
+        (unless the points removed from the beginning included an extreme)
+        '''
+        if self._decimation is None or self.plot() is None:
+            self._fullData = self._fullBoundingRect = None
+            self._fullExtrema = None
+            return
+        x = numpy.asarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        self._fullData = x, y
+        extrema = None
+        if self._incrementalDecimation and self._fullExtrema is not None:
+            extrema = self._updateExtrema(self._fullExtrema, x, y)
+        if extrema is None:
+            extrema = self._getExtrema(x, y)
+        self._fullExtrema = extrema
+        xmin, xmax, ymin, ymax = extrema[2:6]
+        if xmin is None:
+            self._fullBoundingRect = Qt.QRectF(1.0, 1.0, -2.0, -2.0)
+        else:
+            self._fullBoundingRect = Qt.QRectF(xmin, ymin, xmax - xmin,
+                                               ymax - ymin)
+
+    @staticmethod
+    def _getExtrema(x, y):
+        '''returns a tuple of (first x, last x, xmin, xmax, ymin, ymax, x of
+        ymin, x of ymax) of the given data, the last 6 values being those of
+        the finite points (or None if there are none)'''
+        if len(x) == 0:
+            return (None,) * 8
+        finite = numpy.isfinite(x) * numpy.isfinite(y)
+        if not finite.all():
+            if not finite.any():
+                return (x[0], x[-1]) + (None,) * 6
+            x, y = x[finite], y[finite]
+        imin, imax = y.argmin(), y.argmax()
+        return (x[0], x[-1], x.min(), x.max(), y[imin], y[imax], x[imin],
+                x[imax])
+
+    def _updateExtrema(self, extrema, x, y):
+        '''returns the extrema (see :meth:`_getExtrema`) of the data of an
+        incremental curve given the ones of its previous data, or None if
+        they must be recomputed'''
+        x0, xlast, xmin, xmax, ymin, ymax, xAtYmin, xAtYmax = extrema
+        if x0 is None or xmin is None or not len(x) or x[0] < x0:
+            return None
+        if x[0] > x0:
+            # points were removed from the beginning: the extremes must still
+            # be there (and the first point must be finite)
+            if not (numpy.isfinite(x[0]) and numpy.isfinite(y[0])):
+                return None
+            if xAtYmin < x[0] or xAtYmax < x[0]:
+                return None
+            xmin = x[0]
+        # only the points after the previous last one are new
+        new = self._getExtrema(*[a[numpy.searchsorted(x, xlast, 'right'):]
+                                 for a in (x, y)])
+        if new[2] is not None:
+            xmin, xmax = min(xmin, new[2]), max(xmax, new[3])
+            if new[4] < ymin:
+                ymin, xAtYmin = new[4], new[6]
+            if new[5] > ymax:
+                ymax, xAtYmax = new[5], new[7]
+        return x[0], x[-1], xmin, xmax, ymin, ymax, xAtYmin, xAtYmax
+
+    def _decimatedData(self):
+        '''returns the full-resolution data decimated to the width (in pixels)
+        of the canvas and restricted to the current range of the x axis'''
+        x, y = self._fullData
+        plot = self.plot()
+        if plot.getAxisTransformationType(self.xAxis()) == Qwt5.QwtScaleTransformation.Log10:
+            return x, y
+        nbins = plot.canvas().contentsRect().width()
+        sdiv = plot.axisScaleDiv(self.xAxis())
+        xmin, xmax = sorted((sdiv.lowerBound(), sdiv.upperBound()))
+        if self._decimation == 'lttb':
+            return lttbDecimate(x, y, 2 * nbins, xmin=xmin, xmax=xmax)
+        return self._decimator.decimate(x, y, xmin, xmax, nbins,
+                                        appendOnly=self._incrementalDecimation)
+
+    def updateDecimation(self):
+        '''Recomputes the data passed to Qwt from the full-resolution data
+        (to be called when the x scale or the size of the canvas change). It
+        does nothing if decimation is disabled.
+
+        .. seealso:: :meth:`setDecimation`
+        '''
+        if self._decimation is None or self.plot() is None:
+            return
+        if self._fullData is None:  # the data was set while detached
+            self.setData(*self.getFullData())
+        else:
+            Qwt5.QwtPlotCurve.setData(self, *self._decimatedData())
+
+    def setDecimation(self, mode):
+        '''Sets the decimation applied to the data before it is drawn. When
+        enabled, only the points that fall within the range of the x axis are
+        drawn and, if they are more than twice the width of the canvas (in
+        pixels), they are reduced to that number. The full-resolution data is
+        still used for picking, statistics and exporting.
+
+        Note that no decimation is done if the x axis is logarithmic or if
+        the x values are not sorted.
+
+        :param mode: (str or None) 'minmax' for keeping the points with the
+                     minimum and maximum values for each pixel column, 'lttb'
+                     for using the Largest-Triangle-Three-Buckets algorithm or
+                     None for disabling the decimation
+
+        .. seealso:: :mod:`taurus.core.util.decimation`
+        '''
+        if mode not in (None, 'minmax', 'lttb'):
+            raise ValueError("Unsupported decimation mode '%s'" % mode)
+        if mode == self._decimation:
+            return
+        x, y = self.getFullData()
+        self._decimation = mode
+        self._decimator.reset()
+        self._fullExtrema = None
+        self.setData(x, y)
+
+    def getDecimation(self):
+        '''returns the decimation mode of this curve
+
+        :return: (str or None) 'minmax', 'lttb' or None
+
+        .. seealso:: :meth:`setDecimation`
+        '''
+        return self._decimation
+
+    def setIncrementalDecimation(self, enable):
+        '''Declares whether the data of this curve only changes by adding or
+        removing points at its ends (as in trends). If True, the min/max
+        decimation is updated incrementally instead of being recomputed for
+        the whole data.
+
+        :param enable: (bool)
+        '''
+        self._incrementalDecimation = enable
+        self._decimator.reset()
+        self._fullExtrema = None
+
+    def resetIncrementalDecimation(self):
+        '''Makes the next update of an incremental curve recompute its
+        decimation and bounds from the whole data. It must be called when the
+        data of the curve changed other than at its ends.
+
+        .. seealso:: :meth:`setIncrementalDecimation`
+        '''
+        self._decimator.reset()
+        self._fullExtrema = None
+
+    def isIncrementalDecimation(self):
+        '''returns whether the min/max decimation is updated incrementally
+
+        :return: (bool)
+
+        .. seealso:: :meth:`setIncrementalDecimation`
+        '''
+        return self._incrementalDecimation
+
+    def getFullData(self):
+        '''returns the full-resolution data of the curve (i.e., the data passed
+        to :meth:`setData`, even if a decimated version of it is drawn)
+
+        :return: (tuple<numpy.ndarray,numpy.ndarray>) x and y values
+        '''
+        if self._fullData is not None:
+            return self._fullData
+        data = self.data()
+        x = numpy.array([data.x(i) for i in xrange(data.size())])
+        y = numpy.array([data.y(i) for i in xrange(data.size())])
+        return x, y
+
+    def boundingRect(self):
+        '''Reimplemented from Qwt5.QwtPlotCurve.boundingRect to return the
+        bounding rectangle of the full-resolution data when it is decimated
+        (so that the autoscale is not affected by the decimation)
+        '''
+        if self._fullBoundingRect is not None:
+            return Qt.QRectF(self._fullBoundingRect)
+        return Qwt5.QwtPlotCurve.boundingRect(self)
+
     def safeSetData(self):
         '''Calls setData with x= self._xValues and y=self._yValues
 
@@ -896,14 +1097,14 @@ class TaurusCurve(Qwt5.QwtPlotCurve, TaurusBaseComponent):
         :return: (dict) A dict containing the stats.
         '''
 
-        data = self.data()
+        x, y = self.getFullData()
         if imin is None:
             imin = 0
         if imax is None:
-            imax = data.size()
+            imax = x.size
 
-        x = numpy.array([data.x(i) for i in xrange(imin, imax)])
-        y = numpy.array([data.y(i) for i in xrange(imin, imax)])
+        x = numpy.array(x[imin:imax])
+        y = numpy.array(y[imin:imax])
 
         if limits is not None:
             xmin, xmax = limits
@@ -1143,6 +1344,14 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
         # optimization
         self._optimizationEnabled = True
 
+        # decimation (updated on zoom and pan)
+        from taurus import tauruscustomsettings
+        self._decimation = getattr(tauruscustomsettings, 'PLOT_DECIMATION',
+                                   None)
+        for axis in (self.xBottom, self.xTop):
+            self.axisWidget(axis).scaleDivChanged.connect(
+                self.updateDecimation)
+
         # modifiable by user
         self.setModifiableByUser(True)
 
@@ -1855,6 +2064,7 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
             # curve.fireEvent = lambda arg:None  #!!! reimplementing FireEvent
             # on the fly! (ugly-lazy hack)
             curve.attach(self)
+            curve.setDecimation(self._decimation)
             if self._showMaxPeaks:
                 curve.attachMaxMarker(self)
             if self._showMinPeaks:
@@ -1922,16 +2132,14 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
         self.curves_lock.acquire()
         try:
             if self.curves.has_key(curvename):
-                data = self.curves[curvename].data()
-                x = [data.x(i) for i in xrange(data.size())]
-                y = [data.y(i) for i in xrange(data.size())]
+                x, y = self.curves[curvename].getFullData()
             else:
                 self.error("Curve '%s' not found" % curvename)
                 raise KeyError()
         finally:
             self.curves_lock.release()
-        if numpy:
-            x, y = numpy.array(x), numpy.array(y)
+        if not numpy:
+            x, y = x.tolist(), y.tolist()
         return x, y
 
     def updateCurves(self, names):
@@ -1975,6 +2183,7 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
                     curve = TaurusCurve(name, xname, self,
                                         optimized=self.isOptimizationEnabled())
                     curve.attach(self)
+                    curve.setDecimation(self._decimation)
                     self.curves[name] = curve
                     self.showCurve(curve, True)
 
@@ -2955,17 +3164,26 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
                     self.error("Curve '%s' not found" % name)
                 if not curve.isVisible():
                     continue
-                data = curve.data()
-                for i in xrange(data.size()):
-                    point = Qt.QPoint(self.transform(curve.xAxis(), data.x(
-                        i)), self.transform(curve.yAxis(), data.y(i)))
+                # use the full-resolution data, but only transform the
+                # points that may be within the scope
+                x, y = curve.getFullData()
+                r = scopeRect.adjusted(-1, -1, 1, 1)
+                xlim = sorted([self.invTransform(curve.xAxis(), p)
+                               for p in (r.left(), r.right())])
+                ylim = sorted([self.invTransform(curve.yAxis(), p)
+                               for p in (r.top(), r.bottom())])
+                candidates = numpy.flatnonzero((x >= xlim[0]) * (x <= xlim[1]) *
+                                               (y >= ylim[0]) * (y <= ylim[1]))
+                for i in candidates:
+                    point = Qt.QPoint(self.transform(curve.xAxis(), x[i]),
+                                      self.transform(curve.yAxis(), y[i]))
                     if scopeRect.contains(point):
                         dist = (pos - point).manhattanLength()
                         if dist < mindist:
                             mindist = dist
-                            picked = Qt.QPointF(data.x(i), data.y(i))
+                            picked = Qt.QPointF(x[i], y[i])
                             pickedCurveName = name
-                            pickedIndex = i
+                            pickedIndex = int(i)
                             pickedAxes = curve.xAxis(), curve.yAxis()
         finally:
             self.curves_lock.release()
@@ -3606,6 +3824,61 @@ class TaurusPlot(Qwt5.QwtPlot, TaurusBaseWidget):
         '''
         self.setOptimizationEnabled(True)
 
+    @Qt.pyqtSlot('QString')
+    def setDecimation(self, mode):
+        '''Sets the decimation mode of all the curves (including the ones
+        added later). See :meth:`TaurusCurve.setDecimation`
+
+        :param mode: (str or None) 'minmax', 'lttb' or None (or an empty
+                     string) for disabling the decimation
+        '''
+        mode = str(mode) if mode else None
+        if mode not in (None, 'minmax', 'lttb'):
+            raise ValueError("Unsupported decimation mode '%s'" % mode)
+        # set the mode for use with new curves
+        self._decimation = mode
+        self.curves_lock.acquire()
+        try:
+            for curve in self.curves.itervalues():
+                curve.setDecimation(mode)
+        finally:
+            self.curves_lock.release()
+        self.replot()
+
+    def getDecimation(self):
+        '''returns the decimation mode used for the curves of this plot
+
+        :return: (str or None) 'minmax', 'lttb' or None
+        '''
+        return self._decimation
+
+    @Qt.pyqtSlot()
+    def resetDecimation(self):
+        '''Sets the decimation mode to the default one (as given by the
+        PLOT_DECIMATION option of tauruscustomsettings)
+        '''
+        from taurus import tauruscustomsettings
+        self.setDecimation(getattr(tauruscustomsettings, 'PLOT_DECIMATION',
+                                   None))
+
+    @Qt.pyqtSlot()
+    def updateDecimation(self):
+        '''Recomputes the decimated data of the curves. It is called when the
+        range of the x axis or the size of the canvas change.
+        '''
+        self.curves_lock.acquire()
+        try:
+            for curve in self.curves.itervalues():
+                curve.updateDecimation()
+        finally:
+            self.curves_lock.release()
+
+    def resizeEvent(self, event):
+        '''reimplemented from :meth:`Qwt5.QwtPlot.resizeEvent` to adapt the
+        decimation of the curves to the new width of the canvas'''
+        Qwt5.QwtPlot.resizeEvent(self, event)
+        self.updateDecimation()
+
     @classmethod
     def getQtDesignerPluginInfo(cls):
         """Returns pertinent information in order to be able to build a valid
@@ -29,7 +29,9 @@ taurustrend.py: Generic trend widget for Taurus
 __all__ = ["ScanTrendsSet", "TaurusTrend", "TaurusTrendsSet"]
 
 from datetime import datetime
+import os
 import time
+import tempfile
 import numpy
 import re
 import gc
@@ -37,10 +39,16 @@ from taurus.external.qt import Qt, Qwt5
 
 import taurus.core
 from taurus.core.util.containers import CaselessDict, CaselessList, ArrayBuffer
+from taurus.core.util.log import deprecation_decorator
+from taurus.core.util.diskhistory import DiskHistory
+from taurus.core.util.decimation import minMaxIndices
+from taurus.core.util.backfill import getDefaultBackfillService
 from taurus.qt.qtgui.base import TaurusBaseComponent
 from taurus.qt.qtgui.plot import TaurusPlot
 
 
+@deprecation_decorator(rel='>4.0.1',
+                       alt='taurus.core.util.backfill.PyTangoArchivingReader')
 def getArchivedTrendValues(*args, **kwargs):
     try:
         import PyTangoArchiving
@@ -84,6 +92,18 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
     not aware of events by itself, but it relies on the TaurusTrendSet object to
     update its values)
 
+    If the parent trend uses a disk history (see
+    :meth:`TaurusTrend.setUseDiskHistory`), the oldest points are moved from the
+    history buffers to a :class:`DiskHistory` instead of being discarded, and
+    the ones within the range of the x axis are read back (decimated to the
+    width of the canvas) and plotted before the buffered ones.
+
+    Similarly, if the parent trend uses archiving (see
+    :meth:`TaurusTrend.setUseArchiving`), the archived data within the range of
+    the x axis which is older than the stored history is requested to the
+    :class:`BackfillService` of the trend. The request does not block: the
+    curves are updated when the data arrives.
+
     """
     consecutiveDroppedEventsWarning = 3  # number consecutive of dropped events before issuing a warning (-1 for disabling)
     # absolute number of dropped events before issuing a warning (-1 for
@@ -91,12 +111,20 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
     droppedEventsWarning = -1
 
     dataChanged = Qt.pyqtSignal('QString')
+    archivedDataReady = Qt.pyqtSignal()
 
     def __init__(self, name, parent=None, curves=None):
         Qt.QObject.__init__(self, parent)
         self.call__init__(TaurusBaseComponent, self.__class__.__name__)
+        # emitted from the backfill thread, so the connection is queued
+        self.archivedDataReady.connect(self._onArchivedDataReady)
         self._xBuffer = None
         self._yBuffer = None
+        self._diskHistory = None
+        self._diskHistoryFailed = False
+        self._historyKey = None
+        self._historyPrefix = None
+        self._historyPrefixMin = None
         self.forcedReadingTimer = None
         self.droppedEventsCount = 0
         self.consecutiveDroppedEventsCount = 0
@@ -323,7 +351,13 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
         if self._yBuffer is None:
             self._yBuffer = ArrayBuffer(numpy.zeros(
                 (min(128, self._maxBufferSize), ntrends), dtype='d'), maxSize=self._maxBufferSize)
+        if self._diskHistory is None and not self._diskHistoryFailed and \
+                self.parent().getUseDiskHistory():
+            self._diskHistory = self._createDiskHistory(ntrends)
         if value is not None:
+            if self._diskHistory is not None and self._xBuffer.isFull():
+                # move the oldest points to disk in blocks
+                self._spillHistory(max(self._maxBufferSize // 4, 1))
             try:
                 self._yBuffer.append(value.rvalue.magnitude)
             except Exception, e:
@@ -335,24 +369,260 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
             # add the timestamp to the x buffer
             if value is not None:
                 self._xBuffer.append(value.time.totime())
-            # Adding archiving values
+            # Request (without blocking) the archived values
             if self.parent().getUseArchiving():
-                # open a mysql connection for online trends or any not
-                # autoscaled plots
-                if self.parent().getXDynScale() or not self.parent().axisAutoScale(Qwt5.QwtPlot.xBottom):
-                    try:
-                        getArchivedTrendValues(self, model, insert=True)
-                    except Exception, e:
-                        import traceback
-                        self.warning('%s: reading from archiving failed: %s' % (
-                            datetime.now().isoformat('_'), traceback.format_exc()))
+                self.requestArchivedData()
         elif value is not None:
             # add the event number to the x buffer
             try:
                 self._xBuffer.append(1. + self._xBuffer[-1])
             except IndexError:  # this will happen when the x buffer is empty
                 self._xBuffer.append(0)
-        return self._xBuffer.contents(), self._yBuffer.contents()
+        return self._historyData()
+
+    def _createDiskHistory(self, ncols):
+        '''creates a :class:`DiskHistory` for this trend set in a new
+        directory (under the TREND_DISK_HISTORY_DIR directory of
+        tauruscustomsettings or under the temporary directory of the system)
+
+        :param ncols: (int) number of trends of the set
+
+        :return: (DiskHistory or None) None if it could not be created
+        '''
+        from taurus import tauruscustomsettings
+        basedir = getattr(tauruscustomsettings, 'TREND_DISK_HISTORY_DIR',
+                          None) or tempfile.gettempdir()
+        try:
+            if not os.path.isdir(basedir):
+                os.makedirs(basedir)
+            directory = tempfile.mkdtemp(prefix='taurustrend_', dir=basedir)
+            maxSize, maxAge = self.parent().getDiskHistoryRetention()
+            return DiskHistory(directory, ncols=ncols, maxSize=maxSize,
+                               maxAge=maxAge)
+        except Exception, e:
+            self.warning('Cannot create the disk history in %s: %s',
+                         basedir, e)
+            self._diskHistoryFailed = True
+            return None
+
+    def _closeDiskHistory(self):
+        '''removes the disk history of this trend set (if any)'''
+        if self._diskHistory is not None:
+            self._diskHistory.close()
+        self._diskHistory = None
+        self._diskHistoryFailed = False
+        self._historyKey = None
+        self._historyPrefix = None
+        self._historyPrefixMin = None
+
+    def getDiskHistory(self):
+        '''returns the disk history of this trend set
+
+        :return: (DiskHistory or None)
+        '''
+        return self._diskHistory
+
+    def _spillHistory(self, n):
+        '''moves the n oldest points of the history buffers to the disk
+        history
+
+        :param n: (int) number of points to move
+        '''
+        n = min(n, len(self._xBuffer), len(self._yBuffer))
+        if n <= 0:
+            return
+        try:
+            self._diskHistory.append(self._xBuffer[:n], self._yBuffer[:n])
+        except Exception, e:
+            self.warning('Problem writing the disk history: %s', e)
+        self._xBuffer.moveLeft(n)
+        self._yBuffer.moveLeft(n)
+
+    def _getBackfillService(self):
+        '''returns the backfill service of the parent trend if it uses
+        archiving (or None otherwise)'''
+        plot = self.parent()
+        if plot.getXIsTime() and plot.getUseArchiving():
+            return plot.getBackfillService()
+        return None
+
+    def _historyStart(self):
+        '''returns the x value of the oldest point stored in the history
+        buffers or in the disk history (or None if there are none)'''
+        history = self._diskHistory
+        if history is not None and len(history):
+            return history.xRange()[0]
+        if self._xBuffer is not None and len(self._xBuffer):
+            return self._xBuffer[0]
+        return None
+
+    def requestArchivedData(self):
+        '''Requests (without blocking) the archived data within the range of
+        the x axis which is older than the stored history. The curves are
+        updated when the data arrives.
+
+        Nothing is requested if the x axis is autoscaled (unless the trend
+        uses a dynamic scale), since it would not show older data.
+
+        The end of the requested range is rounded up to the bins of the
+        width of a pixel, so that the oldest point of the history moving
+        forward (e.g. when the buffers are full and there is no disk
+        history) only results in a new request once per bin.
+        '''
+        service = self._getBackfillService()
+        plot = self.parent()
+        if service is None or not (plot.getXDynScale() or
+                                   not plot.axisAutoScale(Qwt5.QwtPlot.xBottom)):
+            return
+        sdiv = plot.axisScaleDiv(Qwt5.QwtPlot.xBottom)
+        xmin, xmax = sorted((sdiv.lowerBound(), sdiv.upperBound()))
+        start = self._historyStart()
+        if start is not None and start < xmax:
+            width = plot.canvas().width()
+            if width > 0 and xmax > xmin:
+                binWidth = float(xmax - xmin) / width
+                start = numpy.ceil(start / binWidth) * binWidth
+            xmax = min(xmax, start)
+        if xmin < xmax:
+            service.request(self.getModelName(), xmin, xmax,
+                            callback=self._onArchivedDataFetched)
+
+    def _onArchivedDataFetched(self, model, tmin, tmax):
+        '''called from the backfill thread when archived data is available'''
+        try:
+            self.archivedDataReady.emit()
+        except RuntimeError:  # the trend set has been deleted
+            pass
+
+    def _onArchivedDataReady(self):
+        '''updates the curves with the archived data that has just arrived'''
+        plot = self.parent()
+        plot.curves_lock.acquire()
+        try:
+            changed = self.refreshHistory()
+        finally:
+            plot.curves_lock.release()
+        if changed:
+            plot.replot()
+
+    def _historyData(self):
+        '''returns the contents of the history buffers preceded by the points
+        within the range of the x axis of the disk history and of the archived
+        data cached by the backfill service (if any), decimated in bins of
+        the width of a pixel of the canvas (aligned to multiples of it).
+
+        These points are kept until their sources or the scale (i.e. the bin
+        width) change, or the range moves by more than one bin. When the
+        range just moves forward (e.g. with a dynamic scale) the points that
+        went out of it are dropped, without reading the sources again.
+
+        :return: (tuple<numpy.ndarray, numpy.ndarray>) X and Y data (see
+                 :meth:`_updateHistory`)
+        '''
+        x, y = self._xBuffer.contents(), self._yBuffer.contents()
+        history = self._diskHistory
+        if history is not None and len(history) == 0:
+            history = None
+        service = self._getBackfillService()
+        if history is None and service is None:
+            self._dropHistoryPrefix()
+            return x, y
+        plot = self.parent()
+        sdiv = plot.axisScaleDiv(Qwt5.QwtPlot.xBottom)
+        xmin, xmax = sorted((sdiv.lowerBound(), sdiv.upperBound()))
+        if len(x) and xmin >= x[0]:  # the buffers cover the whole range
+            self._dropHistoryPrefix()
+            return x, y
+        width = plot.canvas().width()
+        binWidth = None
+        if width > 0 and xmax > xmin:
+            binWidth = float(xmax - xmin) / width
+            key = self._historyKey
+            if key is not None and key[0] is not None and \
+                    abs(binWidth - key[0]) <= 1e-9 * key[0]:
+                binWidth = key[0]  # (ignore rounding errors of the scale)
+            # extend the range to whole bins
+            xmin = numpy.floor(xmin / binWidth) * binWidth
+            xmax = numpy.ceil(xmax / binWidth) * binWidth
+        if len(x):
+            xmax = min(xmax, x[0])
+        key = (binWidth, xmax,
+               history is not None and history.getVersion(),
+               service is not None and service.getVersion())
+        if key == self._historyKey and xmin >= self._historyPrefixMin:
+            if xmin > self._historyPrefixMin:
+                # drop the points that went out of the range (but the
+                # closest one)
+                hx, hy = self._historyPrefix
+                n = max(numpy.searchsorted(hx, xmin, 'left') - 1, 0)
+                self._historyPrefix = hx[n:], hy[n:]
+                self._historyPrefixMin = xmin
+        else:
+            xs, ys = [], []
+            xlast = xmax
+            if history is not None:
+                hx, hy = history.getRange(xmin, xmax, binWidth=binWidth)
+                xs.append(hx)
+                ys.append(hy)
+                xlast = min(xlast, history.xRange()[0])
+            if service is not None and xmin < xlast:
+                ax, ay = service.getData(self.getModelName(), xmin, xlast)
+                # (the point at xlast, if any, is already in the history)
+                n = numpy.searchsorted(ax, xlast, 'left')
+                ax, ay = ax[:n], numpy.reshape(ay[:n], (n, -1))
+                if n and ay.shape[1] != y.shape[1]:
+                    self.debug('Ignoring archived data of a different shape')
+                elif n:
+                    if binWidth is not None and n > 2 * width:
+                        sel = minMaxIndices(ax, ay, binWidth)
+                        ax, ay = ax[sel], ay[sel]
+                    xs.insert(0, ax)
+                    ys.insert(0, ay)
+            if xs:
+                self._historyPrefix = numpy.concatenate(xs), \
+                    numpy.concatenate(ys)
+            else:
+                self._historyPrefix = numpy.zeros(0), \
+                    numpy.zeros((0, y.shape[1]))
+            self._historyKey = key
+            self._historyPrefixMin = xmin
+            # the points before the buffers changed
+            self._resetCurvesDecimation()
+        hx, hy = self._historyPrefix
+        return numpy.concatenate((hx, x)), numpy.concatenate((hy, y))
+
+    def _dropHistoryPrefix(self):
+        '''forgets the points that precede the history buffers (see
+        :meth:`_historyData`)'''
+        if self._historyKey is not None:
+            self._historyKey = None
+            self._resetCurvesDecimation()
+
+    def _resetCurvesDecimation(self):
+        '''makes the incremental decimation of the curves start again (to be
+        called when their data changes other than at its ends)'''
+        for n, c in self.getCurves():
+            c.resetIncrementalDecimation()
+
+    def refreshHistory(self):
+        '''Updates the curves with the points of the disk history and of the
+        archived data within the current range of the x axis. It is called
+        when the range changes (e.g. when zooming or panning) and when
+        archived data arrives.
+
+        :return: (bool) True if the data of the curves changed
+        '''
+        if self._xBuffer is None:
+            return False
+        key, prefix = self._historyKey, self._historyPrefix
+        x, y = self._historyData()
+        if key == self._historyKey and prefix is self._historyPrefix:
+            return False
+        self._xValues, self._yValues = x, y
+        for i, (n, c) in enumerate(self.getCurves()):
+            c._xValues, c._yValues = x, y[:, i]
+            c.setData(c._xValues, c._yValues)
+        return True
 
     def clearTrends(self, replot=True):
         '''clears all stored data (buffers and copies of the curves data)
@@ -367,6 +637,7 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
         # clean history Buffers
         self._xBuffer = None
         self._yBuffer = None
+        self._closeDiskHistory()
         # clean x,ydata
         self._xValues = None
         self._yValues = None
@@ -455,8 +726,10 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
             rawdata = {'x': numpy.zeros(0), 'y': numpy.zeros(0)}
             for i in xrange(ntrends):
                 subname = "%s[%i]" % (name, i)
-                self.parent().attachRawData(rawdata, id=subname)
-                self.addCurve(subname, self.parent().curves[subname])
+                curve = self.parent().attachRawData(rawdata, id=subname)
+                # trend data only changes at its ends
+                curve.setIncrementalDecimation(True)
+                self.addCurve(subname, curve)
             self.setTitleText(
                 self._titleText or self.parent().getDefaultCurvesTitle())
             self.parent().autoShowYAxes()
@@ -509,6 +782,9 @@ class TaurusTrendsSet(Qt.QObject, TaurusBaseComponent):
 
         :param maxSize: (int) the maximum limit
         '''
+        if self._diskHistory is not None and self._xBuffer is not None:
+            # move the points that do not fit to disk
+            self._spillHistory(len(self._xBuffer) - maxSize)
         if self._xBuffer is not None:
             self._xBuffer.setMaxSize(maxSize)
         if self._yBuffer is not None:
@@ -759,6 +1035,7 @@ class ScanTrendsSet(TaurusTrendsSet):
                     prop.lWidth = 1
                     prop.lStyle = Qt.Qt.DotLine
                     curve.setAppearanceProperties(prop)
+                    curve.setIncrementalDecimation(True)
                     self.addCurve(name, curve)
         self.parent().autoShowYAxes()
         self.dataChanged.emit(Qt.QString(self.getModel()))
@@ -891,7 +1168,16 @@ class TaurusTrend(TaurusPlot):
         self._supportedConfigVersions = ["ttc-1"]
         self._xDynScaleSupported = True
         self._useArchiving = False
+        self._backfillService = None
         self._usePollingBuffer = False
+        from taurus import tauruscustomsettings
+        self._useDiskHistory = getattr(tauruscustomsettings,
+                                       'TREND_DISK_HISTORY', False)
+        self._diskHistoryRetention = (
+            getattr(tauruscustomsettings, 'TREND_DISK_HISTORY_MAX_SIZE', None),
+            getattr(tauruscustomsettings, 'TREND_DISK_HISTORY_MAX_AGE', None))
+        self.axisWidget(self.xBottom).scaleDivChanged.connect(
+            self._onXScaleDivChanged)
         self.setDefaultCurvesTitle('<label><[trend_index]>')
         self._maxDataBufferSize = self.DEFAULT_MAX_BUFFER_SIZE
         self.__qdoorname = None
@@ -1557,7 +1843,9 @@ class TaurusTrend(TaurusPlot):
 
     def setUseArchiving(self, enable):
         '''enables/disables looking up in the archiver for data stored before
-        the Trend was started
+        the Trend was started. The archived data is retrieved without blocking
+        the GUI (see :meth:`setBackfillService`) and added to the curves when
+        it arrives.
 
         :param enable: (bool) if True, archiving values will be used if available
         '''
@@ -1578,37 +1866,136 @@ class TaurusTrend(TaurusPlot):
         '''Same as setUseArchiving(True)'''
         self.setUseArchiving(True)
 
+    def setUseDiskHistory(self, enable):
+        '''enables/disables keeping the points discarded from the buffers (see
+        :meth:`setMaxDataBufferSize`) in a disk history, from which the ones
+        within the range of the x axis are read back when needed. This allows
+        to scroll back through long histories with a bounded memory usage.
+        Disabling it removes the existing disk histories.
+
+        :param enable: (bool)
+
+        .. seealso:: :meth:`setDiskHistoryRetention`,
+                     :class:`taurus.core.util.diskhistory.DiskHistory`
+        '''
+        self._useDiskHistory = enable
+        if not enable:
+            self.curves_lock.acquire()
+            try:
+                for ts in self.trendSets.itervalues():
+                    ts._closeDiskHistory()
+                    ts.refreshHistory()
+            finally:
+                self.curves_lock.release()
+            self.replot()
+
+    def getUseDiskHistory(self):
+        '''whether TaurusTrend keeps the discarded points in a disk history
+
+        :return: (bool)
+
+        .. seealso:: :meth:`setUseDiskHistory`
+        '''
+        return self._useDiskHistory
+
+    def resetUseDiskHistory(self):
+        '''Sets the default value (the TREND_DISK_HISTORY option of
+        tauruscustomsettings) for :meth:`setUseDiskHistory`'''
+        from taurus import tauruscustomsettings
+        self.setUseDiskHistory(getattr(tauruscustomsettings,
+                                       'TREND_DISK_HISTORY', False))
+
+    def setDiskHistoryRetention(self, maxSize=None, maxAge=None):
+        '''Limits the disk history of each trend set. The oldest data is
+        removed when any of the limits is exceeded.
+
+        :param maxSize: (int or None) maximum size (in bytes). None for no limit
+        :param maxAge: (float or None) maximum age (in seconds if the x axis
+                       is in time mode, in events otherwise). None for no
+                       limit
+
+        .. seealso:: :meth:`setUseDiskHistory`
+        '''
+        self._diskHistoryRetention = maxSize, maxAge
+        self.curves_lock.acquire()
+        try:
+            for ts in self.trendSets.itervalues():
+                history = ts.getDiskHistory()
+                if history is not None:
+                    history.setRetention(maxSize=maxSize, maxAge=maxAge)
+        finally:
+            self.curves_lock.release()
+
+    def getDiskHistoryRetention(self):
+        '''returns the limits of the disk histories
+
+        :return: (tuple<int,float>) maximum size (in bytes) and maximum age
+
+        .. seealso:: :meth:`setDiskHistoryRetention`
+        '''
+        return self._diskHistoryRetention
+
+    def setBackfillService(self, service):
+        '''sets the service used for retrieving (asynchronously) the archived
+        data when archiving is used (see :meth:`setUseArchiving`)
+
+        :param service: (BackfillService or None) the service. If None is
+                        passed, the default one is used
+
+        .. seealso:: :class:`taurus.core.util.backfill.BackfillService`
+        '''
+        self._backfillService = service
+        self._onXScaleDivChanged()
+
+    def getBackfillService(self):
+        '''returns the service used for retrieving the archived data
+
+        :return: (BackfillService)
+
+        .. seealso:: :meth:`setBackfillService`
+        '''
+        if self._backfillService is None:
+            return getDefaultBackfillService()
+        return self._backfillService
+
+    def _onXScaleDivChanged(self):
+        '''reads the disk histories and requests the archived data for the new
+        range of the x axis'''
+        useArchiving = self.getUseArchiving() and self.getXIsTime()
+        if not (self._useDiskHistory or useArchiving):
+            return
+        self.curves_lock.acquire()
+        try:
+            for ts in self.trendSets.itervalues():
+                if useArchiving:
+                    ts.requestArchivedData()
+                ts.refreshHistory()
+        finally:
+            self.curves_lock.release()
+
     def _onUseArchivingAction(self, enable):
         '''slot being called when toggling the useArchiving action
 
         .. seealso:: :meth:`setUseArchiving`
         '''
-        if enable:
-            self._archivingWarningThresshold = self._startingTime - \
-                600  # 10 min before the widget was created
-            self.axisWidget(self.xBottom).scaleDivChanged.connect(self._scaleChangeWarning)
-        else:
-            self.axisWidget(self.xBottom).scaleDivChanged.disconnect(self._scaleChangeWarning)
-            self._archivingWarningThresshold = None
         self._useArchiving = enable
+        self.curves_lock.acquire()
+        try:
+            for ts in self.trendSets.itervalues():
+                if enable:
+                    ts.requestArchivedData()
+                ts.refreshHistory()
+        finally:
+            self.curves_lock.release()
         self.replot()
 
-    def _scaleChangeWarning(self):
-        '''slot that may be called when the x axis changes the scale'''
-        sdiv = self.axisScaleDiv(self.xBottom)
-        smin = sdiv.lowerBound()
-        if smin < self._archivingWarningThresshold:
-            self.showArchivingWarning()
-            # lower the thresshold by twice the current range
-            self._archivingWarningThresshold = smin - 2 * sdiv.range()
-
+    @deprecation_decorator(rel='>4.0.1')
     def showArchivingWarning(self):
         '''shows a dialog warning of the potential isuues with
-        archiving performance. It offers the user to disable archiving retrieval'''
-        # stop the scale change notification temporally (to avoid duplicate
-        # warnings)
-        self.setUseArchiving(False)
-        self.axisWidget(self.xBottom).scaleDivChanged.disconnect(self._scaleChangeWarning)
+        archiving performance. It offers the user to disable archiving retrieval
+
+        Note that it is no longer shown when rescaling, since the archived
+        data is now retrieved without blocking the GUI'''
         # show a dialog
         dlg = Qt.QDialog(self)
         dlg.setModal(True)
@@ -1618,7 +2005,6 @@ class TaurusTrend(TaurusPlot):
               'Rescaling to previous date/times may cause performance loss.\n' +\
               '\nDisable archiving retrieval?\n'
         dlg.layout().addWidget(Qt.QLabel(msg))
-        rememberCB = Qt.QCheckBox('Do not ask again')
         buttonbox = Qt.QDialogButtonBox()
         buttonbox.addButton(Qt.QPushButton(
             '&Keep enabled'), buttonbox.RejectRole)
@@ -1626,17 +2012,12 @@ class TaurusTrend(TaurusPlot):
         dlg.layout().addWidget(buttonbox)
         buttonbox.accepted.connect(dlg.accept)
         buttonbox.rejected.connect(dlg.reject)
-        dlg.layout().addWidget(rememberCB)
         dlg.exec_()
         # disable archiving if the user said so
         if dlg.result() == dlg.Accepted:
             self.setUseArchiving(False)
-        # restore the scale change notification only if the user chose to keep
-        # archiving AND did not want to disable warnings
         else:
             self.setUseArchiving(True)
-            if not rememberCB.isChecked():
-                self.axisWidget(self.xBottom).scaleDivChanged.connect(self._scaleChangeWarning)
 
     def setMaxDataBufferSize(self, maxSize=None):
         '''sets the maximum number of events that can be plotted in the trends
@@ -1870,6 +2251,9 @@ def main():
                       help="force Taurustrend to re-read the attributes every MILLISECONDS ms")
     parser.add_option("-a", "--use-archiving",
                       action="store_true", dest="use_archiving", default=False)
+    parser.add_option("--disk-history", action="store_true",
+                      dest="disk_history", default=False,
+                      help="keep the values discarded from the buffers on disk")
     parser.add_option("--window-name", dest="window_name",
                       default="TaurusTrend", help="Name of the window")
 
@@ -1891,6 +2275,9 @@ def main():
     w.setXIsTime(options.x_axis_mode.lower() == 't')
     # max buffer size option
     w.setMaxDataBufferSize(int(options.max_buffer_size))
+    # disk history option
+    if options.disk_history:
+        w.setUseDiskHistory(True)
     # configuration file option
     if options.config_file is not None:
         w.loadConfig(options.config_file)
@@ -27,11 +27,27 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qtable import *
-from .qlogtable import *
-from .taurustable import *
-from .taurusdbtable import *
-from .taurusvaluestable import *
-from .taurusdevicepropertytable import *
-from .taurusgrid import *
-from .qdictionary import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'qtable',
+        'qlogtable',
+        'taurustable',
+        'taurusdbtable',
+        'taurusvaluestable',
+        'taurusdevicepropertytable',
+        'taurusgrid',
+        'qdictionary',
+    ])
+else:
+    from .qtable import *
+    from .qlogtable import *
+    from .taurustable import *
+    from .taurusdbtable import *
+    from .taurusvaluestable import *
+    from .taurusdevicepropertytable import *
+    from .taurusgrid import *
+    from .qdictionary import *
@@ -49,6 +49,7 @@ import taurus
 from taurus.qt.qtcore.util.emitter import modelSetter, TaurusEmitterThread, SingletonWorker, MethodModel
 from taurus.core.taurusmanager import TaurusManager
 from taurus.core.util.log import Logger
+from taurus.core.taurushelper import addListeners, removeListeners
 from taurus.qt.qtgui.base import TaurusBaseWidget
 from taurus.qt.qtgui.panel import TaurusValue
 
@@ -436,7 +437,18 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
                 if devsInRows:
                     self.setRowLabels(
                         ','.join(set(d.rsplit('/', 1)[0] for d in self._modelNames)))
+                # the prefetch runs as the first job of the models queue, so
+                # that it does not block the (possibly delayed) loading. The
+                # queue then keeps the prefetched attributes alive until the
+                # models of the widgets (queued in between) have been set
+                prefetched = []
+                self.modelsQueue.put(
+                    (MethodModel(partial(self._prefetchAttributes,
+                                         list(self._modelNames))),
+                     prefetched))
                 self.create_widgets_table(self._modelNames)
+                self.modelsQueue.put(
+                    (MethodModel(self._releasePrefetched), prefetched))
                 self.modelsQueue.put(
                     (MethodModel(self.showRowFrame), self._show_row_frame))
                 self.modelsQueue.put(
@@ -469,6 +481,38 @@ class TaurusGrid(QtGui.QFrame, TaurusBaseWidget):
             self.updateStyle()
         return
 
+    def _prefetchAttributes(self, models, attrs):
+        '''creates all the attribute models at once (see
+        :func:`taurus.Attributes`) and subscribes concurrently to their events
+        (see :func:`taurus.core.taurushelper.addListeners`) instead of letting
+        each cell widget do it on its own.
+
+        :param models: (seq<str>) attribute names
+        :param attrs: (list) list that is filled with the prefetched
+                      attributes, which must be kept until the models of the
+                      cell widgets are set and then passed to
+                      :meth:`_releasePrefetched`
+        '''
+        try:
+            prefetched = taurus.Attributes([m for m in models if m])
+            addListeners(prefetched, self._onPrefetchedEvent)
+        except Exception:
+            self.debug('Cannot prefetch the attribute models', exc_info=1)
+            return
+        attrs.extend(prefetched)
+
+    def _releasePrefetched(self, attrs):
+        '''undoes the subscriptions done by :meth:`_prefetchAttributes` (the
+        attributes keep those of the cell widgets)'''
+        try:
+            removeListeners(attrs, self._onPrefetchedEvent)
+        except Exception:
+            self.debug('Cannot release the prefetched models', exc_info=1)
+
+    def _onPrefetchedEvent(self, evt_src, evt_type, evt_value):
+        '''listener of the prefetched attributes (it ignores their events)'''
+        pass
+
     def getModel(self):
         return self._modelNames
 
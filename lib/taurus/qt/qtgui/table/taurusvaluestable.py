@@ -39,6 +39,7 @@ from taurus.qt.qtgui.util import PintValidator
 from taurus.qt.qtgui.display import TaurusLabel
 from taurus.qt.qtgui.container import TaurusWidget
 from taurus.core.util.enumeration import Enumeration
+from taurus.core.util.units import toUnits
 
 
 def _value2Quantity(value, units):
@@ -198,7 +199,7 @@ class TaurusValuesIOTableModel(Qt.QAbstractTableModel):
         rvalue = rvalue.reshape(rows, columns)
         if attr.type in [DataType.Integer, DataType.Float]:
             units = self._parent.getCurrentUnits()
-            rvalue = rvalue.to(units)
+            rvalue = toUnits(rvalue, units)
         self._rtabledata = rvalue
         self._editable = False
         self.dataChanged.emit(self.createIndex(0, 0), self.createIndex(rows - 1, columns - 1))
@@ -229,7 +230,7 @@ class TaurusValuesIOTableModel(Qt.QAbstractTableModel):
         if self._attr.getType() in [DataType.Float, DataType.Integer]:
             units = self._parent.getCurrentUnits()
             value = _value2Quantity(value, units)
-            equals = numpy.allclose(rtable_value, value.to(units))
+            equals = numpy.allclose(rtable_value, toUnits(value, units))
         else:
             equals = bool(rtable_value == value)
         if not equals:
@@ -342,7 +343,7 @@ class TaurusValuesIOTableModel(Qt.QAbstractTableModel):
                 wvalue = numpy.array(wvalue)
             elif self._attr.type in [DataType.Integer, DataType.Float]:
                 units = self._parent.getCurrentUnits()
-                wvalue = wvalue.to(units)
+                wvalue = toUnits(wvalue, units)
             if self._attr.data_format == DataFormat._1D:
                 rows, columns = numpy.shape(wvalue)[0], 1
                 if rows == 0:
@@ -52,11 +52,24 @@ prevail).
 
 __docformat__ = 'restructuredtext'
 
-import utils
-from paneldescriptionwizard import *
-from taurusgui import *
-from appsettingswizard import *
-try:
-    from macrolistener import *
-except ImportError:
-    pass  # allow for sardana not being installed
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    # (macrolistener requires sardana and it is only imported if a name not
+    # found in the other submodules is accessed)
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'paneldescriptionwizard',
+        'taurusgui',
+        'appsettingswizard',
+    ], optional=['macrolistener'])
+else:
+    import utils
+    from paneldescriptionwizard import *
+    from taurusgui import *
+    from appsettingswizard import *
+    try:
+        from macrolistener import *
+    except ImportError:
+        pass  # allow for sardana not being installed
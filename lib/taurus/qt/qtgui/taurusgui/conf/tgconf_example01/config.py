@@ -72,6 +72,14 @@ SYNOPTIC = ['images/example01.jdw', 'images/syn2.jdw']
 #=========================================================================
 INSTRUMENTS_FROM_POOL = False
 
+#=========================================================================
+# Set LAZY_PANELS to True for creating the widgets of the panels (and
+# setting their models) only when the panels are first shown. This speeds
+# up the startup of GUIs with many panels. If not set, the
+# TAURUSGUI_LAZY_PANELS option from tauruscustomsettings is used
+#=========================================================================
+LAZY_PANELS = False
+
 #=========================================================================
 # Define panels to be shown.
 # To define a panel, instantiate a PanelDescription object (see documentation
@@ -35,6 +35,7 @@ import sys
 import copy
 import weakref
 import inspect
+import functools
 
 from lxml import etree
 
@@ -132,10 +133,14 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
         self.setWindowTitle(name)
         self.setObjectName(name)
         self._custom = False
+        self._lazyWidget = None
+        self._lazyConfig = None
 
         # store a weakref of the main window
         self._mainwindow = weakref.proxy(mainwindow)
 
+        self.visibilityChanged.connect(self._onVisibilityChanged)
+
     def isCustom(self):
         return self._custom
 
@@ -148,6 +153,58 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
     def setPermanent(self, permanent):
         self._permanent = permanent
 
+    def setLazyWidget(self, factory, classname, modulename=None):
+        '''Sets a placeholder in the panel instead of its widget. The widget
+        is created (by calling `factory`) the first time that the panel
+        becomes visible.
+
+        :param factory: (callable) callable (without arguments) that returns
+                        the widget of the panel
+        :param classname: (str) class name of the widget to be created
+        :param modulename: (str) module name of the widget to be created
+        '''
+        self._lazyWidget = factory, classname, modulename
+        self._lazyConfig = None
+        self.setWidget(Qt.QWidget())
+        if self.isVisible():
+            self.createLazyWidget()
+
+    def hasLazyWidget(self):
+        '''Returns True if the widget of the panel is yet to be created
+
+        :return: (bool)
+        '''
+        return self._lazyWidget is not None
+
+    def createLazyWidget(self):
+        '''Creates the widget of the panel if it was set with
+        :meth:`setLazyWidget` and it has not been created yet. The widget
+        configuration applied to the panel in the meantime (e.g. by
+        loading a perspective) is then applied to the widget.
+        '''
+        if self._lazyWidget is None:
+            return
+        factory = self._lazyWidget[0]
+        configdict = self._lazyConfig
+        self._lazyWidget = self._lazyConfig = None
+        try:
+            w = factory()
+        except Exception, e:
+            self.error('Cannot create the widget of panel "%s": %s',
+                       self.objectName(), repr(e))
+            self.traceback(level=taurus.Info)
+            return
+        placeholder = self.widget()
+        self.setWidget(w)
+        if placeholder is not None:
+            placeholder.deleteLater()
+        if configdict is not None and isinstance(w, BaseConfigurableClass):
+            w.applyConfig(configdict)
+
+    def _onVisibilityChanged(self, visible):
+        if visible and self._lazyWidget is not None:
+            self.createLazyWidget()
+
     def setWidgetFromClassName(self, classname, modulename=None):
         if self.getWidgetClassName() != classname:
             try:
@@ -168,23 +225,34 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
             # set customwidgetmap if necessary
             if hasattr(w, 'setCustomWidgetMap'):
                 w.setCustomWidgetMap(self._mainwindow.getCustomWidgetMap())
+            self._lazyWidget = self._lazyConfig = None
             self.setWidget(w)
             wname = "%s-%s" % (str(self.objectName()), str(classname))
             w.setObjectName(wname)
 
     def getWidgetModuleName(self):
+        if self._lazyWidget is not None:
+            return self._lazyWidget[2] or ''
         w = self.widget()
         if w is None:
             return ''
         return w.__module__
 
     def getWidgetClassName(self):
+        if self._lazyWidget is not None:
+            return self._lazyWidget[1]
         w = self.widget()
         if w is None:
             return ''
         return w.__class__.__name__
 
     def applyConfig(self, configdict, depth=-1):
+        # if the widget is not created yet, keep its config for later
+        if (self._lazyWidget is not None and
+                configdict.get('widgetClassName') == self._lazyWidget[1]):
+            self._lazyConfig = configdict.get('widget')
+            TaurusBaseWidget.applyConfig(self, configdict, depth)
+            return
         # create the widget
         try:
             self.setWidgetFromClassName(configdict.get(
@@ -202,7 +270,10 @@ class DockWidgetPanel(Qt.QDockWidget, TaurusBaseWidget):
         configdict = TaurusBaseWidget.createConfig(self, *args, **kwargs)
         configdict['widgetClassName'] = self.getWidgetClassName()
         configdict['widgetModuleName'] = self.getWidgetModuleName()
-        if isinstance(self.widget(), BaseConfigurableClass):
+        if self._lazyWidget is not None:
+            if self._lazyConfig is not None:
+                configdict['widget'] = self._lazyConfig
+        elif isinstance(self.widget(), BaseConfigurableClass):
             configdict['widget'] = self.widget().createConfig()
         return configdict
 
@@ -912,6 +983,20 @@ class TaurusGui(TaurusMainWindow):
                if len(instrument.model) > 0]
         return ret
 
+    def _createPanelWidget(self, paneldesc):
+        '''Creates the widget of a panel and sets its model
+
+        :param paneldesc: (PanelDescription) description of the panel
+
+        :return: (QWidget) the widget
+        '''
+        w = paneldesc.getWidget(sdm=Qt.qApp.SDM, setModel=False)
+        if hasattr(w, 'setCustomWidgetMap'):
+            w.setCustomWidgetMap(self.getCustomWidgetMap())
+        if paneldesc.model is not None:
+            w.setModel(paneldesc.model)
+        return w
+
     def __getVarFromXML(self, root, nodename, default=None):
         name = root.find(nodename)
         if name is None or name.text is None:
@@ -1159,6 +1244,13 @@ class TaurusGui(TaurusMainWindow):
                     if pd is not None:
                         CUSTOM_PANELS.append(pd)
 
+        # if LAZY_PANELS is True, the widgets of the panels are created
+        # (and their models set) when the panels are first shown
+        LAZY_PANELS = getattr(conf, 'LAZY_PANELS', (self.__getVarFromXML(
+            xmlroot, "LAZY_PANELS", str(getattr(tauruscustomsettings,
+                                                'TAURUSGUI_LAZY_PANELS',
+                                                False))).lower() == 'true'))
+
         # create panels based on the panel descriptions gathered before
         for p in CUSTOM_PANELS + POOLINSTRUMENTS:
             try:
@@ -1166,19 +1258,28 @@ class TaurusGui(TaurusMainWindow):
                     self.splashScreen().showMessage("Creating panel %s" % p.name)
                 except AttributeError:
                     pass
-                w = p.getWidget(sdm=Qt.qApp.SDM, setModel=False)
-                if hasattr(w, 'setCustomWidgetMap'):
-                    w.setCustomWidgetMap(self.getCustomWidgetMap())
-                if p.model is not None:
-                    w.setModel(p.model)
+                # panels given by a widget name (i.e. an existing instance
+                # instead of a class) are never lazy
+                lazy = (LAZY_PANELS and p.classname is not None and
+                        unicode(p.name) not in self.__panels)
+                if lazy:
+                    w = None
+                else:
+                    w = self._createPanelWidget(p)
                 if p.instrumentkey is None:
                     instrumentkey = self.IMPLICIT_ASSOCIATION
                 # the pool instruments may change when the pool config changes,
                 # so we do not store their config
                 registerconfig = p not in POOLINSTRUMENTS
                 # create a panel
-                self.createPanel(w, p.name, floating=p.floating, registerconfig=registerconfig,
-                                 instrumentkey=instrumentkey, permanent=True)
+                panel = self.createPanel(w, p.name, floating=p.floating,
+                                         registerconfig=registerconfig,
+                                         instrumentkey=instrumentkey,
+                                         permanent=True)
+                if lazy:
+                    panel.setLazyWidget(
+                        functools.partial(self._createPanelWidget, p),
+                        p.classname, modulename=p.modulename)
             except Exception, e:
                 msg = 'Cannot create panel %s' % getattr(
                     p, 'name', '__Unknown__')
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+"""Benchmark of the startup time of the taurus GUI launchers.
+
+It compares the time that a fresh python process takes to import what the
+`taurusform` and `taurusgui` launchers need, with the LIGHTWEIGHT_IMPORTS
+option disabled and enabled (see :mod:`taurus.tauruscustomsettings`).
+
+Usage: python -m taurus.qt.qtgui.test.bench_startup
+"""
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import subprocess
+from taurus.test import benchmark, printBenchmarks
+
+
+_LAUNCHERS = [
+    ('taurusform', 'from taurus.qt.qtgui.panel.taurusform import TaurusForm'),
+    ('taurusgui', 'from taurus.qt.qtgui.taurusgui import TaurusGui'),
+    ('qtgui (all)', 'import taurus.qt.qtgui; dir(taurus.qt.qtgui)'),
+]
+
+_SCRIPT = '''
+import taurus.tauruscustomsettings
+taurus.tauruscustomsettings.LIGHTWEIGHT_IMPORTS = %r
+%s
+'''
+
+
+def _startup(code, lightweight):
+    script = _SCRIPT % (lightweight, code)
+
+    def run():
+        subprocess.check_call([sys.executable, '-c', script])
+    return run
+
+
+def main():
+    results = []
+    for name, code in _LAUNCHERS:
+        results.append((name,
+                        benchmark(_startup(code, False), number=1, repeat=5),
+                        benchmark(_startup(code, True), number=1, repeat=5)))
+    printBenchmarks(results, title='Launcher imports (default vs lightweight)')
+
+
+if __name__ == '__main__':
+    main()
@@ -27,9 +27,20 @@
 
 __docformat__ = 'restructuredtext'
 
-from .qtree import *
-from .taurustree import *
-from .taurusdbtree import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'qtree',
+        'taurustree',
+        'taurusdbtree',
+    ])
+else:
+    from .qtree import *
+    from .taurustree import *
+    from .taurusdbtree import *
 
 # taurusdevicetree should be removed from taurus or merged with taurusdbtree
 # from .taurusdevicetree import *
@@ -28,11 +28,27 @@ configuration, actions."""
 
 __docformat__ = 'restructuredtext'
 
-from .taurusactionfactory import *
-from .taurusaction import *
-from .tauruscolor import *
-from .tauruswidgetfactory import *
-from .taurusscreenshot import *
-from .qdraganddropdebug import *
-from .ui import *
-from .validator import *
+from taurus import tauruscustomsettings as __S
+
+if getattr(__S, 'LIGHTWEIGHT_IMPORTS', False):
+    # the submodules are imported when their names are first accessed
+    from taurus.core.util.lazymodule import makeLazy as __makeLazy
+    __makeLazy(__name__, [
+        'taurusactionfactory',
+        'taurusaction',
+        'tauruscolor',
+        'tauruswidgetfactory',
+        'taurusscreenshot',
+        'qdraganddropdebug',
+        'ui',
+        'validator',
+    ])
+else:
+    from .taurusactionfactory import *
+    from .taurusaction import *
+    from .tauruscolor import *
+    from .tauruswidgetfactory import *
+    from .taurusscreenshot import *
+    from .qdraganddropdebug import *
+    from .ui import *
+    from .validator import *
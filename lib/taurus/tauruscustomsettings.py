@@ -50,6 +50,30 @@ T_FORM_CUSTOM_WIDGET_MAP = \
 # True sets the preferred mode of TaurusForms to use "compact" widgets
 T_FORM_COMPACT = False
 
+# Virtualized mode for forms
+# True makes TaurusForms create the widgets only for the visible rows
+T_FORM_VIRTUALIZED = False
+
+# Decimation of the curves of TaurusPlot and TaurusTrend
+# 'minmax' draws only the points with the min and max values of each pixel
+# column, 'lttb' uses the Largest-Triangle-Three-Buckets algorithm and None
+# draws all the points
+PLOT_DECIMATION = None
+
+# Disk history of the trends
+# True makes TaurusTrend keep the values discarded from its buffers in
+# memory-mapped files (in TREND_DISK_HISTORY_DIR, or in the temporary
+# directory of the system if None), limited to TREND_DISK_HISTORY_MAX_SIZE
+# bytes and TREND_DISK_HISTORY_MAX_AGE seconds per model (None for no limit)
+TREND_DISK_HISTORY = False
+TREND_DISK_HISTORY_DIR = None
+TREND_DISK_HISTORY_MAX_SIZE = 512 * 2**20
+TREND_DISK_HISTORY_MAX_AGE = None
+
+# Maximum number of points of archived data cached by the default backfill
+# service of the trends (see taurus.core.util.backfill). None for no limit
+BACKFILL_CACHE_MAX_POINTS = 2**22
+
 # Strict RFC3986 URI names in models
 # True makes Taurus only use the strict URI names
 # False enables a backwards-compatibility mode for pre-sep3 model names
@@ -57,7 +81,9 @@ STRICT_MODEL_NAMES = False
 
 
 # Lightweight imports:
-# True enables delayed imports (may break older code).
+# True enables delayed imports (may break older code). In particular, the
+# taurus.qt.qtgui subpackages import their submodules only when their
+# names are first accessed (faster startup of the GUI launchers)
 # False (or commented out) for backwards compatibility
 LIGHTWEIGHT_IMPORTS = False
 
@@ -68,6 +94,29 @@ DEFAULT_SCHEME = "tango"
 # providing support to new schemes
 # EXTRA_SCHEME_MODULES = ['myownschememodule']
 
+# Origin of the jobs processed by the taurus thread pool: recording the stack
+# of the caller for each job helps debugging failed jobs but it is expensive.
+# Set to N to record it for one of every N jobs (1 for all jobs, 0 for none)
+THREADPOOL_ORIGIN_SAMPLING = 0
+
+# Adaptive polling: set to True to let the client-side polling slow down for
+# the attributes whose listeners are all paused or hidden and for those whose
+# value does not change (see taurus.core.tauruspollingtimer)
+ADAPTIVE_POLLING = False
+
+# Evaluation attributes are re-evaluated in batches: all the events received
+# from their references during a tick (of EVAL_TICK_PERIOD ms) result in a
+# single evaluation (see taurus.core.evaluation.evalscheduler). Note that the
+# batching adds up to one tick of latency and that the batched events are
+# fired from the scheduler thread. 0 (default) disables it, i.e. they are
+# re-evaluated on every event
+EVAL_TICK_PERIOD = 0
+
+# Number of worker processes used for the evaluators that offload their
+# evaluations to other processes (see taurus.core.evaluation.evalprocess).
+# None means the number of CPUs
+EVAL_PROCESS_POOL_SIZE = None
+
 # ----------------------------------------------------------------------------
 # PLY (lex/yacc) optimization: 1=Active (default) , 0=disabled.
 # Set PLY_OPTIMIZE = 0 if you are getting yacc exceptions while loading
@@ -76,6 +125,15 @@ DEFAULT_SCHEME = "tango"
 
 PLY_OPTIMIZE = 1
 
+# Cache the parsed jdraw synoptic files (in ~/.taurus/jdraw_cache) so that
+# unchanged files are not parsed again: True or False (default). The cache
+# files are pickles, so enable it only if ~/.taurus is not writable by others
+JDRAW_PARSE_CACHE = False
+
+# Default for the LAZY_PANELS option of the TaurusGui configurations: if
+# True, the widgets of the panels are created when the panels are first shown
+TAURUSGUI_LAZY_PANELS = False
+
 # ----------------------------------------------------------------------------
 # Taurus namespace
 # ----------------------------------------------------------------------------
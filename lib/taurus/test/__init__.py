@@ -68,3 +68,4 @@ from .moduleexplorer import ModuleExplorer
 from .resource import getResourcePath
 from .base import insertTest
 from .fuzzytest import calculateTestFuzziness, loopSubprocess, loopTest
+from .benchmark import benchmark, printBenchmarks
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+#############################################################################
+##
+# This file is part of Taurus
+##
+# http://taurus-scada.org
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Taurus is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Taurus is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Taurus.  If not, see <http://www.gnu.org/licenses/>.
+##
+#############################################################################
+
+'''Utility functions for writing simple micro-benchmarks
+
+Benchmarks are not part of the test suite. By convention they are placed in
+the `test` submodules in files named `bench_*.py` which can be run directly
+(e.g. ``python -m taurus.core.tango.test.bench_tangoattrvalue``)
+'''
+
+__all__ = ['benchmark', 'printBenchmarks']
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import timeit
+
+
+def benchmark(func, number=None, repeat=3, mintime=0.2):
+    '''Returns the time that a call to `func` takes (the best of `repeat`
+    runs of `number` calls each)
+
+    :param func: (callable) callable to be benchmarked (called without args)
+    :param number: (int) calls per run. If None, it is chosen so that each
+                   run takes at least `mintime` seconds
+    :param repeat: (int) number of runs
+    :param mintime: (float) minimum time of a run (in s) when number is None
+
+    :return: (float) time per call (in s)
+    '''
+    timer = timeit.Timer(func)
+    if number is None:
+        number = 1
+        while timer.timeit(number) < mintime and number < 1e7:
+            number *= 10
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def printBenchmarks(results, title=None, stream=None):
+    '''Prints a table with the results of several benchmarks
+
+    :param results: (seq<tuple>) sequence of (name, t) or (name, t_before,
+                    t_after) tuples, with times in seconds. If the before and
+                    after times are given, the speedup is also printed
+    :param title: (str) optional title for the table
+    :param stream: (file) where to print (default is sys.stdout)
+    '''
+    if stream is None:
+        stream = sys.stdout
+    if title:
+        stream.write('%s\n%s\n' % (title, '-' * len(title)))
+    width = max([len(r[0]) for r in results] + [4])
+    for r in results:
+        name, times = r[0], r[1:]
+        line = '%-*s' % (width, name)
+        for t in times:
+            line += ' %12.3f us' % (t * 1e6)
+        if len(times) == 2 and times[1] > 0:
+            line += ' %8.1fx' % (times[0] / times[1])
+        stream.write(line + '\n')
+    stream.write('\n')